@@ -0,0 +1,88 @@
+from django.conf import settings
+from django_redis import get_redis_connection
+from utils import caching
+from .models import Subscription
+
+# Marks a loaded set, so that an author without subscribers isn't reloaded.
+SENTINEL = "-"
+
+ADD_IF_LOADED = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    return redis.call("SADD", KEYS[1], unpack(ARGV))
+end
+return 0
+"""
+
+
+def get_subscribers_key(author_id):
+    return f"author:{author_id}:subscribers"
+
+
+def is_subscribed(subscriber_id, target_id):
+    """
+    Answers from a cached set of the subscriber ids of the target author,
+    loading it from the database on the first check.
+    """
+
+    key = get_subscribers_key(target_id)
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.exists(key)
+    pipeline.sismember(key, subscriber_id)
+    pipeline.get(caching.get_generation_key(key))
+    loaded, subscribed, generation = pipeline.execute()
+    if loaded:
+        return bool(subscribed)
+    return subscriber_id in load(redis, target_id, generation)
+
+
+def load(redis, target_id, generation):
+    """
+    Loads the subscriber ids of the target author and caches them, unless a
+    subscription changed since the generation of the set was read.
+    """
+
+    # Loaded from the primary, as the set is cached until invalidated.
+    subscriber_ids = set(
+        Subscription.objects.using("default")
+        .filter(target_id=target_id)
+        .values_list("subscriber_id", flat=True)
+    )
+    key = get_subscribers_key(target_id)
+    ttl = int(settings.ACCESS_CACHE_TTL.total_seconds())
+
+    def write(pipeline, keys):
+        pipeline.delete(key)
+        pipeline.sadd(key, SENTINEL, *subscriber_ids)
+        pipeline.expire(key, ttl)
+
+    caching.fill(redis, {key: generation}, write)
+    return subscriber_ids
+
+
+def add_subscribers(target_id, subscriber_ids):
+    if subscriber_ids:
+        key = get_subscribers_key(target_id)
+        redis = get_redis_connection("default")
+        script = redis.register_script(ADD_IF_LOADED)
+        pipeline = redis.pipeline()
+        script(keys=[key], args=list(subscriber_ids), client=pipeline)
+        # Drops the loads in progress, which may have missed the subscribers.
+        caching.bump(pipeline, [key])
+        pipeline.execute()
+
+
+def remove_subscribers(target_id, subscriber_ids):
+    if subscriber_ids:
+        key = get_subscribers_key(target_id)
+        redis = get_redis_connection("default")
+        pipeline = redis.pipeline()
+        pipeline.srem(key, *subscriber_ids)
+        # Drops the loads in progress, which may still hold the subscribers.
+        caching.bump(pipeline, [key])
+        pipeline.execute()
+
+
+def invalidate(author_id):
+    redis = get_redis_connection("default")
+    caching.invalidate(redis, [get_subscribers_key(author_id)])
@@ -0,0 +1,115 @@
+from django.conf import settings
+from django_redis import get_redis_connection
+from utils import caching
+from .models import Author
+
+CARD_FIELDS = {
+    "id": int,
+    "email": str,
+    "bio": str,
+    "is_private": lambda value: value == "1",
+    "subscribers_count": int,
+    "subscriptions_count": int,
+    "articles_count": int,
+}
+
+
+def get_card_key(author_id):
+    return f"author:card:{author_id}"
+
+
+def build_card(author):
+    return {
+        "id": author.id,
+        "email": author.user.email,
+        "bio": author.bio,
+        "is_private": author.is_private,
+        "subscribers_count": author.subscribers_count,
+        "subscriptions_count": author.subscriptions_count,
+        "articles_count": author.articles_count,
+    }
+
+
+def encode_card(card):
+    encoded = {}
+    for field, value in card.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            value = int(value)
+        encoded[field] = value
+    return encoded
+
+
+def decode_card(encoded):
+    card = dict.fromkeys(CARD_FIELDS)
+    for field, value in encoded.items():
+        field = field.decode()
+        if field in CARD_FIELDS:
+            card[field] = CARD_FIELDS[field](value.decode())
+    return card
+
+
+def get_cards(author_ids):
+    """
+    Returns {author_id: card} for the given authors, reading all cards with
+    one pipeline and loading only the missing ones from the database.
+    """
+
+    author_ids = list(dict.fromkeys(author_ids))
+    if not author_ids:
+        return {}
+    redis = get_redis_connection("default")
+    keys = [get_card_key(author_id) for author_id in author_ids]
+    pipeline = redis.pipeline(transaction=False)
+    for key in keys:
+        pipeline.hgetall(key)
+    # Read along, for the cards that have to be loaded.
+    pipeline.mget([caching.get_generation_key(key) for key in keys])
+    *encoded_cards, generations = pipeline.execute()
+
+    cards = {}
+    for author_id, encoded in zip(author_ids, encoded_cards):
+        if encoded:
+            cards[author_id] = decode_card(encoded)
+
+    missing = [author_id for author_id in author_ids if author_id not in cards]
+    if missing:
+        # Cached cards outlive the replication lag, so they are loaded from
+        # the primary.
+        authors = (
+            Author.objects.using("default")
+            .filter(pk__in=missing)
+            .select_related("user")
+        )
+        loaded = {author.id: build_card(author) for author in authors}
+        set_cards(redis, dict(zip(keys, generations)), loaded)
+        cards.update(loaded)
+    return cards
+
+
+def set_cards(redis, generations, cards):
+    """
+    Caches the loaded cards, unless they were invalidated since their
+    generations were read.
+    """
+
+    ttl = int(settings.AUTHOR_CARD_TTL.total_seconds())
+    encoded = {
+        get_card_key(author_id): encode_card(card) for author_id, card in cards.items()
+    }
+
+    def write(pipeline, keys):
+        for key in keys:
+            pipeline.delete(key)
+            pipeline.hset(key, mapping=encoded[key])
+            pipeline.expire(key, ttl)
+
+    caching.fill(redis, {key: generations[key] for key in encoded}, write)
+
+
+def invalidate(author_ids):
+    keys = [get_card_key(author_id) for author_id in author_ids]
+    if keys:
+        redis = get_redis_connection("default")
+        caching.invalidate(redis, keys)
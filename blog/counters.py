@@ -0,0 +1,313 @@
+from collections import defaultdict
+from itertools import chain
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_redis import get_redis_connection
+from .models import Author, Article, Subscription, LikedItem
+from . import cards, versions
+
+COUNTERS = {
+    Author: ["subscribers_count", "subscriptions_count", "articles_count"],
+    Article: ["likes_count"],
+}
+
+
+def get_pending_key(model, field):
+    return f"counters:{model._meta.label_lower}:{field}"
+
+
+def get_flushing_key(model, field):
+    return f"{get_pending_key(model, field)}:flushing"
+
+
+def increment(model, field, pks, delta=1):
+    """
+    Buffers a change of `delta` to a counter of the given rows in Redis
+    once the current transaction commits, so that concurrent writers never
+    contend on the row locks of hot authors or articles.
+    """
+
+    pks = list(pks)
+    key = get_pending_key(model, field)
+
+    def buffer():
+        redis = get_redis_connection("default")
+        pipeline = redis.pipeline(transaction=False)
+        for pk in pks:
+            pipeline.hincrby(key, pk, delta)
+        pipeline.execute()
+
+    if pks and delta:
+        transaction.on_commit(buffer)
+        versions.touch(model._meta.model_name, pks)
+
+
+def decrement(model, field, pks, delta=1):
+    increment(model, field, pks, -delta)
+
+
+def get_pending(model, pks):
+    """
+    Returns {pk: {field: delta}} for the changes not yet flushed to the
+    database, including the ones of a flush in progress.
+    """
+
+    pks = list(pks)
+    if not pks:
+        return {}
+    fields = COUNTERS[model]
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    for field in fields:
+        pipeline.hmget(get_pending_key(model, field), pks)
+        pipeline.hmget(get_flushing_key(model, field), pks)
+    results = iter(pipeline.execute())
+
+    pending = defaultdict(dict)
+    for field in fields:
+        for pk, buffered, flushing in zip(pks, next(results), next(results)):
+            delta = int(buffered or 0) + int(flushing or 0)
+            if delta:
+                pending[pk][field] = delta
+    return pending
+
+
+def get_flush_lock(redis):
+    return redis.lock("counters:flush", timeout=settings.COUNTERS_FLUSH_LOCK_TIMEOUT)
+
+
+def flush():
+    """
+    Applies the buffered changes, unless a flush is in progress, and returns
+    the primary keys of the rows flushed as {(model, field): pks}.
+    """
+
+    redis = get_redis_connection("default")
+    lock = get_flush_lock(redis)
+    if not lock.acquire(blocking=False):
+        return {}
+    try:
+        return flush_counters(redis)
+    finally:
+        lock.release()
+
+
+def flush_counters(redis):
+    return {
+        (model, field): flush_counter(redis, model, field)
+        for model, fields in COUNTERS.items()
+        for field in fields
+    }
+
+
+def flush_counter(redis, model, field):
+    """
+    Moves the buffered deltas of a counter aside and applies them with one
+    UPDATE per batch of rows. A flush interrupted after the rename is
+    resumed by the next one, with the batches it didn't apply. Returns the
+    primary keys of the rows changed.
+    """
+
+    key = get_pending_key(model, field)
+    flushing_key = get_flushing_key(model, field)
+    if not redis.exists(flushing_key):
+        if not redis.exists(key):
+            return []
+        redis.rename(key, flushing_key)
+
+    deltas = [
+        (int(pk), int(delta))
+        for pk, delta in redis.hgetall(flushing_key).items()
+        if int(delta)
+    ]
+    batch_size = settings.COUNTERS_FLUSH_BATCH_SIZE
+    for start in range(0, len(deltas), batch_size):
+        batch = dict(deltas[start : start + batch_size])
+        apply_deltas(model, field, batch)
+        # Dropped as soon as applied, so that neither a resumed flush nor the
+        # readers of pending changes count them again.
+        redis.hdel(flushing_key, *batch)
+    redis.delete(flushing_key)
+    return [pk for pk, _ in deltas]
+
+
+def apply_deltas(model, field, deltas):
+    whens = [When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()]
+    model.objects.filter(pk__in=deltas).update(
+        **{field: Greatest(F(field) + Case(*whens, default=Value(0)), Value(0))}
+    )
+    if model is Author:
+        cards.invalidate(deltas)
+
+
+RECOUNTS = {
+    Author: {
+        "subscribers_count": (Subscription, "target"),
+        "subscriptions_count": (Subscription, "subscriber"),
+        "articles_count": (Article, "author"),
+    },
+    Article: {
+        "likes_count": (LikedItem, "article"),
+    },
+}
+
+
+def get_dirty_key(model):
+    return f"counters:{model._meta.label_lower}:dirty"
+
+
+def get_watermark_key(model):
+    return f"counters:{model._meta.label_lower}:watermark"
+
+
+def mark_dirty(model, pks):
+    """
+    Flags rows whose counters may have drifted without leaving a trace the
+    reconciliation can find by timestamp, such as cascade deletes.
+    """
+
+    pks = list(pks)
+
+    def mark():
+        redis = get_redis_connection("default")
+        redis.sadd(get_dirty_key(model), *pks)
+
+    if pks:
+        transaction.on_commit(mark)
+
+
+def get_changed_pks(model, since):
+    """
+    Yields the primary keys of rows whose counted relations were created or
+    which were themselves saved since the watermark.
+    """
+
+    for related_model, field in RECOUNTS[model].values():
+        yield from (
+            related_model.objects.filter(created_at__gte=since)
+            .values_list(f"{field}_id", flat=True)
+            .iterator()
+        )
+    yield from (
+        model.objects.filter(updated_at__gte=since)
+        .values_list("pk", flat=True)
+        .iterator()
+    )
+
+
+def get_all_pks(model, chunk_size):
+    last_pk = 0
+    while True:
+        pks = list(
+            model.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not pks:
+            return
+        yield from pks
+        last_pk = pks[-1]
+
+
+def pop_dirty_pks(redis, model, chunk_size):
+    while True:
+        pks = redis.spop(get_dirty_key(model), chunk_size)
+        if not pks:
+            return
+        yield from (int(pk) for pk in pks)
+
+
+def recount(redis, model, pks):
+    """
+    Recomputes the counters of the given rows with one UPDATE whose values
+    come from correlated COUNT(*) subqueries. The buffered changes read
+    right before it were committed before its snapshot, so the counts
+    include them and they are subtracted from the buffers once it commits;
+    the changes buffered meanwhile stay on top of the counts. Callers hold
+    the flush lock, so that no flush applies the changes in between.
+    """
+
+    pks = list(pks)
+    values = {}
+    keys = []
+    for field, (related_model, related_field) in RECOUNTS[model].items():
+        count = (
+            related_model.objects.filter(**{related_field: OuterRef("pk")})
+            .order_by()
+            .values(related_field)
+            .annotate(count=Count("*"))
+            .values("count")
+        )
+        values[field] = Coalesce(Subquery(count), Value(0))
+        keys += [get_pending_key(model, field), get_flushing_key(model, field)]
+
+    pipeline = redis.pipeline(transaction=False)
+    for key in keys:
+        pipeline.hmget(key, pks)
+    captured = pipeline.execute()
+    with transaction.atomic():
+        updated = model.objects.filter(pk__in=pks).update(**values)
+        versions.touch(model._meta.model_name, pks)
+
+    pipeline = redis.pipeline(transaction=False)
+    for key, deltas in zip(keys, captured):
+        for pk, delta in zip(pks, deltas):
+            if delta is not None and int(delta):
+                pipeline.hincrby(key, pk, -int(delta))
+    pipeline.execute()
+    if model is Author:
+        cards.invalidate(pks)
+    return updated
+
+
+def reconcile(full=False, chunk_size=None):
+    """
+    Recounts the rows changed since the last run, or every row if `full`,
+    and returns the number of rows updated per model. Flushes are held off
+    meanwhile, so that none applies changes already recounted.
+    """
+
+    chunk_size = chunk_size or settings.COUNTERS_RECONCILE_CHUNK_SIZE
+    redis = get_redis_connection("default")
+    lock = get_flush_lock(redis)
+    if not lock.acquire(blocking_timeout=settings.COUNTERS_FLUSH_LOCK_TIMEOUT):
+        return {}
+    try:
+        started_at = timezone.now()
+        # Apply the buffered changes first, they are already part of the counts.
+        flush_counters(redis)
+
+        updated = {}
+        for model in RECOUNTS:
+            watermark = redis.get(get_watermark_key(model))
+            if full or watermark is None:
+                redis.delete(get_dirty_key(model))
+                pks = get_all_pks(model, chunk_size)
+            else:
+                since = parse_datetime(watermark.decode())
+                pks = chain(
+                    get_changed_pks(model, since),
+                    pop_dirty_pks(redis, model, chunk_size),
+                )
+
+            updated[model] = 0
+            chunk = set()
+            for pk in pks:
+                chunk.add(pk)
+                if len(chunk) == chunk_size:
+                    updated[model] += recount(redis, model, chunk)
+                    lock.reacquire()
+                    chunk = set()
+            if chunk:
+                updated[model] += recount(redis, model, chunk)
+
+            # Overlap runs to catch rows committed late with an earlier timestamp.
+            watermark = started_at - settings.COUNTERS_RECONCILE_OVERLAP
+            redis.set(get_watermark_key(model), watermark.isoformat())
+        return updated
+    finally:
+        lock.release()
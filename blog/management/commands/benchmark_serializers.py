@@ -0,0 +1,78 @@
+from timeit import timeit
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+from blog.models import Author, Article
+from blog.serializers import ArticleSerializer, SimpleAuthorSerializer
+from chat.models import ChatPage
+from chat.serializers import ChatPageSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares serializing existing rows through model instances and "
+        "through the fast path, and checks that both render the same JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows", type=int, default=20, help="Number of rows per page."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=200, help="Number of pages serialized."
+        )
+        parser.add_argument(
+            "--user",
+            type=int,
+            help="Id of the user viewing the pages, the first user by default.",
+        )
+
+    def handle(self, *args, **options):
+        if options["user"] is None:
+            user = User.objects.order_by("id").first()
+        else:
+            user = User.objects.filter(pk=options["user"]).first()
+        if user is None:
+            raise CommandError("There is no user to view the pages.")
+
+        request = APIRequestFactory().get("/")
+        request.user = user
+        context = {"request": request}
+        rows = options["rows"]
+        benchmarks = [
+            (ArticleSerializer, Article.objects.order_by("-created_at", "-id")),
+            (SimpleAuthorSerializer, Author.objects.order_by("-created_at", "-id")),
+            (
+                ChatPageSerializer,
+                ChatPage.objects.select_related("contact")
+                .filter(user=user)
+                .order_by("-id"),
+            ),
+        ]
+        for serializer_class, queryset in benchmarks:
+            queryset = queryset[:rows]
+            fast_queryset = serializer_class.get_fast_queryset(queryset)
+
+            def model_path():
+                data = serializer_class(list(queryset), many=True, context=context).data
+                return JSONRenderer().render(data)
+
+            def fast_path():
+                data = serializer_class(
+                    list(fast_queryset), many=True, context=context
+                ).data
+                return JSONRenderer().render(data)
+
+            if model_path() != fast_path():
+                raise CommandError(
+                    f"{serializer_class.__name__} renders differently on the fast path."
+                )
+            model_time = timeit(model_path, number=options["repeat"])
+            fast_time = timeit(fast_path, number=options["repeat"])
+            self.stdout.write(
+                f"{serializer_class.__name__}: {model_time:.3f}s model, "
+                f"{fast_time:.3f}s fast, {model_time / fast_time:.2f}x speedup."
+            )
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from blog import counters
+
+
+class Command(BaseCommand):
+    help = "Recounts the denormalized counters of authors and articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recount every row instead of the ones changed since the last run.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Number of rows recounted per UPDATE statement.",
+        )
+
+    def handle(self, *args, **options):
+        updated = counters.reconcile(
+            full=options["full"], chunk_size=options["chunk_size"]
+        )
+        for model, count in updated.items():
+            self.stdout.write(f"Reconciled {count} {model._meta.verbose_name} rows.")
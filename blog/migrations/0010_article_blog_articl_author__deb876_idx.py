@@ -0,0 +1,19 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0009_article_likes_count_likeditem"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="blog_articl_author__deb876_idx",
+            ),
+        ),
+    ]
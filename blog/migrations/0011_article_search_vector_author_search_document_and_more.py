@@ -0,0 +1,103 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:20
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+AUTHOR_SEARCH_DOCUMENT = """
+CREATE FUNCTION blog_author_search_document() RETURNS trigger AS $$
+BEGIN
+    NEW.search_document := concat_ws(
+        ' ', (SELECT email FROM users_user WHERE id = NEW.user_id), NEW.bio
+    );
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER blog_author_search_document
+BEFORE INSERT OR UPDATE OF user_id, bio, search_document ON blog_author
+FOR EACH ROW EXECUTE FUNCTION blog_author_search_document();
+
+CREATE FUNCTION users_user_author_search_document() RETURNS trigger AS $$
+BEGIN
+    UPDATE blog_author SET search_document = '' WHERE user_id = NEW.id;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER users_user_author_search_document
+AFTER UPDATE OF email ON users_user
+FOR EACH ROW WHEN (OLD.email IS DISTINCT FROM NEW.email)
+EXECUTE FUNCTION users_user_author_search_document();
+
+UPDATE blog_author SET search_document = '';
+"""
+
+DROP_AUTHOR_SEARCH_DOCUMENT = """
+DROP TRIGGER users_user_author_search_document ON users_user;
+DROP FUNCTION users_user_author_search_document();
+DROP TRIGGER blog_author_search_document ON blog_author;
+DROP FUNCTION blog_author_search_document();
+"""
+
+ARTICLE_SEARCH_VECTOR = """
+CREATE FUNCTION blog_article_search_vector() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A')
+        || setweight(to_tsvector('english', coalesce(NEW.content, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER blog_article_search_vector
+BEFORE INSERT OR UPDATE OF title, content, search_vector ON blog_article
+FOR EACH ROW EXECUTE FUNCTION blog_article_search_vector();
+
+UPDATE blog_article SET search_vector = NULL;
+"""
+
+DROP_ARTICLE_SEARCH_VECTOR = """
+DROP TRIGGER blog_article_search_vector ON blog_article;
+DROP FUNCTION blog_article_search_vector();
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0010_article_blog_articl_author__deb876_idx"),
+        ("users", "0002_user_users_user_email_prefix_idx"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="article",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="author",
+            name="search_document",
+            field=models.TextField(default="", editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="blog_article_search_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="blog_author_search_trgm_idx",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.RunSQL(AUTHOR_SEARCH_DOCUMENT, DROP_AUTHOR_SEARCH_DOCUMENT),
+        migrations.RunSQL(ARTICLE_SEARCH_VECTOR, DROP_ARTICLE_SEARCH_VECTOR),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.1.2 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0011_article_search_vector_author_search_document_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="likeditem",
+            index=models.Index(
+                fields=["article", "-created_at", "-id"],
+                name="blog_likedi_article_7e8447_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                fields=["subscriber", "-created_at", "-id"],
+                name="blog_subscr_subscri_999125_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=models.Index(
+                fields=["target", "-created_at", "-id"],
+                name="blog_subscr_target__b7176e_idx",
+            ),
+        ),
+    ]
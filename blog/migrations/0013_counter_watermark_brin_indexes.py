@@ -0,0 +1,37 @@
+# Generated by Django 4.1.2 on 2026-10-18 09:27
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0012_likeditem_blog_likedi_article_7e8447_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="article",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["updated_at"], name="blog_article_updated_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="author",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["updated_at"], name="blog_author_updated_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="likeditem",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="blog_likeditem_created_brin"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="subscription",
+            index=django.contrib.postgres.indexes.BrinIndex(
+                fields=["created_at"], name="blog_subscription_created_brin"
+            ),
+        ),
+    ]
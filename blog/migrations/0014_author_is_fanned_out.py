@@ -0,0 +1,30 @@
+# Generated by Django 4.1.2 on 2026-10-18 09:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def stop_fan_out(apps, schema_editor):
+    """
+    Keeps pulling the articles of the authors that were over the threshold.
+    """
+
+    Author = apps.get_model("blog", "Author")
+    Author.objects.filter(
+        subscribers_count__gte=settings.TIMELINE_FANOUT_THRESHOLD
+    ).update(is_fanned_out=False)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0013_counter_watermark_brin_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="is_fanned_out",
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(stop_fan_out, migrations.RunPython.noop),
+    ]
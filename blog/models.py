@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import connection, models
+from django.db.models import F
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
+from django.contrib.postgres.search import SearchVectorField
 
 User = get_user_model()
 
@@ -11,25 +14,98 @@ class Author(models.Model):
     subscriptions_count = models.PositiveIntegerField(default=0)
     articles_count = models.PositiveIntegerField(default=0)
     is_private = models.BooleanField(default=False)
+    # Whether new articles are pushed to the timelines of the subscribers,
+    # switched by blog.timeline.update_fan_out.
+    is_fanned_out = models.BooleanField(default=True)
+    # Email and bio, kept up to date by database triggers.
+    search_document = models.TextField(default="", editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+                name="blog_author_search_trgm_idx",
+            ),
+            # Rows are mostly saved in time order, so block ranges stay
+            # narrow enough for the reconciliation to scan recent changes.
+            BrinIndex(fields=["updated_at"], name="blog_author_updated_brin"),
+        ]
+
 
 class SubscriptionManager(models.Manager):
     def get_subscriptions_for(self, author):
+        """
+        Returns the targets of the author, annotated with the subscription
+        linking them, newest first.
+        """
+
         return (
             Author.objects.filter(subscribers__subscriber=author)
-            .select_related("user")
-            .order_by("-created_at")
+            .annotate(
+                subscribed_at=F("subscribers__created_at"),
+                subscription_id=F("subscribers__id"),
+            )
+            .only("id")
+            .order_by("-subscribed_at", "-subscription_id")
         )
 
     def get_subscribers_for(self, author):
+        """
+        Returns the subscribers of the author, annotated with the subscription
+        linking them, newest first.
+        """
+
         return (
             Author.objects.filter(subscriptions__target=author)
-            .select_related("user")
-            .order_by("-created_at")
+            .annotate(
+                subscribed_at=F("subscriptions__created_at"),
+                subscription_id=F("subscriptions__id"),
+            )
+            .only("id")
+            .order_by("-subscribed_at", "-subscription_id")
         )
 
+    def subscribe(self, subscriber, target_ids, created_at):
+        """
+        Subscribes the author to the targets with a single query, skipping the
+        existing subscriptions, and returns the ids of the targets this call
+        subscribed to, which concurrent calls never both report.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self.model._meta.db_table}
+                    (subscriber_id, target_id, created_at)
+                SELECT %s, target_id, %s FROM unnest(%s::bigint[]) AS target_id
+                ON CONFLICT (subscriber_id, target_id) DO NOTHING
+                RETURNING target_id
+                """,
+                [subscriber.id, created_at, list(target_ids)],
+            )
+            return [target_id for target_id, in cursor.fetchall()]
+
+    def unsubscribe(self, subscriber, target_ids):
+        """
+        Deletes the subscriptions of the author to the targets with a single
+        query and returns the ids of the targets this call unsubscribed from,
+        which concurrent calls never both report. Bypasses the delete signals.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {self.model._meta.db_table}
+                WHERE subscriber_id = %s AND target_id = ANY(%s::bigint[])
+                RETURNING target_id
+                """,
+                [subscriber.id, list(target_ids)],
+            )
+            return [target_id for target_id, in cursor.fetchall()]
+
 
 class Subscription(models.Model):
     objects = SubscriptionManager()
@@ -43,6 +119,11 @@ class Subscription(models.Model):
 
     class Meta:
         unique_together = ["subscriber", "target"]
+        indexes = [
+            models.Index(fields=["subscriber", "-created_at", "-id"]),
+            models.Index(fields=["target", "-created_at", "-id"]),
+            BrinIndex(fields=["created_at"], name="blog_subscription_created_brin"),
+        ]
 
 
 class Article(models.Model):
@@ -52,9 +133,18 @@ class Article(models.Model):
         Author, on_delete=models.CASCADE, related_name="articles"
     )
     likes_count = models.PositiveIntegerField(default=0)
+    # Weighted title and content, kept up to date by a database trigger.
+    search_vector = SearchVectorField(null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["author", "-created_at", "-id"]),
+            GinIndex(fields=["search_vector"], name="blog_article_search_idx"),
+            BrinIndex(fields=["updated_at"], name="blog_article_updated_brin"),
+        ]
+
     @property
     def user(self):
         return self.author.user
@@ -62,7 +152,36 @@ class Article(models.Model):
 
 class LikedItemManager(models.Manager):
     def get_likes_for(self, article_id):
-        return Author.objects.filter(likes__article=article_id).select_related("user")
+        """
+        Returns the authors who liked the article, annotated with their like,
+        newest first.
+        """
+
+        return (
+            Author.objects.filter(likes__article=article_id)
+            .annotate(liked_at=F("likes__created_at"), like_id=F("likes__id"))
+            .only("id")
+            .order_by("-liked_at", "-like_id")
+        )
+
+    def like(self, author, article_ids, created_at):
+        """
+        Likes the articles for the author with a single query, skipping the
+        existing likes, and returns the ids of the articles this call liked.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self.model._meta.db_table}
+                    (author_id, article_id, created_at)
+                SELECT %s, article_id, %s FROM unnest(%s::bigint[]) AS article_id
+                ON CONFLICT (author_id, article_id) DO NOTHING
+                RETURNING article_id
+                """,
+                [author.id, created_at, list(article_ids)],
+            )
+            return [article_id for article_id, in cursor.fetchall()]
 
 
 class LikedItem(models.Model):
@@ -73,6 +192,10 @@ class LikedItem(models.Model):
 
     class Meta:
         unique_together = ["author", "article"]
+        indexes = [
+            models.Index(fields=["article", "-created_at", "-id"]),
+            BrinIndex(fields=["created_at"], name="blog_likeditem_created_brin"),
+        ]
 
     @property
     def user(self):
@@ -1,6 +1,78 @@
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import LimitOffsetPagination
+from utils.pagination import KeysetPagination
+from .timeline import get_position
 
 
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
     default_limit = 10
     max_limit = 20
+
+
+class DefaultKeysetPagination(KeysetPagination):
+    page_size = 10
+    max_page_size = 20
+    ordering = ("-created_at", "-id")
+
+
+class SubscriptionPagination(DefaultKeysetPagination):
+    # Authors are listed in the order of the subscriptions linking them.
+    ordering = ("-subscribed_at", "-subscription_id")
+
+
+class LikePagination(DefaultKeysetPagination):
+    ordering = ("-liked_at", "-like_id")
+
+
+class SearchPagination(DefaultKeysetPagination):
+    ordering = ("-rank", "-id")
+
+
+class HomeTimelinePagination(DefaultKeysetPagination):
+    def get_page(self, timeline, position, reverse, limit):
+        """
+        Hydrates the entries of the page, seeking past them for as many more
+        as there were deleted articles, so that the page stays full and keeps
+        the entry that tells whether there is a next page.
+        """
+
+        rows = []
+        while len(rows) < limit:
+            missing = limit - len(rows)
+            entries = self.get_entries(timeline, position, reverse, missing)
+            rows += timeline.hydrate(entries)
+            if len(entries) < missing:
+                break
+            position = get_position(entries[-1])
+        return rows
+
+    def get_entries(self, timeline, position, reverse, limit):
+        try:
+            return timeline.seek(position, reverse, limit)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_page_entries(self, timeline, request):
+        """
+        Returns the timeline entries of the requested page, plus the one that
+        tells whether there is a next page, without loading any article.
+        """
+
+        position, reverse = self.decode_cursor(request)
+        limit = self.get_limit(request) + 1
+        return self.get_entries(timeline, position, reverse, limit)
+
+
+class TrendingPagination(DefaultKeysetPagination):
+    # Scores are relative to the epoch of the ranking, which cursors carry.
+    ordering = ("epoch", "-score", "-id")
+
+    def get_page(self, trending, position, reverse, limit):
+        self.trending = trending
+        try:
+            return trending.get_page(position, reverse, limit)
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_position(self, row):
+        return [self.trending.epoch, self.trending.scores[row.id], row.id]
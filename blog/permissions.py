@@ -1,12 +1,19 @@
 from rest_framework import permissions
-from .models import Subscription
+from . import access
+from .models import Author
 
 
 class IsOwnerOrReadOnly(permissions.BasePermission):
+    """
+    Compares author ids with the author of the request, instead of loading
+    the user behind the object.
+    """
+
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return request.user == obj.user
+        owner_id = obj.pk if isinstance(obj, Author) else obj.author_id
+        return owner_id == request.user.author.id
 
 
 class HasAccessAuthorContent(permissions.BasePermission):
@@ -14,8 +21,6 @@ class HasAccessAuthorContent(permissions.BasePermission):
         current_author = request.user.author
         return bool(
             current_author == obj
-            or Subscription.objects.filter(
-                subscriber=current_author, target=obj
-            ).exists()
             or not obj.is_private
+            or access.is_subscribed(current_author.id, obj.id)
         )
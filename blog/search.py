@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import Exists, F, FloatField, OuterRef, Q
+from django.db.models.functions import Cast, Collate, Lower
+from .models import Author, Article, Subscription
+
+# Must match the configuration of the blog_article_search_vector trigger.
+SEARCH_CONFIG = "english"
+
+
+def search_authors(term):
+    """
+    Authors whose email or bio contains words similar to the term, ranked by
+    trigram word similarity.
+    """
+
+    # Ranks are read back as double precision, so that cursors hold them exactly.
+    similarity = Cast(TrigramWordSimilarity(term, "search_document"), FloatField())
+    return Author.objects.filter(search_document__trigram_word_similar=term).annotate(
+        rank=similarity
+    )
+
+
+def search_articles(term, viewer):
+    """
+    Articles matching the web search style query, ranked by full-text rank,
+    without the ones of private authors the viewer isn't subscribed to.
+    """
+
+    query = SearchQuery(term, config=SEARCH_CONFIG, search_type="websearch")
+    subscribed = Subscription.objects.filter(
+        subscriber=viewer, target=OuterRef("author")
+    )
+    return (
+        Article.objects.filter(search_vector=query)
+        .filter(Q(author__is_private=False) | Q(author=viewer) | Exists(subscribed))
+        .annotate(rank=Cast(SearchRank(F("search_vector"), query), FloatField()))
+    )
+
+
+def autocomplete_authors(prefix):
+    """
+    Authors whose email starts with the prefix, in email order, read from the
+    byte ordered index on lower(email).
+    """
+
+    prefix = prefix.lower()
+    email = Collate(Lower("user__email"), "C")
+    return (
+        Author.objects.alias(email=email)
+        .filter(email__gte=prefix, email__lt=prefix + chr(0x10FFFF))
+        .order_by("email")[: settings.SEARCH_AUTOCOMPLETE_LIMIT]
+    )
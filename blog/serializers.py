@@ -1,26 +1,129 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from utils.serializers import (
+    PrefetchListSerializer,
+    PrefetchMixin,
+    FastRepresentationMixin,
+)
 from .models import Author, Article, Subscription, LikedItem
+from . import cards, counters
 
 User = get_user_model()
 
 
-class SimpleAuthorSerializer(serializers.ModelSerializer):
+class PendingCountersMixin(PrefetchMixin):
+    """
+    Adds the counter changes not yet flushed to the database.
+    """
+
+    def prefetch(self, instances):
+        super().prefetch(instances)
+        pks = [instance.id for instance in instances]
+        self.pending_counters = counters.get_pending(self.Meta.model, pks)
+
+    def finalize(self, instance, data):
+        data = super().finalize(instance, data)
+        for field, delta in self.pending_counters.get(instance.id, {}).items():
+            if field in data:
+                data[field] = max(data[field] + delta, 0)
+        return data
+
+
+class AuthorCardMixin(PrefetchMixin):
+    """
+    Reads the data of the user behind each author of a page from the cached
+    author cards instead of joining the users table.
+    """
+
+    def prefetch(self, instances):
+        super().prefetch(instances)
+        self.cards = cards.get_cards([author.id for author in instances])
+
+    def get_email(self, author):
+        # Authors deleted since the page was loaded have no card.
+        card = self.cards.get(author.id)
+        return card["email"] if card else None
+
+
+class SubscriptionStateMixin(PrefetchMixin):
+    """
+    Looks up whether the current author is subscribed to the authors of a
+    page with a single query.
+    """
+
+    def prefetch(self, instances):
+        super().prefetch(instances)
+        self.subscribed_authors = set(
+            Subscription.objects.filter(
+                subscriber=self.context["request"].user.author,
+                target__in=[author.id for author in instances],
+            ).values_list("target_id", flat=True)
+        )
+
+    def get_is_subscribed(self, author):
+        return author.id in self.subscribed_authors
+
+
+class LikeStateMixin(PrefetchMixin):
+    """
+    Looks up whether the current author liked the articles of a page with a
+    single query.
+    """
+
+    def prefetch(self, instances):
+        super().prefetch(instances)
+        self.liked_articles = set(
+            LikedItem.objects.filter(
+                author=self.context["request"].user.author,
+                article__in=[article.id for article in instances],
+            ).values_list("article_id", flat=True)
+        )
+
+    def get_liked_by_me(self, article):
+        return article.id in self.liked_articles
+
+
+class UpdateFieldsMixin:
+    """
+    Saves only the updated fields, so that stale counters of the instance
+    never overwrite the ones flushed in the meantime.
+    """
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, "updated_at"])
+        return instance
+
+
+class SimpleAuthorSerializer(
+    FastRepresentationMixin,
+    AuthorCardMixin,
+    SubscriptionStateMixin,
+    serializers.ModelSerializer,
+):
     email = serializers.SerializerMethodField()
+    is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
-        fields = ["id", "email"]
-
-    def get_email(self, author):
-        return author.user.email
+        list_serializer_class = PrefetchListSerializer
+        fields = ["id", "email", "is_subscribed"]
 
 
-class AuthorSerializer(serializers.ModelSerializer):
+class AuthorSerializer(
+    UpdateFieldsMixin,
+    PendingCountersMixin,
+    AuthorCardMixin,
+    SubscriptionStateMixin,
+    serializers.ModelSerializer,
+):
     email = serializers.SerializerMethodField()
+    is_subscribed = serializers.SerializerMethodField()
 
     class Meta:
         model = Author
+        list_serializer_class = PrefetchListSerializer
         fields = [
             "id",
             "bio",
@@ -28,6 +131,7 @@ class AuthorSerializer(serializers.ModelSerializer):
             "subscribers_count",
             "subscriptions_count",
             "articles_count",
+            "is_subscribed",
         ]
         read_only_fields = [
             "email",
@@ -36,14 +140,28 @@ class AuthorSerializer(serializers.ModelSerializer):
             "articles_count",
         ]
 
-    def get_email(self, author):
-        return author.user.email
 
+class ArticleSerializer(
+    FastRepresentationMixin,
+    UpdateFieldsMixin,
+    PendingCountersMixin,
+    LikeStateMixin,
+    serializers.ModelSerializer,
+):
+    liked_by_me = serializers.SerializerMethodField()
 
-class ArticleSerializer(serializers.ModelSerializer):
     class Meta:
         model = Article
-        fields = ["id", "title", "content", "created_at", "author", "likes_count"]
+        list_serializer_class = PrefetchListSerializer
+        fields = [
+            "id",
+            "title",
+            "content",
+            "created_at",
+            "author",
+            "likes_count",
+            "liked_by_me",
+        ]
         read_only_fields = ["author", "likes_count"]
 
     def create(self, validated_data):
@@ -136,3 +254,34 @@ class LikeSerializer(serializers.ModelSerializer):
         validated_data["author"] = self.context["request"].user.author
         validated_data["article_id"] = self.context["article_id"]
         return super().create(validated_data)
+
+
+class BatchSubscriptionSerializer(serializers.Serializer):
+    targets = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=500
+    )
+
+
+class BatchLikeSerializer(serializers.Serializer):
+    articles = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=500
+    )
+
+
+class RelationshipsSerializer(serializers.Serializer):
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(",")))
+        except ValueError:
+            raise serializers.ValidationError(
+                "Enter a comma separated list of author ids."
+            )
+        if len(ids) > 500:
+            raise serializers.ValidationError("Ensure there are no more than 500 ids.")
+        return ids
+
+
+class SearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100)
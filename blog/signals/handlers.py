@@ -1,7 +1,11 @@
 from django.dispatch import receiver
+from django.db import transaction
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
-from blog.models import Author
+from django.db.models.signals import post_save, post_delete
+from blog import access, cards, counters, trending, versions
+from blog.models import Author, Article, Subscription, LikedItem
+from blog.tasks import fan_out_article, backfill_timeline, prune_timeline
+from users import authentication
 
 User = get_user_model()
 
@@ -10,3 +14,145 @@ User = get_user_model()
 def create_author_for_new_user(sender, **kwargs):
     if kwargs["created"]:
         Author.objects.create(user=kwargs["instance"])
+
+
+@receiver(post_save, sender=User)
+def invalidate_author_card_for_user(sender, **kwargs):
+    update_fields = kwargs["update_fields"]
+    if kwargs["created"] or (update_fields and "email" not in update_fields):
+        return
+    author_ids = list(
+        Author.objects.filter(user=kwargs["instance"]).values_list("pk", flat=True)
+    )
+    transaction.on_commit(lambda: cards.invalidate(author_ids))
+    versions.touch("author", author_ids)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_principal_for_user(sender, **kwargs):
+    user_id = kwargs["instance"].pk
+    transaction.on_commit(lambda: authentication.invalidate(user_id))
+
+
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_principal(sender, **kwargs):
+    user_id = kwargs["instance"].user_id
+    transaction.on_commit(lambda: authentication.invalidate(user_id))
+
+
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_author_card(sender, **kwargs):
+    author_id = kwargs["instance"].pk
+    transaction.on_commit(lambda: cards.invalidate([author_id]))
+
+
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_author_access(sender, **kwargs):
+    author_id = kwargs["instance"].pk
+    transaction.on_commit(lambda: access.invalidate(author_id))
+
+
+@receiver(post_save, sender=Subscription)
+def grant_access_for_new_subscription(sender, **kwargs):
+    if kwargs["created"]:
+        subscription = kwargs["instance"]
+        transaction.on_commit(
+            lambda: access.add_subscribers(
+                subscription.target_id, [subscription.subscriber_id]
+            )
+        )
+
+
+@receiver(post_delete, sender=Subscription)
+def revoke_access_for_deleted_subscription(sender, **kwargs):
+    subscription = kwargs["instance"]
+    transaction.on_commit(
+        lambda: access.remove_subscribers(
+            subscription.target_id, [subscription.subscriber_id]
+        )
+    )
+
+
+@receiver(post_save, sender=Article)
+def fan_out_new_article(sender, **kwargs):
+    if kwargs["created"]:
+        article = kwargs["instance"]
+        transaction.on_commit(lambda: fan_out_article.delay(article.id))
+
+
+@receiver(post_save, sender=Subscription)
+def backfill_timeline_for_new_subscription(sender, **kwargs):
+    if kwargs["created"]:
+        subscription = kwargs["instance"]
+        transaction.on_commit(
+            lambda: backfill_timeline.delay(
+                subscription.subscriber_id, [subscription.target_id]
+            )
+        )
+
+
+@receiver(post_delete, sender=Subscription)
+def prune_timeline_for_deleted_subscription(sender, **kwargs):
+    subscription = kwargs["instance"]
+    transaction.on_commit(
+        lambda: prune_timeline.delay(
+            subscription.subscriber_id, [subscription.target_id]
+        )
+    )
+
+
+@receiver(post_delete, sender=Subscription)
+def mark_subscription_counters_dirty(sender, **kwargs):
+    subscription = kwargs["instance"]
+    counters.mark_dirty(Author, [subscription.subscriber_id, subscription.target_id])
+
+
+@receiver(post_delete, sender=Article)
+def mark_article_counters_dirty(sender, **kwargs):
+    counters.mark_dirty(Author, [kwargs["instance"].author_id])
+
+
+@receiver(post_delete, sender=LikedItem)
+def mark_like_counters_dirty(sender, **kwargs):
+    counters.mark_dirty(Article, [kwargs["instance"].article_id])
+
+
+@receiver([post_save, post_delete], sender=Author)
+def touch_author_version(sender, **kwargs):
+    versions.touch("author", [kwargs["instance"].pk])
+
+
+@receiver([post_save, post_delete], sender=Article)
+def touch_article_version(sender, **kwargs):
+    versions.touch("article", [kwargs["instance"].pk])
+
+
+@receiver([post_save, post_delete], sender=Subscription)
+def touch_subscriber_viewer_version(sender, **kwargs):
+    versions.touch("viewer", [kwargs["instance"].subscriber_id])
+
+
+@receiver([post_save, post_delete], sender=LikedItem)
+def touch_liker_viewer_version(sender, **kwargs):
+    versions.touch("viewer", [kwargs["instance"].author_id])
+
+
+@receiver(post_save, sender=LikedItem)
+def record_trending_like(sender, **kwargs):
+    if kwargs["created"]:
+        like = kwargs["instance"]
+        likes = [(like.article_id, like.created_at)]
+        transaction.on_commit(lambda: trending.record(likes))
+
+
+@receiver(post_delete, sender=LikedItem)
+def record_trending_dislike(sender, **kwargs):
+    like = kwargs["instance"]
+    likes = [(like.article_id, like.created_at)]
+    transaction.on_commit(lambda: trending.record(likes, sign=-1))
+
+
+@receiver(post_delete, sender=Article)
+def remove_trending_article(sender, **kwargs):
+    article_id = kwargs["instance"].pk
+    transaction.on_commit(lambda: trending.remove([article_id]))
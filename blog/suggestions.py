@@ -0,0 +1,195 @@
+from itertools import islice
+import numpy as np
+from django.conf import settings
+from django_redis import get_redis_connection
+from .models import Subscription
+
+
+def get_suggestions_key(author_id):
+    return f"author:{author_id}:suggestions"
+
+
+class SubscriptionGraph:
+    """
+    Subscriptions in compressed sparse row form over dense row numbers: the
+    author with id `ids[i]` is row `i`, and its targets are the rows
+    indices[indptr[i]:indptr[i + 1]], in ascending order. Arrays are sized
+    by the number of authors with subscriptions, whatever their ids.
+    """
+
+    def __init__(self, ids, indptr, indices):
+        self.ids = ids
+        self.indptr = indptr
+        self.indices = indices
+        self.size = len(indptr) - 1
+        self.degrees = np.diff(indptr)
+        sources = np.repeat(np.arange(self.size, dtype=np.int64), self.degrees)
+        # Sorted, so that edges are looked up with a binary search.
+        self.keys = sources * self.size + indices
+
+    @classmethod
+    def load(cls, chunk_size):
+        """
+        Streams the subscriptions ordered by (subscriber, target), which the
+        unique index of the table serves, into the arrays chunk by chunk.
+        """
+
+        rows = (
+            Subscription.objects.using("default")
+            .order_by("subscriber_id", "target_id")
+            .values_list("subscriber_id", "target_id")
+            .iterator(chunk_size=chunk_size)
+        )
+        chunks = []
+        while chunk := list(islice(rows, chunk_size)):
+            chunks.append(np.array(chunk, dtype=np.int64))
+        edges = np.concatenate(chunks) if chunks else np.empty((0, 2), np.int64)
+        return cls.from_edges(edges)
+
+    @classmethod
+    def from_edges(cls, edges):
+        """
+        Builds the graph from an array of (subscriber, target) id rows
+        ordered by subscriber, then target. Ids are numbered in ascending
+        order, which keeps the rows in that order.
+        """
+
+        ids, rows = np.unique(edges, return_inverse=True)
+        rows = rows.reshape(edges.shape)
+        size = len(ids)
+        counts = np.bincount(rows[:, 0], minlength=size)
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(ids, indptr, rows[:, 1].copy())
+
+    def get_rows(self, author_ids):
+        return np.searchsorted(self.ids, author_ids)
+
+    def has_edges(self, sources, targets):
+        keys = sources * self.size + targets
+        positions = np.searchsorted(self.keys, keys)
+        positions[positions == len(self.keys)] = 0
+        return self.keys[positions] == keys
+
+    def expand(self, rows):
+        """
+        Returns (owners, neighbors) with every target of the given rows,
+        where owners are the positions of their rows in `rows`.
+        """
+
+        starts = self.indptr[rows]
+        lengths = self.degrees[rows]
+        owners = np.repeat(np.arange(len(rows)), lengths)
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        return owners, self.indices[np.repeat(starts, lengths) + offsets]
+
+    def get_batches(self, budget):
+        """
+        Splits the authors with subscriptions into batches whose two-hop
+        neighborhoods hold about `budget` paths in total.
+        """
+
+        sources = np.flatnonzero(self.degrees)
+        hops = np.zeros(len(self.indices) + 1, dtype=np.int64)
+        np.cumsum(self.degrees[self.indices], out=hops[1:])
+        paths = hops[self.indptr[sources + 1]] - hops[self.indptr[sources]]
+        cumulative = np.cumsum(paths)
+        start = 0
+        while start < len(sources):
+            done = cumulative[start - 1] if start else 0
+            end = np.searchsorted(cumulative, done + budget, side="right")
+            end = max(end, start + 1)
+            yield sources[start:end]
+            start = end
+
+    def count_two_hops(self, sources, budget, limit):
+        """
+        Scores the authors two subscriptions away from each source by the
+        number of followees subscribed to them, counting the followees who
+        subscribe back twice. Returns the top `limit` (owner, candidate,
+        score) rows per source, where owner is the position in `sources`
+        and candidates are graph rows.
+        """
+
+        owners, followees = self.expand(sources)
+        # An author whose neighborhood alone exceeds the budget is scored
+        # from the followees that fit into it.
+        fits = np.cumsum(self.degrees[followees]) <= budget
+        owners, followees = owners[fits], followees[fits]
+        weights = 1 + self.has_edges(followees, sources[owners])
+
+        hops, candidates = self.expand(followees)
+        owners, weights = owners[hops], weights[hops]
+        keep = (candidates != sources[owners]) & ~self.has_edges(
+            sources[owners], candidates
+        )
+        keys = owners[keep] * self.size + candidates[keep]
+        keys, inverse = np.unique(keys, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights[keep])
+
+        owners, candidates = keys // self.size, keys % self.size
+        order = np.lexsort((candidates, -scores, owners))
+        owners, candidates, scores = owners[order], candidates[order], scores[order]
+        ranks = np.arange(len(owners)) - np.searchsorted(owners, owners)
+        top = ranks < limit
+        return owners[top], candidates[top], scores[top]
+
+
+def compute():
+    redis = get_redis_connection("default")
+    lock = redis.lock("suggestions:compute", timeout=settings.SUGGESTIONS_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        store(redis, SubscriptionGraph.load(settings.SUGGESTIONS_CHUNK_SIZE))
+    finally:
+        lock.release()
+
+
+def store(redis, graph):
+    """
+    Recomputes the capped suggestion lists of every author who subscribes
+    to someone, one batch of authors at a time.
+    """
+
+    budget = settings.SUGGESTIONS_BATCH_PATHS
+    ttl = int(settings.SUGGESTIONS_TTL.total_seconds())
+    for sources in graph.get_batches(budget):
+        owners, candidates, scores = graph.count_two_hops(
+            sources, budget, settings.SUGGESTIONS_LIMIT
+        )
+        boundaries = np.searchsorted(owners, np.arange(len(sources) + 1))
+        pipeline = redis.pipeline(transaction=False)
+        candidates = graph.ids[candidates]
+        for index, author_id in enumerate(graph.ids[sources].tolist()):
+            start, end = boundaries[index], boundaries[index + 1]
+            key = get_suggestions_key(author_id)
+            pipeline.delete(key)
+            if start < end:
+                mapping = dict(
+                    zip(candidates[start:end].tolist(), scores[start:end].tolist())
+                )
+                pipeline.zadd(key, mapping)
+                pipeline.expire(key, ttl)
+        pipeline.execute()
+
+
+def get_suggestions(author):
+    """
+    Returns the ids of the suggested authors, best first, without the ones
+    the author subscribed to since the lists were computed.
+    """
+
+    redis = get_redis_connection("default")
+    key = get_suggestions_key(author.id)
+    author_ids = [int(author_id) for author_id in redis.zrevrange(key, 0, -1)]
+    # Read from the primary, so that an author just subscribed to is never
+    # suggested again.
+    subscribed = set(
+        Subscription.objects.using("default")
+        .filter(subscriber=author, target__in=author_ids)
+        .values_list("target_id", flat=True)
+    )
+    return [author_id for author_id in author_ids if author_id not in subscribed]
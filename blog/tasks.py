@@ -0,0 +1,97 @@
+from celery import shared_task
+from django.conf import settings
+from django.db.models import Q
+from . import counters, suggestions, timeline, trending
+from .models import Author, Article, Subscription
+
+
+@shared_task
+def fan_out_article(article_id):
+    article = Article.objects.select_related("author").filter(pk=article_id).first()
+    if article is None:
+        return
+    entry = (article.id, timeline.get_score(article.created_at))
+    timeline.push([article.author_id], [entry])
+    if article.author.is_fanned_out:
+        push_to_subscribers(article.author_id, [entry])
+
+
+@shared_task
+def backfill_subscribers(author_id):
+    """
+    Pushes the recent articles of an author who resumed fanning out to the
+    timelines of the subscribers, which were pulling them until then.
+    """
+
+    entries = timeline.get_recent_entries(
+        Q(author=author_id), settings.TIMELINE_MAX_LENGTH
+    )
+    push_to_subscribers(author_id, entries)
+
+
+def push_to_subscribers(author_id, entries):
+    if not entries:
+        return
+    batch_size = settings.TIMELINE_FANOUT_BATCH_SIZE
+    subscriber_ids = (
+        Subscription.objects.filter(target=author_id)
+        .values_list("subscriber_id", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    batch = []
+    for subscriber_id in subscriber_ids:
+        batch.append(subscriber_id)
+        if len(batch) == batch_size:
+            push_to_timelines.delay(batch, entries)
+            batch = []
+    if batch:
+        push_to_timelines.delay(batch, entries)
+
+
+@shared_task
+def push_to_timelines(author_ids, entries):
+    timeline.push(author_ids, entries)
+
+
+@shared_task
+def backfill_timeline(subscriber_id, target_ids):
+    if not timeline.is_ready(subscriber_id):
+        return
+    targets = Author.objects.filter(pk__in=target_ids, is_fanned_out=True)
+    entries = timeline.get_recent_entries(
+        Q(author__in=targets), settings.TIMELINE_MAX_LENGTH
+    )
+    timeline.push([subscriber_id], entries)
+
+
+@shared_task
+def prune_timeline(subscriber_id, target_ids):
+    article_ids = (
+        Article.objects.filter(author_id__in=target_ids)
+        .order_by("-created_at", "-id")
+        .values_list("id", flat=True)[: settings.TIMELINE_MAX_LENGTH]
+    )
+    timeline.remove(subscriber_id, list(article_ids))
+
+
+@shared_task
+def flush_counters():
+    flushed = counters.flush()
+    subscribed = flushed.get((Author, "subscribers_count"), [])
+    for author_id in timeline.update_fan_out(subscribed):
+        backfill_subscribers.delay(author_id)
+
+
+@shared_task
+def reconcile_counters(full=False):
+    counters.reconcile(full=full)
+
+
+@shared_task
+def rescale_trending():
+    trending.rescale()
+
+
+@shared_task
+def compute_suggestions():
+    suggestions.compute()
@@ -0,0 +1,80 @@
+import pytest
+from rest_framework import status
+from blog import access
+from blog.models import Subscription
+
+
+@pytest.mark.django_db
+class TestIsSubscribed:
+    def test_if_subscribed_loads_set_once(
+        self, create_author, django_assert_num_queries
+    ):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        Subscription.objects.create(subscriber=subscriber, target=target)
+        assert access.is_subscribed(subscriber.id, target.id)
+
+        with django_assert_num_queries(0):
+            assert access.is_subscribed(subscriber.id, target.id)
+            assert not access.is_subscribed(target.id, target.id)
+
+    def test_if_revoked_while_loading_doesnt_cache_revoked_subscriber(
+        self, monkeypatch, create_author
+    ):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        subscription = Subscription.objects.create(subscriber=subscriber, target=target)
+        fill = access.caching.fill
+
+        def revoke_then_fill(*args):
+            # The subscription is deleted after the load read it.
+            subscription.delete()
+            access.remove_subscribers(target.id, [subscriber.id])
+            return fill(*args)
+
+        monkeypatch.setattr(access.caching, "fill", revoke_then_fill)
+        assert access.is_subscribed(subscriber.id, target.id)
+        monkeypatch.setattr(access.caching, "fill", fill)
+
+        assert not access.is_subscribed(subscriber.id, target.id)
+
+    def test_if_granted_while_loading_doesnt_cache_missing_subscriber(
+        self, monkeypatch, create_author
+    ):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        fill = access.caching.fill
+
+        def grant_then_fill(*args):
+            Subscription.objects.create(subscriber=subscriber, target=target)
+            access.add_subscribers(target.id, [subscriber.id])
+            return fill(*args)
+
+        monkeypatch.setattr(access.caching, "fill", grant_then_fill)
+        assert not access.is_subscribed(subscriber.id, target.id)
+        monkeypatch.setattr(access.caching, "fill", fill)
+
+        assert access.is_subscribed(subscriber.id, target.id)
+
+
+@pytest.mark.django_db
+class TestPrivateContent:
+    def test_if_not_subscribed_returns_403(
+        self, api_client, authenticate, create_author
+    ):
+        target = create_author(is_private=True)
+        authenticate(create_author())
+
+        response = api_client.get(f"/blog/authors/{target.id}/articles/")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_subscribed_returns_200(self, api_client, authenticate, create_author):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        Subscription.objects.create(subscriber=subscriber, target=target)
+        authenticate(subscriber)
+
+        response = api_client.get(f"/blog/authors/{target.id}/articles/")
+
+        assert response.status_code == status.HTTP_200_OK
@@ -0,0 +1,140 @@
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from blog import access, counters
+from blog.models import Author, Article, Subscription, LikedItem
+
+
+@pytest.mark.django_db
+class TestBatchSubscribe:
+    def test_if_subscribed_reports_each_target(
+        self,
+        api_client,
+        authenticate,
+        create_author,
+        django_capture_on_commit_callbacks,
+    ):
+        subscriber = create_author()
+        target = create_author()
+        subscribed = create_author()
+        Subscription.objects.create(subscriber=subscriber, target=subscribed)
+        authenticate(subscriber)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                "/blog/subscriptions/batch/",
+                {"targets": [target.id, subscribed.id, subscriber.id, 0]},
+                format="json",
+            )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [result["status"] for result in response.data["results"]] == [
+            "created",
+            "exists",
+            "invalid",
+            "not_found",
+        ]
+        pending = counters.get_pending(
+            Author, [subscriber.id, target.id, subscribed.id]
+        )
+        assert pending == {
+            subscriber.id: {"subscriptions_count": 1},
+            target.id: {"subscribers_count": 1},
+        }
+
+    def test_if_subscribed_twice_reports_created_once(self, create_author):
+        subscriber = create_author()
+        target = create_author()
+
+        first = Subscription.objects.subscribe(subscriber, [target.id], timezone.now())
+        second = Subscription.objects.subscribe(subscriber, [target.id], timezone.now())
+
+        assert first == [target.id]
+        assert second == []
+        assert Subscription.objects.filter(subscriber=subscriber).count() == 1
+
+
+@pytest.mark.django_db
+class TestBatchUnsubscribe:
+    def test_if_unsubscribed_decrements_deleted_only(
+        self,
+        api_client,
+        authenticate,
+        create_author,
+        django_capture_on_commit_callbacks,
+    ):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        Subscription.objects.create(subscriber=subscriber, target=target)
+        assert access.is_subscribed(subscriber.id, target.id)
+        authenticate(subscriber)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.delete(
+                "/blog/subscriptions/batch_unsubscribe/",
+                {"targets": [target.id, 0]},
+                format="json",
+            )
+
+        assert [result["status"] for result in response.data["results"]] == [
+            "deleted",
+            "not_found",
+        ]
+        pending = counters.get_pending(Author, [subscriber.id, target.id])
+        assert pending == {
+            subscriber.id: {"subscriptions_count": -1},
+            target.id: {"subscribers_count": -1},
+        }
+        assert not access.is_subscribed(subscriber.id, target.id)
+
+    def test_if_unsubscribed_twice_reports_deleted_once(self, create_author):
+        subscriber = create_author()
+        target = create_author()
+        Subscription.objects.create(subscriber=subscriber, target=target)
+
+        first = Subscription.objects.unsubscribe(subscriber, [target.id])
+        second = Subscription.objects.unsubscribe(subscriber, [target.id])
+
+        assert first == [target.id]
+        assert second == []
+
+
+@pytest.mark.django_db
+class TestBatchLike:
+    def test_if_liked_counts_only_new_likes(
+        self,
+        api_client,
+        authenticate,
+        create_author,
+        django_capture_on_commit_callbacks,
+    ):
+        author = create_author()
+        article = baker.make(Article, author=author)
+        liked = baker.make(Article, author=author)
+        LikedItem.objects.create(author=author, article=liked)
+        authenticate(author)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(
+                "/blog/articles/batch_like/",
+                {"articles": [article.id, liked.id]},
+                format="json",
+            )
+
+        assert [result["status"] for result in response.data["results"]] == [
+            "created",
+            "exists",
+        ]
+        pending = counters.get_pending(Article, [article.id, liked.id])
+        assert pending == {article.id: {"likes_count": 1}}
+
+    def test_if_liked_twice_reports_created_once(self, create_author):
+        author = create_author()
+        article = baker.make(Article, author=author)
+
+        first = LikedItem.objects.like(author, [article.id], timezone.now())
+        second = LikedItem.objects.like(author, [article.id], timezone.now())
+
+        assert first == [article.id]
+        assert second == []
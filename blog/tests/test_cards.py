@@ -0,0 +1,47 @@
+from types import SimpleNamespace
+import pytest
+from blog import cards
+from blog.serializers import AuthorCardMixin
+
+
+@pytest.mark.django_db
+class TestGetCards:
+    def test_if_card_cached_loads_nothing(
+        self, create_author, django_assert_num_queries
+    ):
+        author = create_author(bio="bio")
+        cards.get_cards([author.id])
+
+        with django_assert_num_queries(0):
+            card = cards.get_cards([author.id])[author.id]
+
+        assert card["email"] == author.user.email
+        assert card["bio"] == "bio"
+
+    def test_if_invalidated_while_loading_doesnt_cache_stale_card(
+        self, monkeypatch, create_author
+    ):
+        author = create_author()
+        build_card = cards.build_card
+
+        def build_card_then_update(loaded):
+            card = build_card(loaded)
+            # A concurrent update commits before the load is cached.
+            author.user.email = "changed@example.com"
+            author.user.save()
+            cards.invalidate([author.id])
+            return card
+
+        monkeypatch.setattr(cards, "build_card", build_card_then_update)
+        cards.get_cards([author.id])
+        monkeypatch.setattr(cards, "build_card", build_card)
+
+        card = cards.get_cards([author.id])[author.id]
+
+        assert card["email"] == "changed@example.com"
+
+    def test_if_author_deleted_has_no_email(self):
+        mixin = AuthorCardMixin()
+        mixin.cards = {}
+
+        assert mixin.get_email(SimpleNamespace(id=1)) is None
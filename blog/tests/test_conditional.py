@@ -0,0 +1,68 @@
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from blog import versions
+from blog.models import Article, Subscription
+
+
+@pytest.fixture
+def article(create_author):
+    return baker.make(Article, author=create_author())
+
+
+@pytest.mark.django_db
+class TestConditionalRetrieve:
+    def test_if_etag_matches_returns_304(
+        self, api_client, authenticate, create_author, article
+    ):
+        reader = create_author()
+        Subscription.objects.create(subscriber=reader, target=article.author)
+        authenticate(reader)
+        etag = api_client.get(f"/blog/articles/{article.id}/")["ETag"]
+
+        response = api_client.get(
+            f"/blog/articles/{article.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_if_article_changed_returns_200(
+        self, api_client, authenticate, article, django_capture_on_commit_callbacks
+    ):
+        authenticate(article.author)
+        etag = api_client.get(f"/blog/articles/{article.id}/")["ETag"]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            versions.touch("article", [article.id])
+        response = api_client.get(
+            f"/blog/articles/{article.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+
+    def test_if_access_lost_returns_404_despite_matching_etag(
+        self, api_client, authenticate, create_author, article
+    ):
+        reader = create_author()
+        subscription = Subscription.objects.create(
+            subscriber=reader, target=article.author
+        )
+        authenticate(reader)
+        etag = api_client.get(f"/blog/articles/{article.id}/")["ETag"]
+        subscription.delete()
+
+        response = api_client.get(
+            f"/blog/articles/{article.id}/", HTTP_IF_NONE_MATCH=etag
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_if_article_doesnt_exist_writes_no_version(
+        self, api_client, authenticate, create_author, redis
+    ):
+        authenticate(create_author())
+
+        response = api_client.get("/blog/articles/999999/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert redis.keys("version:*") == []
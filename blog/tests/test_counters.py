@@ -0,0 +1,131 @@
+import pytest
+from blog import counters
+from blog.models import Author, Subscription
+
+
+def buffer(redis, field, author, delta):
+    redis.hincrby(counters.get_pending_key(Author, field), author.id, delta)
+
+
+@pytest.mark.django_db
+class TestFlush:
+    def test_if_deltas_buffered_applies_them(self, redis, create_author):
+        author = create_author()
+        buffer(redis, "subscribers_count", author, 3)
+
+        counters.flush()
+
+        author.refresh_from_db()
+        assert author.subscribers_count == 3
+        assert counters.get_pending(Author, [author.id]) == {}
+
+    def test_if_delta_negative_stops_at_zero(self, redis, create_author):
+        author = create_author(articles_count=1)
+        buffer(redis, "articles_count", author, -2)
+
+        counters.flush()
+
+        author.refresh_from_db()
+        assert author.articles_count == 0
+
+    def test_if_flush_interrupted_resumes_without_counting_twice(
+        self, redis, settings, monkeypatch, create_author
+    ):
+        settings.COUNTERS_FLUSH_BATCH_SIZE = 1
+        authors = [create_author(), create_author()]
+        for author in authors:
+            buffer(redis, "subscribers_count", author, 1)
+        apply_deltas = counters.apply_deltas
+        calls = []
+
+        def crash_on_second_batch(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError
+            apply_deltas(*args)
+
+        monkeypatch.setattr(counters, "apply_deltas", crash_on_second_batch)
+        with pytest.raises(RuntimeError):
+            counters.flush()
+        monkeypatch.setattr(counters, "apply_deltas", apply_deltas)
+
+        # Applied deltas aren't reported as pending any longer.
+        pending = counters.get_pending(Author, [author.id for author in authors])
+        assert sum(len(fields) for fields in pending.values()) == 1
+        counters.flush()
+        for author in authors:
+            author.refresh_from_db()
+            assert author.subscribers_count == 1
+
+
+@pytest.mark.django_db
+class TestPendingCounters:
+    def test_if_subscribed_shows_buffered_counts_before_flush(
+        self,
+        api_client,
+        authenticate,
+        create_author,
+        django_capture_on_commit_callbacks,
+    ):
+        subscriber = create_author()
+        target = create_author()
+        authenticate(subscriber)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.post("/blog/subscriptions/", {"target": target.id})
+        response = api_client.get(f"/blog/authors/{target.id}/")
+
+        assert Author.objects.get(pk=target.id).subscribers_count == 0
+        assert response.data["subscribers_count"] == 1
+
+
+@pytest.mark.django_db
+class TestReconcile:
+    def test_if_counter_drifted_recounts_it(self, create_author):
+        subscriber = create_author()
+        target = create_author(subscribers_count=5)
+        Subscription.objects.create(subscriber=subscriber, target=target)
+
+        counters.reconcile(full=True)
+
+        target.refresh_from_db()
+        assert target.subscribers_count == 1
+
+    def test_if_flush_in_progress_waits_and_drops_recounted_deltas(
+        self, redis, create_author
+    ):
+        subscriber = create_author()
+        target = create_author()
+        # Committed, with its change still buffered while a flush holds the lock.
+        Subscription.objects.create(subscriber=subscriber, target=target)
+        buffer(redis, "subscribers_count", target, 1)
+        redis.lock("counters:flush", timeout=1).acquire()
+
+        counters.reconcile(full=True)
+        counters.flush()
+
+        target.refresh_from_db()
+        assert target.subscribers_count == 1
+        assert counters.get_pending(Author, [target.id]) == {}
+
+    def test_if_change_buffered_during_recount_stays_buffered(
+        self, redis, monkeypatch, create_author
+    ):
+        subscriber = create_author()
+        target = create_author()
+        Subscription.objects.create(subscriber=subscriber, target=target)
+        buffer(redis, "subscribers_count", target, 1)
+        touch = counters.versions.touch
+
+        def subscribe_meanwhile(kind, pks):
+            # Committed after the snapshot of the recount, not part of it.
+            buffer(redis, "subscribers_count", target, 1)
+            touch(kind, pks)
+
+        monkeypatch.setattr(counters.versions, "touch", subscribe_meanwhile)
+        counters.recount(redis, Author, [target.id])
+
+        target.refresh_from_db()
+        assert target.subscribers_count == 1
+        pending = counters.get_pending(Author, [target.id])
+        assert pending == {target.id: {"subscribers_count": 1}}
@@ -0,0 +1,112 @@
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from blog.models import Article, LikedItem, Subscription
+
+
+def get_ids(response):
+    return [row["id"] for row in response.data["results"]]
+
+
+@pytest.fixture
+def articles(create_author, authenticate):
+    author = create_author()
+    articles = baker.make(Article, author=author, _quantity=5)
+    # Rows sharing a timestamp are ordered by id.
+    Article.objects.filter(author=author).update(created_at=timezone.now())
+    authenticate(author)
+    return author, [article.id for article in reversed(articles)]
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    def test_if_pages_follow_each_other_without_gaps(self, api_client, articles):
+        author, ids = articles
+
+        first = api_client.get("/blog/articles/", {"author": author.id, "limit": 2})
+        second = api_client.get(first.data["next"])
+        third = api_client.get(second.data["next"])
+
+        assert get_ids(first) + get_ids(second) + get_ids(third) == ids
+        assert first.data["previous"] is None
+        assert third.data["next"] is None
+
+    def test_if_previous_page_is_the_one_before(self, api_client, articles):
+        author, ids = articles
+        first = api_client.get("/blog/articles/", {"author": author.id, "limit": 2})
+        second = api_client.get(first.data["next"])
+
+        response = api_client.get(second.data["previous"])
+
+        assert get_ids(response) == ids[:2]
+
+    def test_if_rows_inserted_meanwhile_dont_shift_next_page(
+        self, api_client, articles
+    ):
+        author, ids = articles
+        first = api_client.get("/blog/articles/", {"author": author.id, "limit": 2})
+        baker.make(Article, author=author)
+
+        response = api_client.get(first.data["next"])
+
+        assert get_ids(response) == ids[2:4]
+
+    def test_if_cursor_invalid_returns_404(self, api_client, articles):
+        author, _ = articles
+
+        response = api_client.get(
+            "/blog/articles/", {"author": author.id, "cursor": "invalid"}
+        )
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_if_limit_above_maximum_is_capped(
+        self, api_client, create_author, authenticate
+    ):
+        author = create_author()
+        subscribers = [create_author() for _ in range(21)]
+        Subscription.objects.bulk_create(
+            Subscription(subscriber=subscriber, target=author)
+            for subscriber in subscribers
+        )
+        authenticate(author)
+
+        response = api_client.get(
+            f"/blog/authors/{author.id}/subscribers/", {"limit": 100}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 20
+        assert response.data["next"] is not None
+
+    def test_if_subscribers_are_paged_in_subscription_order(
+        self, api_client, create_author, authenticate
+    ):
+        author = create_author()
+        subscribers = [create_author() for _ in range(3)]
+        # Authors created first subscribe last.
+        for subscriber in reversed(subscribers):
+            Subscription.objects.create(subscriber=subscriber, target=author)
+        authenticate(author)
+
+        first = api_client.get(f"/blog/authors/{author.id}/subscribers/", {"limit": 2})
+        second = api_client.get(first.data["next"])
+
+        ids = [subscriber.id for subscriber in subscribers]
+        assert get_ids(first) + get_ids(second) == ids
+        assert second.data["next"] is None
+
+    def test_if_likes_are_paged_in_like_order(
+        self, api_client, create_author, authenticate
+    ):
+        article = baker.make(Article, author=create_author())
+        authors = [create_author() for _ in range(3)]
+        for author in reversed(authors):
+            LikedItem.objects.create(author=author, article=article)
+        authenticate(authors[0])
+
+        first = api_client.get(f"/blog/articles/{article.id}/likes/", {"limit": 2})
+        second = api_client.get(first.data["next"])
+
+        assert get_ids(first) + get_ids(second) == [author.id for author in authors]
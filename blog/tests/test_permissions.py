@@ -0,0 +1,50 @@
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from blog.models import Article, Subscription
+
+
+@pytest.fixture
+def article(create_author):
+    return baker.make(Article, author=create_author(), title="a")
+
+
+def use_token(api_client, author):
+    token = AccessToken.for_user(author.user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+@pytest.mark.django_db
+class TestIsOwnerOrReadOnly:
+    def test_if_owner_updates_article_returns_200(self, api_client, article):
+        use_token(api_client, article.author)
+
+        response = api_client.patch(f"/blog/articles/{article.id}/", {"title": "b"})
+
+        assert response.status_code == status.HTTP_200_OK
+        article.refresh_from_db()
+        assert article.title == "b"
+
+    def test_if_other_author_updates_article_returns_403(
+        self, api_client, article, create_author
+    ):
+        other = create_author()
+        Subscription.objects.create(subscriber=other, target=article.author)
+        use_token(api_client, other)
+
+        response = api_client.patch(f"/blog/articles/{article.id}/", {"title": "b"})
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_update_doesnt_load_users_or_authors(
+        self, api_client, article, django_assert_num_queries
+    ):
+        use_token(api_client, article.author)
+        api_client.get("/blog/authors/me/")
+
+        # The article, its update and the like state of the response.
+        with django_assert_num_queries(3) as context:
+            api_client.patch(f"/blog/articles/{article.id}/", {"title": "b"})
+
+        assert not any('"users_user"' in query["sql"] for query in context)
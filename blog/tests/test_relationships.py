@@ -0,0 +1,58 @@
+import pytest
+from rest_framework import status
+from blog.models import Subscription
+
+
+@pytest.mark.django_db
+class TestRelationships:
+    def test_if_returns_status_of_each_author(
+        self, api_client, create_author, authenticate
+    ):
+        viewer = create_author()
+        followed, follower = create_author(), create_author(is_private=True)
+        mutual, stranger = create_author(), create_author()
+        Subscription.objects.create(subscriber=viewer, target=followed)
+        Subscription.objects.create(subscriber=follower, target=viewer)
+        Subscription.objects.create(subscriber=viewer, target=mutual)
+        Subscription.objects.create(subscriber=mutual, target=viewer)
+        authenticate(viewer)
+        authors = [followed, follower, mutual, stranger]
+
+        response = api_client.get(
+            "/blog/authors/relationships/",
+            {"ids": ",".join(str(author.id) for author in authors)},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {
+            followed.id: {"following": True, "followed_by": False, "is_private": False},
+            follower.id: {"following": False, "followed_by": True, "is_private": True},
+            mutual.id: {"following": True, "followed_by": True, "is_private": False},
+            stranger.id: {
+                "following": False,
+                "followed_by": False,
+                "is_private": False,
+            },
+        }
+
+    def test_if_unknown_authors_are_left_out(
+        self, api_client, create_author, authenticate
+    ):
+        viewer = create_author()
+        authenticate(viewer)
+
+        response = api_client.get(
+            "/blog/authors/relationships/", {"ids": f"{viewer.id},0"}
+        )
+
+        assert list(response.data) == [viewer.id]
+
+    @pytest.mark.parametrize("ids", ["1,a", ",".join(map(str, range(1, 502)))])
+    def test_if_ids_invalid_returns_400(
+        self, api_client, create_author, authenticate, ids
+    ):
+        authenticate(create_author())
+
+        response = api_client.get("/blog/authors/relationships/", {"ids": ids})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,55 @@
+import pytest
+from blog import access, cards, suggestions, timeline
+from blog.models import Subscription
+from utils.routers import ReadRouting, current_routing
+
+
+@pytest.fixture
+def routed_to_replica():
+    # A replica that doesn't exist, so that any read routed there fails.
+    routing = ReadRouting()
+    routing.database = "replica"
+    token = current_routing.set(routing)
+    yield
+    current_routing.reset(token)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures("routed_to_replica")
+class TestCacheFillsReadPrimary:
+    def test_if_card_is_loaded_from_primary(self, create_author):
+        author = create_author()
+
+        assert cards.get_cards([author.id])[author.id]["id"] == author.id
+
+    def test_if_subscribers_are_loaded_from_primary(self, create_author):
+        subscriber = create_author()
+        target = create_author(is_private=True)
+        Subscription.objects.create(subscriber=subscriber, target=target)
+
+        assert access.is_subscribed(subscriber.id, target.id)
+
+    def test_if_subscription_graph_is_loaded_from_primary(self, create_author):
+        subscriber, target = create_author(), create_author()
+        Subscription.objects.create(subscriber=subscriber, target=target)
+
+        graph = suggestions.SubscriptionGraph.load(chunk_size=10)
+
+        sources, targets = graph.get_rows([subscriber.id]), graph.get_rows([target.id])
+        assert graph.has_edges(sources, targets).all()
+
+    def test_if_suggestions_are_filtered_on_primary(self, create_author, redis):
+        author, suggested = create_author(), create_author()
+        redis.zadd(suggestions.get_suggestions_key(author.id), {suggested.id: 1})
+        Subscription.objects.create(subscriber=author, target=suggested)
+
+        assert suggestions.get_suggestions(author) == []
+
+    def test_if_timeline_is_rebuilt_from_primary(self, create_author, redis):
+        author = create_author()
+
+        timeline.rebuild(author)
+        home = timeline.HomeTimeline(author)
+
+        assert timeline.is_ready(author.id)
+        assert home.unfanned_authors == []
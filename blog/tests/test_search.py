@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from rest_framework import status
+from blog.models import Article, Subscription
+
+User = get_user_model()
+
+
+def get_ids(response):
+    return [row["id"] for row in response.data["results"]]
+
+
+@pytest.fixture
+def viewer(create_author, authenticate):
+    viewer = create_author()
+    authenticate(viewer)
+    return viewer
+
+
+@pytest.mark.django_db
+class TestSearchArticles:
+    def test_if_matching_articles_are_ranked(self, api_client, create_author, viewer):
+        author = create_author()
+        title_match = baker.make(Article, author=author, title="Postgres indexes")
+        content_match = baker.make(
+            Article, author=author, title="Notes", content="about postgres"
+        )
+        baker.make(Article, author=author, title="Redis streams")
+
+        response = api_client.get("/blog/search/articles/", {"q": "postgres"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert get_ids(response) == [title_match.id, content_match.id]
+
+    def test_if_updated_article_is_found_by_new_words(
+        self, api_client, create_author, viewer
+    ):
+        article = baker.make(Article, author=create_author(), title="Draft")
+        article.title = "Partitioning"
+        article.save()
+
+        response = api_client.get("/blog/search/articles/", {"q": "partitioning"})
+
+        assert get_ids(response) == [article.id]
+
+    def test_if_private_author_is_hidden_unless_subscribed(
+        self, api_client, create_author, viewer
+    ):
+        hidden = baker.make(
+            Article, author=create_author(is_private=True), title="Postgres"
+        )
+        followed = create_author(is_private=True)
+        Subscription.objects.create(subscriber=viewer, target=followed)
+        shown = baker.make(Article, author=followed, title="Postgres")
+
+        response = api_client.get("/blog/search/articles/", {"q": "postgres"})
+
+        assert get_ids(response) == [shown.id]
+        assert hidden.id not in get_ids(response)
+
+    def test_if_term_missing_returns_400(self, api_client, viewer):
+        response = api_client.get("/blog/search/articles/")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestSearchAuthors:
+    def test_if_author_matches_words_of_bio(self, api_client, create_author, viewer):
+        author = create_author(bio="photographer in Lisbon")
+        create_author(bio="baker")
+
+        response = api_client.get("/blog/search/authors/", {"q": "photographr"})
+
+        assert get_ids(response) == [author.id]
+
+    def test_if_autocomplete_matches_email_prefix(
+        self, api_client, create_author, viewer
+    ):
+        authors = [create_author() for _ in range(3)]
+        for author, email in zip(authors, ["ana@x.io", "anna@x.io", "bob@x.io"]):
+            User.objects.filter(pk=author.user_id).update(email=email)
+
+        response = api_client.get("/blog/search/autocomplete/", {"q": "An"})
+
+        assert [row["id"] for row in response.data] == [authors[0].id, authors[1].id]
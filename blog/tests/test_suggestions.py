@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from blog import suggestions
+from blog.models import Subscription
+from blog.suggestions import SubscriptionGraph
+
+
+def build_graph(edges):
+    return SubscriptionGraph.from_edges(np.array(sorted(edges), dtype=np.int64))
+
+
+class TestSubscriptionGraph:
+    @pytest.mark.parametrize("offset", [0, 100_000, 2**40])
+    def test_if_followee_subscribes_back_counts_twice(self, offset):
+        author, followee, candidate = offset + 1, offset + 2, offset + 3
+        graph = build_graph(
+            [(author, followee), (followee, author), (followee, candidate)]
+        )
+
+        owners, candidates, scores = graph.count_two_hops(
+            graph.get_rows([author]), budget=100, limit=10
+        )
+
+        assert owners.tolist() == [0]
+        assert graph.ids[candidates].tolist() == [candidate]
+        assert scores.tolist() == [2.0]
+
+    def test_if_ids_large_sizes_arrays_by_author_count(self):
+        edges = [(2**40, 2**40 + 1), (2**40 + 1, 2**40 + 2)]
+        graph = build_graph(edges)
+        sources = graph.get_rows([2**40, 2**40 + 1, 2**40 + 1])
+        targets = graph.get_rows([2**40 + 1, 2**40 + 2, 2**40])
+
+        assert graph.size == 3
+        assert graph.has_edges(sources, targets).tolist() == [True, True, False]
+
+    def test_if_candidate_followed_already_skips_it(self):
+        graph = build_graph([(1, 2), (1, 3), (2, 3), (2, 4)])
+
+        _, candidates, _ = graph.count_two_hops(
+            graph.get_rows([1]), budget=100, limit=10
+        )
+
+        assert graph.ids[candidates].tolist() == [4]
+
+
+@pytest.mark.django_db
+class TestGetSuggestions:
+    def test_if_subscribed_since_computed_skips_author(self, create_author):
+        author, followee, first, second = [create_author() for _ in range(4)]
+        Subscription.objects.create(subscriber=author, target=followee)
+        Subscription.objects.create(subscriber=followee, target=first)
+        Subscription.objects.create(subscriber=followee, target=second)
+        suggestions.compute()
+        Subscription.objects.create(subscriber=author, target=first)
+
+        assert suggestions.get_suggestions(author) == [second.id]
@@ -0,0 +1,91 @@
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from blog import counters, tasks, timeline
+from blog.models import Author, Article, Subscription
+
+
+@pytest.fixture
+def feed(create_author, authenticate):
+    reader = create_author()
+    writer = create_author()
+    Subscription.objects.create(subscriber=reader, target=writer)
+    articles = baker.make(Article, author=writer, _quantity=4)
+    authenticate(reader)
+    return reader, writer, articles
+
+
+@pytest.mark.django_db
+class TestHomeTimeline:
+    def test_if_article_deleted_from_page_keeps_page_full(self, api_client, feed):
+        *_, articles = feed
+        api_client.get("/blog/articles/")
+        Article.objects.filter(pk=articles[2].id).delete()
+
+        response = api_client.get("/blog/articles/", {"limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        ids = [article["id"] for article in response.data["results"]]
+        assert ids == [articles[3].id, articles[1].id]
+        assert response.data["next"] is not None
+
+    def test_if_next_page_follows_deleted_article(self, api_client, feed):
+        *_, articles = feed
+        api_client.get("/blog/articles/")
+        Article.objects.filter(pk=articles[2].id).delete()
+        first_page = api_client.get("/blog/articles/", {"limit": 2})
+
+        response = api_client.get(first_page.data["next"])
+
+        ids = [article["id"] for article in response.data["results"]]
+        assert ids == [articles[0].id]
+        assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+class TestUpdateFanOut:
+    @pytest.fixture(autouse=True)
+    def thresholds(self, settings):
+        settings.TIMELINE_FANOUT_THRESHOLD = 3
+        settings.TIMELINE_FANOUT_RESUME_THRESHOLD = 2
+
+    def buffer(self, redis, author, delta):
+        key = counters.get_pending_key(Author, "subscribers_count")
+        redis.hincrby(key, author.id, delta)
+
+    def test_if_pending_subscribers_reach_threshold_stops_fan_out(
+        self, redis, create_author
+    ):
+        author = create_author(subscribers_count=2)
+        self.buffer(redis, author, 1)
+
+        assert timeline.update_fan_out([author.id]) == []
+
+        author.refresh_from_db()
+        assert not author.is_fanned_out
+
+    def test_if_count_between_thresholds_keeps_pulling(self, create_author):
+        author = create_author(subscribers_count=2, is_fanned_out=False)
+
+        assert timeline.update_fan_out([author.id]) == []
+
+        author.refresh_from_db()
+        assert not author.is_fanned_out
+
+    def test_if_count_falls_below_resume_threshold_backfills_subscribers(
+        self, redis, create_author
+    ):
+        reader = create_author()
+        writer = create_author(subscribers_count=2, is_fanned_out=False)
+        Subscription.objects.create(subscriber=reader, target=writer)
+        article = baker.make(Article, author=writer)
+        timeline.rebuild(reader)
+        assert not redis.exists(timeline.get_timeline_key(reader.id))
+        self.buffer(redis, writer, -1)
+
+        tasks.flush_counters()
+
+        writer.refresh_from_db()
+        assert writer.is_fanned_out
+        entries = redis.zrange(timeline.get_timeline_key(reader.id), 0, -1)
+        assert entries == [str(article.id).encode()]
@@ -0,0 +1,83 @@
+import pytest
+from django.utils import timezone
+from model_bakery import baker
+from blog import trending
+from blog.models import Article
+from blog.trending import EPOCH_KEY, TRENDING_KEY
+
+
+def get_ids(response):
+    return [row["id"] for row in response.data["results"]]
+
+
+def like(articles, liked_at=None, times=1):
+    liked_at = liked_at or timezone.now()
+    trending.record([(article.id, liked_at) for article in articles] * times)
+
+
+def move_epoch_back(redis, half_lives):
+    """
+    Moves the epoch back as if the ranking was last rescaled `half_lives`
+    ago, which scores the likes recorded from then on as many times higher.
+    """
+
+    epoch = trending.get_epoch(redis)
+    redis.set(EPOCH_KEY, epoch - half_lives * trending.get_half_life())
+
+
+@pytest.fixture
+def articles(create_author, authenticate):
+    viewer = create_author()
+    authenticate(viewer)
+    return baker.make(Article, author=create_author(), _quantity=3)
+
+
+@pytest.mark.django_db
+class TestTrending:
+    def test_if_recent_likes_outweigh_older_ones(self, api_client, articles):
+        recent, old, _ = articles
+        like([recent])
+        half_lives_ago = timezone.now() - 2 * trending.settings.TRENDING_HALF_LIFE
+        like([old], half_lives_ago, times=3)
+
+        response = api_client.get("/blog/articles/trending/")
+
+        assert get_ids(response) == [recent.id, old.id]
+
+    def test_if_unlike_removes_decayed_article(self, api_client, articles):
+        liked_at = timezone.now()
+        like(articles[:1], liked_at)
+
+        trending.record([(articles[0].id, liked_at)], sign=-1)
+
+        assert api_client.get("/blog/articles/trending/").data["results"] == []
+
+    def test_if_private_author_is_hidden(self, api_client, articles, create_author):
+        hidden = baker.make(Article, author=create_author(is_private=True))
+        like([articles[0], hidden])
+
+        response = api_client.get("/blog/articles/trending/")
+
+        assert get_ids(response) == [articles[0].id]
+
+    def test_if_rescale_scales_scores_down_to_new_epoch(self, redis, articles):
+        move_epoch_back(redis, 2)
+        like(articles[:1])
+        score = redis.zscore(TRENDING_KEY, articles[0].id)
+
+        shift = trending.rescale()
+
+        assert shift == 2
+        assert redis.zscore(TRENDING_KEY, articles[0].id) == score / 4
+
+    def test_if_cursor_survives_rescale(self, api_client, redis, articles):
+        move_epoch_back(redis, 1)
+        for times, article in enumerate(articles, start=1):
+            like([article], times=times)
+        first = api_client.get("/blog/articles/trending/", {"limit": 1})
+
+        trending.rescale()
+        response = api_client.get(first.data["next"])
+
+        assert get_ids(first) == [articles[2].id]
+        assert get_ids(response) == [articles[1].id]
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from blog.models import Article, LikedItem, Subscription
+
+
+def count_queries(api_client, *args):
+    with CaptureQueriesContext(connection) as context:
+        api_client.get(*args)
+    return len(context.captured_queries)
+
+
+@pytest.mark.django_db
+class TestLikedByMe:
+    def test_if_liked_article_is_marked(self, api_client, create_author, authenticate):
+        viewer, writer = create_author(), create_author()
+        Subscription.objects.create(subscriber=viewer, target=writer)
+        liked, other = baker.make(Article, author=writer, _quantity=2)
+        LikedItem.objects.create(author=viewer, article=liked)
+        authenticate(viewer)
+
+        response = api_client.get("/blog/articles/", {"author": writer.id})
+
+        liked_by_me = {
+            row["id"]: row["liked_by_me"] for row in response.data["results"]
+        }
+        assert liked_by_me == {liked.id: True, other.id: False}
+
+    def test_if_longer_page_makes_no_more_queries(
+        self, api_client, create_author, authenticate
+    ):
+        viewer, writer = create_author(), create_author()
+        Subscription.objects.create(subscriber=viewer, target=writer)
+        articles = baker.make(Article, author=writer, _quantity=6)
+        for article in articles:
+            LikedItem.objects.create(author=viewer, article=article)
+        authenticate(viewer)
+        params = {"author": writer.id}
+        api_client.get("/blog/articles/", {**params, "limit": 6})
+
+        short = count_queries(api_client, "/blog/articles/", {**params, "limit": 2})
+        long = count_queries(api_client, "/blog/articles/", {**params, "limit": 6})
+
+        assert long == short
+
+
+@pytest.mark.django_db
+class TestIsSubscribed:
+    def test_if_subscribed_author_is_marked(
+        self, api_client, create_author, authenticate
+    ):
+        viewer, target = create_author(), create_author()
+        other = create_author()
+        Subscription.objects.create(subscriber=viewer, target=target)
+        subscriber = create_author()
+        for author in (target, other):
+            Subscription.objects.create(subscriber=author, target=subscriber)
+        authenticate(viewer)
+
+        response = api_client.get(f"/blog/authors/{subscriber.id}/subscribers/")
+
+        is_subscribed = {
+            row["id"]: row["is_subscribed"] for row in response.data["results"]
+        }
+        assert is_subscribed == {target.id: True, other.id: False}
@@ -1,5 +1,13 @@
-from rest_framework.throttling import UserRateThrottle
+from utils.throttling import GCRAThrottle
 
 
-class SubscriptionUserRateThrottle(UserRateThrottle):
-    rate = "100/hour"
+class SubscriptionThrottle(GCRAThrottle):
+    scope = "subscriptions"
+
+
+class LikeThrottle(GCRAThrottle):
+    scope = "likes"
+
+
+class ArticleCreateThrottle(GCRAThrottle):
+    scope = "articles"
@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django_redis import get_redis_connection
+from .models import Author, Article, Subscription
+from . import counters
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def get_timeline_key(author_id):
+    return f"timeline:{author_id}"
+
+
+def get_ready_key(author_id):
+    return f"timeline:{author_id}:ready"
+
+
+def get_score(created_at):
+    """
+    Returns the exact number of microseconds since the epoch, which fits
+    in the 53-bit mantissa of a Redis sorted set score.
+    """
+
+    return (created_at - EPOCH) // timedelta(microseconds=1)
+
+
+def push(author_ids, entries):
+    """
+    Adds (article_id, score) entries to the timelines of the given authors,
+    trimming each timeline to the configured maximum length.
+    """
+
+    if not author_ids or not entries:
+        return
+    mapping = {article_id: score for article_id, score in entries}
+    ttl = int(settings.TIMELINE_TTL.total_seconds())
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    for author_id in author_ids:
+        key = get_timeline_key(author_id)
+        pipeline.zadd(key, mapping)
+        pipeline.zremrangebyrank(key, 0, -settings.TIMELINE_MAX_LENGTH - 1)
+        pipeline.expire(key, ttl, nx=True)
+    pipeline.execute()
+
+
+def remove(author_id, article_ids):
+    if article_ids:
+        redis = get_redis_connection("default")
+        redis.zrem(get_timeline_key(author_id), *article_ids)
+
+
+def is_ready(author_id):
+    redis = get_redis_connection("default")
+    return bool(redis.exists(get_ready_key(author_id)))
+
+
+def update_fan_out(author_ids):
+    """
+    Switches the given authors between pushing their articles to their
+    subscribers and having them pulled on read, by their subscriber count
+    with the buffered changes. Authors stop fanning out at
+    TIMELINE_FANOUT_THRESHOLD subscribers and resume below
+    TIMELINE_FANOUT_RESUME_THRESHOLD, so that an author around the
+    threshold doesn't switch back and forth. Returns the ids of the authors
+    who resumed, whose recent articles their subscribers' timelines miss.
+    """
+
+    author_ids = list(author_ids)
+    pending = counters.get_pending(Author, author_ids)
+    authors = Author.objects.filter(pk__in=author_ids).values_list(
+        "id", "subscribers_count", "is_fanned_out"
+    )
+    stopped, resumed = [], []
+    for author_id, subscribers_count, is_fanned_out in authors:
+        subscribers_count += pending.get(author_id, {}).get("subscribers_count", 0)
+        if is_fanned_out and subscribers_count >= settings.TIMELINE_FANOUT_THRESHOLD:
+            stopped.append(author_id)
+        elif (
+            not is_fanned_out
+            and subscribers_count < settings.TIMELINE_FANOUT_RESUME_THRESHOLD
+        ):
+            resumed.append(author_id)
+    Author.objects.filter(pk__in=stopped).update(is_fanned_out=False)
+    Author.objects.filter(pk__in=resumed).update(is_fanned_out=True)
+    return resumed
+
+
+def get_position(entry):
+    """
+    Returns the (created_at, id) position of a timeline entry, in the form
+    cursors carry it.
+    """
+
+    article_id, score = entry
+    created_at = EPOCH + timedelta(microseconds=score)
+    return [created_at.isoformat(), article_id]
+
+
+def get_recent_entries(authors, limit, reverse=False, using=None):
+    ordering = ("created_at", "id") if reverse else ("-created_at", "-id")
+    articles = (
+        Article.objects.using(using)
+        .filter(authors)
+        .order_by(*ordering)
+        .values_list("id", "created_at")[:limit]
+    )
+    return [(article_id, get_score(created_at)) for article_id, created_at in articles]
+
+
+def rebuild(author):
+    """
+    Materializes the timeline of an author from the database, e.g. after
+    the Redis key expired or for an author who never had a feed. Reads from
+    the primary, as the timeline is kept for TIMELINE_TTL.
+    """
+
+    followed = Subscription.objects.filter(
+        subscriber=author, target__is_fanned_out=True
+    ).values("target_id")
+    entries = get_recent_entries(
+        Q(author__in=followed) | Q(author=author),
+        settings.TIMELINE_MAX_LENGTH,
+        using="default",
+    )
+    ttl = int(settings.TIMELINE_TTL.total_seconds())
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline()
+    pipeline.delete(get_timeline_key(author.id))
+    if entries:
+        pipeline.zadd(get_timeline_key(author.id), dict(entries))
+        pipeline.expire(get_timeline_key(author.id), ttl)
+    pipeline.set(get_ready_key(author.id), 1, ex=ttl)
+    pipeline.execute()
+
+
+class HomeTimeline:
+    """
+    Home feed of an author: article ids pushed into the author's timeline on
+    write, merged on read with the recent articles of followed authors that
+    have too many subscribers to fan out to.
+    """
+
+    def __init__(self, author, queryset=None):
+        self.author = author
+        self.queryset = Article.objects.all() if queryset is None else queryset
+        self.key = get_timeline_key(author.id)
+        self.redis = get_redis_connection("default")
+        # Read from the primary like the rebuilt timeline, so that no author
+        # is missing from both while crossing the fan-out threshold.
+        self.unfanned_authors = list(
+            Subscription.objects.using("default")
+            .filter(subscriber=author, target__is_fanned_out=False)
+            .values_list("target_id", flat=True)
+        )
+        self.touch()
+
+    def touch(self):
+        if not is_ready(self.author.id):
+            rebuild(self.author)
+            return
+        ttl = int(settings.TIMELINE_TTL.total_seconds())
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.expire(self.key, ttl)
+        pipeline.expire(get_ready_key(self.author.id), ttl)
+        pipeline.execute()
+
+    def seek(self, position, reverse, limit):
+        """
+        Returns up to `limit` (article_id, score) entries older than the
+        (created_at, id) position, newest first, or newer than it, oldest
+        first, if reversed.
+        """
+
+        bound = None
+        if position is not None:
+            created_at = parse_datetime(position[0])
+            if created_at is None:
+                raise ValueError("Invalid timeline position.")
+            bound = (created_at, int(position[1]))
+
+        entries = self.get_pushed_entries(bound, reverse, limit)
+        if self.unfanned_authors:
+            entries += self.get_pulled_entries(bound, reverse, limit)
+        entries = sorted(set(entries), key=lambda entry: entry[::-1])
+        if not reverse:
+            entries.reverse()
+        return entries[:limit]
+
+    def get_pushed_entries(self, bound, reverse, limit):
+        if bound is None:
+            entries = self.redis.zrevrange(self.key, 0, limit - 1, withscores=True)
+            return [(int(article_id), int(score)) for article_id, score in entries]
+
+        score = get_score(bound[0])
+        pipeline = self.redis.pipeline(transaction=False)
+        if reverse:
+            pipeline.zrangebyscore(
+                self.key, f"({score}", "+inf", start=0, num=limit, withscores=True
+            )
+        else:
+            pipeline.zrevrangebyscore(
+                self.key, f"({score}", "-inf", start=0, num=limit, withscores=True
+            )
+        # Articles created in the same microsecond are ordered by id.
+        pipeline.zrangebyscore(self.key, score, score, withscores=True)
+        entries = [
+            (int(article_id), int(entry_score))
+            for article_id, entry_score in chain.from_iterable(pipeline.execute())
+        ]
+        position = (score, bound[1])
+        if reverse:
+            return [entry for entry in entries if entry[::-1] > position]
+        return [entry for entry in entries if entry[::-1] < position]
+
+    def get_pulled_entries(self, bound, reverse, limit):
+        authors = Q(author__in=self.unfanned_authors)
+        if bound is not None:
+            created_at, article_id = bound
+            lookup = "gt" if reverse else "lt"
+            authors &= Q(**{f"created_at__{lookup}": created_at}) | Q(
+                created_at=created_at, **{f"id__{lookup}": article_id}
+            )
+        return get_recent_entries(authors, limit, reverse)
+
+    def hydrate(self, entries):
+        article_ids = [article_id for article_id, _ in entries]
+        rows = self.queryset.filter(pk__in=article_ids)
+        articles = {article.id: article for article in rows}
+        # Deleted articles are dropped lazily instead of on delete.
+        remove(self.author.id, [pk for pk in article_ids if pk not in articles])
+        return [articles[pk] for pk in article_ids if pk in articles]
@@ -0,0 +1,175 @@
+import time
+from itertools import chain
+from django.conf import settings
+from django_redis import get_redis_connection
+
+TRENDING_KEY = "articles:trending"
+EPOCH_KEY = "articles:trending:epoch"
+
+# A like at time t weighs 2 ** ((t - epoch) / half-life). Rescaling moves the
+# epoch by whole half-lives, so scores are multiplied by exact powers of two.
+RECORD = """
+local half_life = tonumber(ARGV[1])
+local epoch = tonumber(redis.call("GET", KEYS[2]))
+if not epoch then
+    epoch = math.floor(tonumber(ARGV[2]) / half_life) * half_life
+    redis.call("SET", KEYS[2], epoch)
+end
+for i = 5, #ARGV, 2 do
+    local weight = tonumber(ARGV[4]) * 2 ^ ((tonumber(ARGV[i + 1]) - epoch) / half_life)
+    local score = tonumber(redis.call("ZINCRBY", KEYS[1], weight, ARGV[i]))
+    if score < tonumber(ARGV[3]) then
+        redis.call("ZREM", KEYS[1], ARGV[i])
+    end
+end
+"""
+
+RESCALE = """
+local half_life = tonumber(ARGV[2])
+local epoch = tonumber(redis.call("GET", KEYS[2]))
+if not epoch then
+    return 0
+end
+local shift = math.floor((tonumber(ARGV[1]) - epoch) / half_life)
+if shift < 1 then
+    return 0
+end
+local factor = 2 ^ -shift
+local entries = redis.call("ZRANGE", KEYS[1], 0, -1, "WITHSCORES")
+for i = 1, #entries, 2 do
+    redis.call("ZADD", KEYS[1], tonumber(entries[i + 1]) * factor, entries[i])
+end
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", "(" .. ARGV[3])
+redis.call("ZREMRANGEBYRANK", KEYS[1], 0, -tonumber(ARGV[4]) - 1)
+redis.call("SET", KEYS[2], epoch + shift * half_life)
+return shift
+"""
+
+
+def get_half_life():
+    return settings.TRENDING_HALF_LIFE.total_seconds()
+
+
+def get_epoch(redis):
+    half_life = get_half_life()
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.set(EPOCH_KEY, time.time() // half_life * half_life, nx=True)
+    pipeline.get(EPOCH_KEY)
+    return float(pipeline.execute()[1])
+
+
+def record(likes, sign=1):
+    """
+    Adds the decayed weight of each (article_id, liked_at) like to the score
+    of its article, or subtracts it when the like is removed.
+    """
+
+    if not likes:
+        return
+    args = [get_half_life(), time.time(), settings.TRENDING_MIN_SCORE, sign]
+    for article_id, liked_at in likes:
+        args += [article_id, liked_at.timestamp()]
+    redis = get_redis_connection("default")
+    script = redis.register_script(RECORD)
+    script(keys=[TRENDING_KEY, EPOCH_KEY], args=args)
+
+
+def remove(article_ids):
+    if article_ids:
+        redis = get_redis_connection("default")
+        redis.zrem(TRENDING_KEY, *article_ids)
+
+
+def rescale():
+    """
+    Moves the epoch to the last whole half-life, scaling every score down by
+    the same factor instead of recomputing them, and drops the articles
+    that decayed away or fell past the maximum length.
+    """
+
+    redis = get_redis_connection("default")
+    script = redis.register_script(RESCALE)
+    return script(
+        keys=[TRENDING_KEY, EPOCH_KEY],
+        args=[
+            time.time(),
+            get_half_life(),
+            settings.TRENDING_MIN_SCORE,
+            settings.TRENDING_MAX_LENGTH,
+        ],
+    )
+
+
+class Trending:
+    """
+    Articles ordered by the decayed number of their likes, highest first.
+    Positions are (epoch, score, article_id), so that cursors created before
+    a rescale still point at the same place after it.
+    """
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+        self.redis = get_redis_connection("default")
+        self.epoch = get_epoch(self.redis)
+        self.scores = {}
+
+    def get_page(self, position, reverse, limit):
+        """
+        Seeks until `limit` articles are left after hydration, which skips
+        the articles the queryset excludes.
+        """
+
+        articles = []
+        while True:
+            entries = self.seek(position, reverse, limit)
+            self.scores.update(entries)
+            articles += self.hydrate(entries)
+            if len(entries) < limit or len(articles) >= limit:
+                return articles[:limit]
+            article_id, score = entries[-1]
+            position = [self.epoch, score, article_id]
+
+    def seek(self, position, reverse, limit):
+        """
+        Returns up to `limit` (article_id, score) entries ranked below the
+        position, highest first, or above it, lowest first, if reversed.
+        """
+
+        if position is None:
+            entries = self.redis.zrevrange(TRENDING_KEY, 0, limit - 1, withscores=True)
+            return [(int(article_id), score) for article_id, score in entries]
+
+        epoch, score = float(position[0]), float(position[1])
+        article_id = int(position[2])
+        if epoch != self.epoch:
+            score *= 2 ** ((epoch - self.epoch) / get_half_life())
+
+        pipeline = self.redis.pipeline(transaction=False)
+        if reverse:
+            pipeline.zrangebyscore(
+                TRENDING_KEY, f"({score}", "+inf", start=0, num=limit, withscores=True
+            )
+        else:
+            pipeline.zrevrangebyscore(
+                TRENDING_KEY, f"({score}", "-inf", start=0, num=limit, withscores=True
+            )
+        # Articles with the same score are ordered by id.
+        pipeline.zrangebyscore(TRENDING_KEY, score, score, withscores=True)
+        entries = [
+            (int(entry_id), entry_score)
+            for entry_id, entry_score in chain.from_iterable(pipeline.execute())
+        ]
+        bound = (score, article_id)
+        if reverse:
+            entries = [entry for entry in entries if entry[::-1] > bound]
+        else:
+            entries = [entry for entry in entries if entry[::-1] < bound]
+        entries.sort(key=lambda entry: entry[::-1], reverse=not reverse)
+        return entries[:limit]
+
+    def hydrate(self, entries):
+        article_ids = [article_id for article_id, _ in entries]
+        articles = {
+            article.id: article for article in self.queryset.filter(pk__in=article_ids)
+        }
+        return [articles[pk] for pk in article_ids if pk in articles]
@@ -4,12 +4,14 @@ from .views import (
     SubscriptionViewSet,
     ArticleViewSet,
     LikeViewSet,
+    SearchViewSet,
 )
 
 router = routers.DefaultRouter()
 router.register("authors", AuthorViewSet)
 router.register("subscriptions", SubscriptionViewSet)
 router.register("articles", ArticleViewSet)
+router.register("search", SearchViewSet, basename="search")
 
 articles_router = routers.NestedDefaultRouter(router, "articles", lookup="article")
 articles_router.register("likes", LikeViewSet, basename="article-likes")
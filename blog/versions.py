@@ -0,0 +1,48 @@
+import time
+from django.conf import settings
+from django.db import transaction
+from django_redis import get_redis_connection
+
+
+def get_version_key(kind, pk):
+    return f"version:{kind}:{pk}"
+
+
+def touch(kind, pks):
+    """
+    Records that the representation of the given authors, articles or viewer
+    state changed, once the current transaction commits.
+    """
+
+    pks = list(pks)
+
+    def set_versions():
+        now = time.time()
+        ttl = int(settings.VERSION_TTL.total_seconds())
+        redis = get_redis_connection("default")
+        pipeline = redis.pipeline(transaction=False)
+        for pk in pks:
+            pipeline.set(get_version_key(kind, pk), now, ex=ttl)
+        pipeline.execute()
+
+    if pks:
+        transaction.on_commit(set_versions)
+
+
+def get_versions(kind, pks):
+    """
+    Returns the time of the last change of each of the given rows. Rows
+    without a known version haven't changed for VERSION_TTL, and count as
+    changed at the start of the current period of that length, which is
+    later than their last change and stays the same for a while. Nothing is
+    written, so that reads leave no keys behind.
+    """
+
+    pks = list(pks)
+    if not pks:
+        return []
+    redis = get_redis_connection("default")
+    versions = redis.mget([get_version_key(kind, pk) for pk in pks])
+    ttl = settings.VERSION_TTL.total_seconds()
+    floor = time.time() // ttl * ttl
+    return [floor if version is None else float(version) for version in versions]
@@ -1,6 +1,11 @@
+from functools import partial
+from hashlib import md5
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.mixins import (
@@ -14,6 +19,8 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.decorators import action
 from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from utils.throttling import get_batch_size
+from utils.views import FastListMixin
 from .models import Author, Subscription, Article, LikedItem
 from .serializers import (
     AuthorSerializer,
@@ -23,16 +30,92 @@ from .serializers import (
     RemoveSubscriberSerializer,
     SimpleAuthorSerializer,
     LikeSerializer,
+    BatchSubscriptionSerializer,
+    BatchLikeSerializer,
+    SearchSerializer,
+    RelationshipsSerializer,
 )
 from .permissions import IsOwnerOrReadOnly, HasAccessAuthorContent
-from .pagination import DefaultLimitOffsetPagination
-from .throttling import SubscriptionUserRateThrottle
+from .pagination import (
+    DefaultLimitOffsetPagination,
+    DefaultKeysetPagination,
+    HomeTimelinePagination,
+    LikePagination,
+    SearchPagination,
+    SubscriptionPagination,
+    TrendingPagination,
+)
+from .throttling import ArticleCreateThrottle, LikeThrottle, SubscriptionThrottle
+from . import access, cards, counters, search, suggestions, trending, versions
+from .timeline import HomeTimeline
+from .trending import Trending
+from .tasks import backfill_timeline, prune_timeline
+
+
+class CurrentAuthorMixin:
+    """
+    The author of the request is loaded with its user in one query by the
+    authentication, and shared by the views, permissions and serializers of
+    the whole request through request.user.
+    """
+
+    def get_current_author(self):
+        return self.request.user.author
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET requests whose validators still match with 304 Not Modified
+    before serializing anything. The object of detail views is loaded, and
+    its permissions checked, first.
+    """
+
+    def conditional(self, handler, request, *args, **kwargs):
+        if self.detail:
+            self.get_object()
+        validators = self.get_validators()
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        parts, last_modified = validators
+        digest = md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+        etag = f'W/"{digest}"'
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=int(last_modified)
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in [status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED]:
+            response["ETag"] = etag
+            response["Last-Modified"] = http_date(last_modified)
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_validators(self):
+        """
+        Returns the parts the ETag is derived from and the last modification
+        timestamp of the response, or None to skip conditional handling.
+        """
+
+        return None
+
+    def get_object(self):
+        # Loaded once, by the conditional check and then by the handler.
+        if not hasattr(self, "object"):
+            self.object = super().get_object()
+        return self.object
 
 
 class AuthorViewSet(
-    ListModelMixin, RetrieveModelMixin, UpdateModelMixin, GenericViewSet
+    CurrentAuthorMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    GenericViewSet,
 ):
-    queryset = Author.objects.select_related("user")
+    queryset = Author.objects.all()
     serializer_class = AuthorSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
     pagination_class = DefaultLimitOffsetPagination
@@ -48,27 +131,84 @@ class AuthorViewSet(
         if request.method == "PATCH":
             return self.partial_update(request, *args, **kwargs)
 
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    def get_validators(self):
+        if self.action == "me":
+            author_id = self.get_current_author().id
+        elif self.action == "retrieve":
+            author_id = self.get_object().id
+        else:
+            return None
+        author_version = versions.get_versions("author", [author_id])
+        viewer_version = versions.get_versions("viewer", [self.get_current_author().id])
+        parts = ("author", author_id, author_version, viewer_version)
+        return parts, max(author_version + viewer_version)
+
+    @action(methods=["GET"], detail=False)
+    def suggestions(self, request, *args, **kwargs):
+        author_ids = suggestions.get_suggestions(self.get_current_author())
+        rows = SimpleAuthorSerializer.get_fast_queryset(
+            Author.objects.filter(pk__in=author_ids)
+        )
+        rows = sorted(rows, key=lambda row: author_ids.index(row.id))
+        serializer = self.get_serializer(rows, many=True)
+        return Response(serializer.data)
+
+    @action(methods=["GET"], detail=False)
+    def relationships(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        author_ids = serializer.validated_data["ids"]
+        current_author = self.get_current_author()
+        following = set(
+            Subscription.objects.filter(
+                subscriber=current_author, target__in=author_ids
+            ).values_list("target_id", flat=True)
+        )
+        followed_by = set(
+            Subscription.objects.filter(
+                subscriber__in=author_ids, target=current_author
+            ).values_list("subscriber_id", flat=True)
+        )
+        return Response(
+            {
+                author_id: {
+                    "following": author_id in following,
+                    "followed_by": author_id in followed_by,
+                    "is_private": card["is_private"],
+                }
+                for author_id, card in cards.get_cards(author_ids).items()
+            }
+        )
+
     @action(methods=["GET"], detail=True)
     def subscriptions(self, request, *args, **kwargs):
         author = self.get_object()
         self.queryset = Subscription.objects.get_subscriptions_for(author)
+        self.pagination_class = SubscriptionPagination
         return self.list(request, *args, **kwargs)
 
     @action(methods=["GET"], detail=True)
     def subscribers(self, request, *args, **kwargs):
         author = self.get_object()
         self.queryset = Subscription.objects.get_subscribers_for(author)
+        self.pagination_class = SubscriptionPagination
         return self.list(request, *args, **kwargs)
 
     @action(methods=["GET"], detail=True)
     def articles(self, request, *args, **kwargs):
         author = self.get_object()
         self.queryset = Article.objects.filter(author=author).order_by("-created_at")
+        self.pagination_class = DefaultKeysetPagination
         return self.list(request, *args, **kwargs)
 
     def get_serializer_class(self):
-        if self.action in ["subscriptions", "subscribers"]:
+        if self.action in ["subscriptions", "subscribers", "suggestions"]:
             self.serializer_class = SimpleAuthorSerializer
+        if self.action == "relationships":
+            self.serializer_class = RelationshipsSerializer
         if self.action == "articles":
             self.serializer_class = ArticleSerializer
         return super().get_serializer_class()
@@ -80,18 +220,16 @@ class AuthorViewSet(
 
     def get_object(self):
         if self.action == "me":
-            return self.get_current_author()
+            # The cached author of the request may hold stale counters.
+            return get_object_or_404(Author, pk=self.get_current_author().id)
         return super().get_object()
 
-    def get_current_author(self):
-        return self.request.user.author
 
-
-class SubscriptionViewSet(CreateModelMixin, GenericViewSet):
+class SubscriptionViewSet(CurrentAuthorMixin, CreateModelMixin, GenericViewSet):
     queryset = Subscription.objects.all()
     serializer_class = SubscriptionCreateSerializer
     permission_classes = [IsAuthenticated]
-    throttle_classes = [SubscriptionUserRateThrottle]
+    throttle_classes = [SubscriptionThrottle]
 
     @action(methods=["DELETE"], detail=False)
     def unsubscribe(self, request, *args, **kwargs):
@@ -101,6 +239,77 @@ class SubscriptionViewSet(CreateModelMixin, GenericViewSet):
     def remove(self, request, *args, **kwargs):
         return self.destroy_subscription(request, *args, **kwargs)
 
+    @action(methods=["POST"], detail=False)
+    def batch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.perform_batch_create(serializer.validated_data["targets"])
+        return Response({"results": results})
+
+    @action(methods=["DELETE"], detail=False)
+    def batch_unsubscribe(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.perform_batch_destroy(serializer.validated_data["targets"])
+        return Response({"results": results})
+
+    @transaction.atomic
+    def perform_batch_create(self, target_ids):
+        subscriber = self.get_current_author()
+        target_ids = list(dict.fromkeys(target_ids))
+        existing = set(
+            Author.objects.filter(pk__in=target_ids).values_list("pk", flat=True)
+        )
+        created = Subscription.objects.subscribe(
+            subscriber,
+            [pk for pk in target_ids if pk in existing and pk != subscriber.id],
+            timezone.now(),
+        )
+
+        results = []
+        for target_id in target_ids:
+            if target_id not in existing:
+                results.append({"target": target_id, "status": "not_found"})
+            elif target_id == subscriber.id:
+                results.append({"target": target_id, "status": "invalid"})
+            elif target_id in created:
+                results.append({"target": target_id, "status": "created"})
+            else:
+                results.append({"target": target_id, "status": "exists"})
+
+        counters.increment(Author, "subscriptions_count", [subscriber.id], len(created))
+        counters.increment(Author, "subscribers_count", created)
+        versions.touch("viewer", [subscriber.id])
+        if created:
+            transaction.on_commit(
+                lambda: backfill_timeline.delay(subscriber.id, created)
+            )
+            for target_id in created:
+                transaction.on_commit(
+                    partial(access.add_subscribers, target_id, [subscriber.id])
+                )
+        return results
+
+    @transaction.atomic
+    def perform_batch_destroy(self, target_ids):
+        subscriber = self.get_current_author()
+        target_ids = list(dict.fromkeys(target_ids))
+        deleted = Subscription.objects.unsubscribe(subscriber, target_ids)
+        counters.decrement(Author, "subscriptions_count", [subscriber.id], len(deleted))
+        counters.decrement(Author, "subscribers_count", deleted)
+        counters.mark_dirty(Author, [subscriber.id, *deleted])
+        versions.touch("viewer", [subscriber.id])
+        if deleted:
+            transaction.on_commit(lambda: prune_timeline.delay(subscriber.id, deleted))
+            for target_id in deleted:
+                transaction.on_commit(
+                    partial(access.remove_subscribers, target_id, [subscriber.id])
+                )
+        return [
+            {"target": pk, "status": "deleted" if pk in deleted else "not_found"}
+            for pk in target_ids
+        ]
+
     def destroy_subscription(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
@@ -110,26 +319,16 @@ class SubscriptionViewSet(CreateModelMixin, GenericViewSet):
 
     @transaction.atomic
     def perform_destroy_subscription(self, instance):
-        subscriber = instance.subscriber
-        target = instance.target
-
-        subscriber.subscriptions_count -= 1
-        subscriber.save(update_fields=["subscriptions_count"])
-        target.subscribers_count -= 1
-        target.save(update_fields=["subscribers_count"])
-
+        counters.decrement(Author, "subscriptions_count", [instance.subscriber_id])
+        counters.decrement(Author, "subscribers_count", [instance.target_id])
         instance.delete()
 
     @transaction.atomic
     def perform_create(self, serializer):
         subscriber = self.get_current_author()
         target = serializer.validated_data["target"]
-
-        subscriber.subscriptions_count += 1
-        subscriber.save(update_fields=["subscriptions_count"])
-        target.subscribers_count += 1
-        target.save(update_fields=["subscribers_count"])
-
+        counters.increment(Author, "subscriptions_count", [subscriber.id])
+        counters.increment(Author, "subscribers_count", [target.id])
         return super().perform_create(serializer)
 
     def get_serializer_class(self):
@@ -137,8 +336,15 @@ class SubscriptionViewSet(CreateModelMixin, GenericViewSet):
             self.serializer_class = UnsubscribeSerializer
         if self.action == "remove":
             self.serializer_class = RemoveSubscriberSerializer
+        if self.action in ["batch", "batch_unsubscribe"]:
+            self.serializer_class = BatchSubscriptionSerializer
         return super().get_serializer_class()
 
+    def get_throttle_cost(self, request):
+        if self.action in ["batch", "batch_unsubscribe"]:
+            return get_batch_size(request, "targets")
+        return 1
+
     def get_object(self, validated_data):
         current_author = self.get_current_author()
         if self.action == "unsubscribe":
@@ -151,32 +357,131 @@ class SubscriptionViewSet(CreateModelMixin, GenericViewSet):
             )
         return super().get_object()
 
-    def get_current_author(self):
-        return self.request.user.author
 
-
-class ArticleViewSet(ModelViewSet):
+class ArticleViewSet(
+    CurrentAuthorMixin, ConditionalGetMixin, FastListMixin, ModelViewSet
+):
     queryset = Article.objects.all()
     serializer_class = ArticleSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrReadOnly]
-    pagination_class = DefaultLimitOffsetPagination
+    pagination_class = DefaultKeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["author"]
 
+    def list(self, request, *args, **kwargs):
+        if "author" in request.query_params:
+            return super().list(request, *args, **kwargs)
+        self.pagination_class = HomeTimelinePagination
+        return self.conditional(self.list_timeline, request, *args, **kwargs)
+
+    def list_timeline(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_timeline())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(super().retrieve, request, *args, **kwargs)
+
+    @action(methods=["GET"], detail=False)
+    def trending(self, request, *args, **kwargs):
+        self.pagination_class = TrendingPagination
+        articles = Article.objects.filter(author__is_private=False)
+        ranking = Trending(ArticleSerializer.get_fast_queryset(articles))
+        page = self.paginate_queryset(ranking)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_validators(self):
+        viewer_version = versions.get_versions("viewer", [self.get_current_author().id])
+        if self.action == "list":
+            entries = self.paginator.get_page_entries(self.get_timeline(), self.request)
+            article_ids = [article_id for article_id, _ in entries]
+            article_versions = versions.get_versions("article", article_ids)
+            parts = (
+                "feed",
+                self.request.get_full_path(),
+                article_ids,
+                article_versions,
+                viewer_version,
+            )
+            return parts, max(article_versions + viewer_version)
+        if self.action == "retrieve":
+            article_id = self.get_object().id
+            article_version = versions.get_versions("article", [article_id])
+            parts = ("article", article_id, article_version, viewer_version)
+            return parts, max(article_version + viewer_version)
+        return None
+
+    def get_timeline(self):
+        if not hasattr(self, "timeline"):
+            self.timeline = HomeTimeline(
+                self.get_current_author(),
+                ArticleSerializer.get_fast_queryset(Article.objects.all()),
+            )
+        return self.timeline
+
+    @action(methods=["POST"], detail=False)
+    def batch_like(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = self.perform_batch_like(serializer.validated_data["articles"])
+        return Response({"results": results})
+
+    @transaction.atomic
+    def perform_batch_like(self, article_ids):
+        current_author = self.get_current_author()
+        article_ids = list(dict.fromkeys(article_ids))
+        existing = set(
+            Article.objects.filter(pk__in=article_ids).values_list("pk", flat=True)
+        )
+        created_at = timezone.now()
+        created = LikedItem.objects.like(
+            current_author, [pk for pk in article_ids if pk in existing], created_at
+        )
+
+        results = []
+        for article_id in article_ids:
+            if article_id not in existing:
+                results.append({"article": article_id, "status": "not_found"})
+            elif article_id in created:
+                results.append({"article": article_id, "status": "created"})
+            else:
+                results.append({"article": article_id, "status": "exists"})
+
+        counters.increment(Article, "likes_count", created)
+        trending_likes = [(article_id, created_at) for article_id in created]
+        transaction.on_commit(lambda: trending.record(trending_likes))
+        versions.touch("viewer", [current_author.id])
+        return results
+
     @transaction.atomic
     def perform_create(self, serializer):
         current_author = self.get_current_author()
-        current_author.articles_count += 1
-        current_author.save(update_fields=["articles_count"])
+        counters.increment(Author, "articles_count", [current_author.id])
         return super().perform_create(serializer)
 
     @transaction.atomic
     def perform_destroy(self, instance):
-        author = instance.author
-        author.articles_count -= 1
-        author.save(update_fields=["articles_count"])
+        counters.decrement(Author, "articles_count", [instance.author_id])
         return super().perform_destroy(instance)
 
+    def get_serializer_class(self):
+        if self.action == "batch_like":
+            self.serializer_class = BatchLikeSerializer
+        return super().get_serializer_class()
+
+    def get_throttles(self):
+        if self.action == "create":
+            self.throttle_classes = [ArticleCreateThrottle]
+        if self.action == "batch_like":
+            self.throttle_classes = [LikeThrottle]
+        return super().get_throttles()
+
+    def get_throttle_cost(self, request):
+        if self.action == "batch_like":
+            return get_batch_size(request, "articles")
+        return 1
+
     def get_queryset(self):
         current_author = self.get_current_author()
         subscriptions = Subscription.objects.get_subscriptions_for(current_author)
@@ -187,15 +492,18 @@ class ArticleViewSet(ModelViewSet):
             .order_by("-created_at")
         )
 
-    def get_current_author(self):
-        return self.request.user.author
-
 
-class LikeViewSet(ListModelMixin, CreateModelMixin, GenericViewSet):
+class LikeViewSet(
+    CurrentAuthorMixin,
+    FastListMixin,
+    ListModelMixin,
+    CreateModelMixin,
+    GenericViewSet,
+):
     queryset = LikedItem.objects.select_related("author__user")
     serializer_class = LikeSerializer
     permission_classes = [IsAuthenticated]
-    pagination_class = DefaultLimitOffsetPagination
+    pagination_class = LikePagination
 
     @action(methods=["DELETE"], detail=False)
     def dislike(self, request, *args, **kwargs):
@@ -203,9 +511,7 @@ class LikeViewSet(ListModelMixin, CreateModelMixin, GenericViewSet):
 
     @transaction.atomic
     def perform_create(self, serializer):
-        article = Article.objects.get(pk=self.kwargs["article_pk"])
-        article.likes_count += 1
-        article.save(update_fields=["likes_count"])
+        counters.increment(Article, "likes_count", [self.kwargs["article_pk"]])
         return super().perform_create(serializer)
 
     def destroy_like(self, request, *args, **kwargs):
@@ -219,11 +525,7 @@ class LikeViewSet(ListModelMixin, CreateModelMixin, GenericViewSet):
 
     @transaction.atomic
     def perform_destroy_like(self, instance):
-        article = instance.article
-
-        article.likes_count -= 1
-        article.save(update_fields=["likes_count"])
-
+        counters.decrement(Article, "likes_count", [instance.article_id])
         instance.delete()
 
     def get_queryset(self):
@@ -235,10 +537,55 @@ class LikeViewSet(ListModelMixin, CreateModelMixin, GenericViewSet):
         context["article_id"] = self.kwargs["article_pk"]
         return context
 
-    def get_current_author(self):
-        return self.request.user.author
-
     def get_serializer_class(self):
         if self.action == "list":
             self.serializer_class = SimpleAuthorSerializer
         return super().get_serializer_class()
+
+    def get_throttles(self):
+        if self.action in ["create", "dislike"]:
+            self.throttle_classes = [LikeThrottle]
+        return super().get_throttles()
+
+
+class SearchViewSet(CurrentAuthorMixin, GenericViewSet):
+    serializer_class = SearchSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+
+    @action(methods=["GET"], detail=False)
+    def authors(self, request, *args, **kwargs):
+        return self.list_results(search.search_authors(self.get_term()))
+
+    @action(methods=["GET"], detail=False)
+    def articles(self, request, *args, **kwargs):
+        current_author = self.get_current_author()
+        return self.list_results(
+            search.search_articles(self.get_term(), current_author)
+        )
+
+    @action(methods=["GET"], detail=False)
+    def autocomplete(self, request, *args, **kwargs):
+        authors = search.autocomplete_authors(self.get_term())
+        rows = SimpleAuthorSerializer.get_fast_queryset(authors)
+        serializer = self.get_serializer(rows, many=True)
+        return Response(serializer.data)
+
+    def list_results(self, queryset):
+        ordering = [field.lstrip("-") for field in self.paginator.ordering]
+        queryset = self.get_serializer_class().get_fast_queryset(queryset, *ordering)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def get_term(self):
+        serializer = SearchSerializer(data=self.request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data["q"]
+
+    def get_serializer_class(self):
+        if self.action in ["authors", "autocomplete"]:
+            self.serializer_class = SimpleAuthorSerializer
+        if self.action == "articles":
+            self.serializer_class = ArticleSerializer
+        return super().get_serializer_class()
@@ -0,0 +1,169 @@
+import asyncio
+import time
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import serializers
+from users.authentication import get_principal
+from . import ingestion, presence
+from .groups import get_user_group
+from .models import ChatPage
+from .serializers import (
+    MessageCreateSerializer,
+    ReadEventSerializer,
+    TypingEventSerializer,
+)
+from .tasks import read_messages, schedule_presence
+
+
+def heartbeat(user_id, channel_name):
+    if presence.connect(user_id, channel_name):
+        schedule_presence(user_id, True)
+
+
+def is_contact(user_id, contact_id):
+    return ChatPage.objects.filter(user_id=user_id, contact_id=contact_id).exists()
+
+
+def is_active(user_id):
+    user = get_principal(user_id)
+    return user is not None and user.is_active
+
+
+def leave(user_id, channel_name):
+    if presence.disconnect(user_id, channel_name):
+        schedule_presence(user_id, False)
+
+
+class ChatConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Delivers messages between users through a channel layer group per user.
+    Messages are appended to a Redis stream and acknowledged right away, so
+    a connection never waits for the database and idle connections hold no
+    resources but a group membership.
+
+    Presence lives in Redis only: connections send heartbeats, and contacts
+    are told when a user comes online or leaves. Typing events are relayed
+    to contacts in the inbox, at most once per interval per contact.
+
+    Connections are closed when their token expires, and on a heartbeat once
+    the user is deleted or deactivated.
+    """
+
+    async def connect(self):
+        self.user = self.scope["user"]
+        if not self.user.is_authenticated:
+            await self.close(code=4001)
+            return
+        self.group_name = get_user_group(self.user.id)
+        self.typed_at = {}
+        # Users known to be in the inbox, whom typing events may be sent to.
+        self.contacts = set()
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await sync_to_async(heartbeat, thread_sensitive=False)(
+            self.user.id, self.channel_name
+        )
+        await self.accept()
+        self.expiry = asyncio.create_task(self.expire(self.scope["token_exp"]))
+
+    async def expire(self, exp):
+        await asyncio.sleep(max(exp - time.time(), 0))
+        await self.close(code=4001)
+
+    async def disconnect(self, code):
+        if hasattr(self, "expiry"):
+            self.expiry.cancel()
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+            await sync_to_async(leave, thread_sensitive=False)(
+                self.user.id, self.channel_name
+            )
+
+    async def receive_json(self, content, **kwargs):
+        if content.get("type") == "message":
+            await self.send_message(content)
+        elif content.get("type") == "read":
+            await self.read_messages(content)
+        elif content.get("type") == "typing":
+            await self.send_typing(content)
+        elif content.get("type") == "heartbeat":
+            if not await database_sync_to_async(is_active)(self.user.id):
+                await self.close(code=4001)
+                return
+            await sync_to_async(heartbeat, thread_sensitive=False)(
+                self.user.id, self.channel_name
+            )
+        else:
+            await self.send_json(
+                {"type": "error", "errors": {"type": ["Unknown event type."]}}
+            )
+
+    async def send_message(self, content):
+        serializer = MessageCreateSerializer(
+            data=content, context={"sender": self.user}
+        )
+        if not serializer.is_valid():
+            await self.send_json({"type": "error", "errors": serializer.errors})
+            return
+
+        message = {
+            **serializer.validated_data,
+            "client_id": str(serializer.validated_data["client_id"]),
+            "sender": self.user.id,
+            "created_at": serializers.DateTimeField().to_representation(timezone.now()),
+        }
+        await sync_to_async(ingestion.append, thread_sensitive=False)(message)
+        await self.send_json({"type": "ack", "client_id": message["client_id"]})
+        event = {"type": "chat.message", "message": message}
+        await self.channel_layer.group_send(get_user_group(message["recipient"]), event)
+        await self.channel_layer.group_send(self.group_name, event)
+
+    async def chat_message(self, event):
+        await self.send_json({"type": "message", "message": event["message"]})
+
+    async def read_messages(self, content):
+        serializer = ReadEventSerializer(data=content)
+        if not serializer.is_valid():
+            await self.send_json({"type": "error", "errors": serializer.errors})
+            return
+
+        data = serializer.validated_data
+        until = serializers.DateTimeField().to_representation(data["until"])
+        await sync_to_async(read_messages.delay, thread_sensitive=False)(
+            self.user.id, data["contact"], until
+        )
+
+    async def chat_read(self, event):
+        await self.send_json({"type": "read", "receipt": event["receipt"]})
+
+    async def send_typing(self, content):
+        serializer = TypingEventSerializer(data=content)
+        if not serializer.is_valid():
+            await self.send_json({"type": "error", "errors": serializer.errors})
+            return
+
+        contact = serializer.validated_data["contact"]
+        now = time.monotonic()
+        interval = settings.PRESENCE_TYPING_INTERVAL.total_seconds()
+        if now - self.typed_at.get(contact, -interval) < interval:
+            return
+        self.typed_at[contact] = now
+        if contact not in self.contacts:
+            if not await database_sync_to_async(is_contact)(self.user.id, contact):
+                return
+            self.contacts.add(contact)
+        typing = {
+            "user": self.user.id,
+            "expires_in": settings.PRESENCE_TYPING_TTL.total_seconds(),
+        }
+        await self.channel_layer.group_send(
+            get_user_group(contact), {"type": "chat.typing", "typing": typing}
+        )
+
+    async def chat_typing(self, event):
+        await self.send_json({"type": "typing", "typing": event["typing"]})
+
+    async def chat_presence(self, event):
+        await self.send_json({"type": "presence", "presence": event["presence"]})
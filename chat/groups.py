@@ -0,0 +1,10 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+
+def get_user_group(user_id):
+    return f"user.{user_id}"
+
+
+def send_to_user(user_id, event):
+    async_to_sync(get_channel_layer().group_send)(get_user_group(user_id), event)
@@ -0,0 +1,90 @@
+from collections import defaultdict
+from functools import reduce
+from operator import add
+from django.db import models, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from .models import ChatPage, Message, get_conversation
+
+
+def record_messages(messages):
+    """
+    Moves the conversations to the top of the inboxes of both users, opening
+    their chat pages if needed, and counts the messages as unread for the
+    recipients unless they were created before the read watermark. Each chat
+    page is updated once for all of its messages. Runs in the transaction
+    that saves the messages.
+    """
+
+    pages = defaultdict(list)
+    for message in messages:
+        pages[message.sender_id, message.recipient_id].append((message, 0))
+        pages[message.recipient_id, message.sender_id].append((message, 1))
+    # Pages are written in the same order by every batch, so they can't deadlock.
+    pages = sorted(pages.items())
+    latest = {
+        users: max(
+            (message for message, _ in entries),
+            key=lambda message: (message.created_at, message.id),
+        )
+        for users, entries in pages
+    }
+    # Opens the missing pages, which concurrent batches may open as well,
+    # as if they were at the latest message already. The updates below then
+    # apply to new and existing pages alike.
+    ChatPage.objects.bulk_create(
+        [
+            ChatPage(
+                user_id=user_id,
+                contact_id=contact_id,
+                last_message=latest[user_id, contact_id],
+                last_message_at=latest[user_id, contact_id].created_at,
+            )
+            for user_id, contact_id in latest
+        ],
+        ignore_conflicts=True,
+    )
+    for (user_id, contact_id), entries in pages:
+        last = latest[user_id, contact_id]
+        unread = [
+            Case(
+                When(last_read_at__gte=message.created_at, then=Value(0)),
+                default=Value(1),
+                output_field=models.IntegerField(),
+            )
+            for message, unread in entries
+            if unread
+        ]
+        ChatPage.objects.filter(user_id=user_id, contact_id=contact_id).update(
+            # Messages saved out of order never replace a more recent one.
+            last_message=Case(
+                When(last_message_at__lte=last.created_at, then=Value(last.id)),
+                default=F("last_message"),
+                output_field=models.BigIntegerField(),
+            ),
+            last_message_at=Greatest("last_message_at", Value(last.created_at)),
+            unread_count=reduce(add, unread, F("unread_count")),
+        )
+
+
+@transaction.atomic
+def mark_read(chat_page, until):
+    """
+    Moves the read watermark of the chat page forward to `until` and counts
+    the messages the contact sent after it, which reads only the tail of the
+    conversation instead of updating every message. The chat page is locked
+    first, so that a message saved concurrently is counted exactly once.
+    Returns whether the watermark moved.
+    """
+
+    chat_page = ChatPage.objects.select_for_update().get(pk=chat_page.pk)
+    if chat_page.last_read_at is not None and until <= chat_page.last_read_at:
+        return False
+    chat_page.last_read_at = until
+    chat_page.unread_count = Message.objects.filter(
+        conversation=get_conversation(chat_page.user_id, chat_page.contact_id),
+        created_at__gt=until,
+        sender_id=chat_page.contact_id,
+    ).count()
+    chat_page.save(update_fields=["last_read_at", "unread_count"])
+    return True
@@ -0,0 +1,149 @@
+import json
+import os
+import socket
+from uuid import UUID
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django_redis import get_redis_connection
+from redis.exceptions import ResponseError
+from .inbox import record_messages
+from .models import Message, get_conversation
+
+User = get_user_model()
+
+STREAM_KEY = "chat:messages"
+GROUP_NAME = "savers"
+
+
+def append(message):
+    """
+    Appends a received message to the stream, from which it is saved later
+    with the messages received around the same time.
+    """
+
+    redis = get_redis_connection("default")
+    redis.xadd(STREAM_KEY, {"message": json.dumps(message)})
+
+
+def create_group(redis):
+    try:
+        redis.xgroup_create(STREAM_KEY, GROUP_NAME, id="0", mkstream=True)
+    except ResponseError as error:
+        if "BUSYGROUP" not in str(error):
+            raise
+
+
+def ingest():
+    """
+    Saves the messages of the stream in batches as a member of the consumer
+    group, unless another worker is already at it. Entries left pending for
+    CHAT_INGEST_CLAIM_IDLE by a worker that died before acknowledging them
+    are claimed and saved first.
+    """
+
+    redis = get_redis_connection("default")
+    lock = redis.lock("chat:ingest", timeout=settings.CHAT_INGEST_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return
+    try:
+        ingest_entries(redis, lock)
+    finally:
+        lock.release()
+
+
+def ingest_entries(redis, lock):
+    create_group(redis)
+    consumer = f"{socket.gethostname()}:{os.getpid()}"
+    batch_size = settings.CHAT_INGEST_BATCH_SIZE
+    min_idle_time = int(settings.CHAT_INGEST_CLAIM_IDLE.total_seconds() * 1000)
+
+    start = "0-0"
+    while True:
+        start, entries, *_ = redis.xautoclaim(
+            STREAM_KEY, GROUP_NAME, consumer, min_idle_time, start, count=batch_size
+        )
+        save_entries(redis, entries)
+        lock.reacquire()
+        if start == b"0-0":
+            break
+    remove_consumers(redis, min_idle_time)
+
+    while True:
+        streams = redis.xreadgroup(
+            GROUP_NAME, consumer, {STREAM_KEY: ">"}, count=batch_size
+        )
+        entries = streams[0][1] if streams else []
+        save_entries(redis, entries)
+        lock.reacquire()
+        if len(entries) < batch_size:
+            break
+
+
+def remove_consumers(redis, min_idle_time):
+    """
+    Deletes the consumers of earlier workers once their pending entries
+    have been claimed, as each worker process joins the group under its own
+    name.
+    """
+
+    for consumer in redis.xinfo_consumers(STREAM_KEY, GROUP_NAME):
+        if not consumer["pending"] and consumer["idle"] >= min_idle_time:
+            redis.xgroup_delconsumer(STREAM_KEY, GROUP_NAME, consumer["name"])
+
+
+def save_entries(redis, entries):
+    """
+    Saves the messages of the entries, then acknowledges and deletes them,
+    so that the entries of a batch that failed are claimed again.
+    """
+
+    if not entries:
+        return
+    # Entries deleted after being read come back without their fields.
+    save_messages([json.loads(fields[b"message"]) for _, fields in entries if fields])
+    entry_ids = [entry_id for entry_id, _ in entries]
+    pipeline = redis.pipeline()
+    pipeline.xack(STREAM_KEY, GROUP_NAME, *entry_ids)
+    pipeline.xdel(STREAM_KEY, *entry_ids)
+    pipeline.execute()
+
+
+@transaction.atomic
+def save_messages(data):
+    """
+    Inserts the messages with a single query, skipping the ones whose users
+    no longer exist and the ones saved before, which are recognized by their
+    client id. Only the messages inserted by this call are recorded in the
+    inboxes, as a batch claimed from a slow worker may be saved twice at once.
+    """
+
+    user_ids = {message[key] for message in data for key in ("sender", "recipient")}
+    users = set(User.objects.filter(pk__in=user_ids).values_list("id", flat=True))
+    messages = {
+        (message["sender"], UUID(message["client_id"])): message
+        for message in data
+        if message["sender"] in users and message["recipient"] in users
+    }
+    saved = set(
+        Message.objects.filter(
+            sender__in={sender_id for sender_id, _ in messages},
+            client_id__in=[client_id for _, client_id in messages],
+        ).values_list("sender_id", "client_id")
+    )
+    created = Message.objects.insert(
+        [
+            Message(
+                sender_id=sender_id,
+                recipient_id=message["recipient"],
+                content=message["content"],
+                conversation=get_conversation(sender_id, message["recipient"]),
+                client_id=client_id,
+                created_at=parse_datetime(message["created_at"]),
+            )
+            for (sender_id, client_id), message in messages.items()
+            if (sender_id, client_id) not in saved
+        ]
+    )
+    record_messages(created)
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from chat import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the monthly partitions of the messages table ahead and "
+        "detaches or drops the ones past the retention period."
+    )
+
+    def handle(self, *args, **options):
+        created, expired = partitions.maintain()
+        for name in created:
+            self.stdout.write(f"Created partition {name}.")
+        for name in expired:
+            self.stdout.write(f"Expired partition {name}.")
@@ -0,0 +1,33 @@
+from urllib.parse import parse_qs
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.exceptions import AuthenticationFailed
+from users.authentication import CachedJWTAuthentication
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Authenticates WebSocket connections with the access token passed in the
+    `token` query parameter, as browsers can't set headers on them. The
+    expiry of the token goes in the scope as `token_exp`, for consumers to
+    close connections that outlive it.
+    """
+
+    async def __call__(self, scope, receive, send):
+        user, exp = await self.get_user(scope)
+        scope = dict(scope, user=user, token_exp=exp)
+        return await super().__call__(scope, receive, send)
+
+    @database_sync_to_async
+    def get_user(self, scope):
+        query = parse_qs(scope["query_string"].decode())
+        tokens = query.get("token")
+        if not tokens:
+            return AnonymousUser(), None
+        authentication = CachedJWTAuthentication()
+        try:
+            token = authentication.get_validated_token(tokens[0])
+            return authentication.get_user(token), token["exp"]
+        except AuthenticationFailed:
+            return AnonymousUser(), None
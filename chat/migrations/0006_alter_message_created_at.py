@@ -0,0 +1,18 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:27
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0005_remove_chatpage_name_remove_message_chat_page_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="message",
+            name="created_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:31
+
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat, Greatest, Least
+
+
+def set_conversations(apps, schema_editor):
+    Message = apps.get_model("chat", "Message")
+    Message.objects.update(
+        conversation=Concat(
+            Cast(Least("sender_id", "recipient_id"), CharField()),
+            Value(":"),
+            Cast(Greatest("sender_id", "recipient_id"), CharField()),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0006_alter_message_created_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="conversation",
+            field=models.CharField(default="", editable=False, max_length=41),
+            preserve_default=False,
+        ),
+        migrations.RunPython(set_conversations, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                fields=["conversation", "-created_at", "-id"],
+                name="chat_messag_convers_d99b86_idx",
+            ),
+        ),
+    ]
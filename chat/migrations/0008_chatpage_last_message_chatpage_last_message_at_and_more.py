@@ -0,0 +1,78 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db.models import F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+
+def set_last_messages(apps, schema_editor):
+    ChatPage = apps.get_model("chat", "ChatPage")
+    Message = apps.get_model("chat", "Message")
+    messages = Message.objects.filter(
+        Q(sender=OuterRef("user"), recipient=OuterRef("contact"))
+        | Q(sender=OuterRef("contact"), recipient=OuterRef("user"))
+    ).order_by("-created_at", "-id")
+    unread = (
+        Message.objects.filter(
+            sender=OuterRef("contact"), recipient=OuterRef("user"), seen=False
+        )
+        .order_by()
+        .values("recipient")
+        .annotate(count=models.Count("id"))
+        .values("count")
+    )
+    ChatPage.objects.update(
+        last_message=Subquery(messages.values("id")[:1]),
+        last_message_at=Coalesce(
+            Subquery(messages.values("created_at")[:1]), F("created_at")
+        ),
+        unread_count=Coalesce(Subquery(unread), 0),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0007_message_conversation_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatpage",
+            name="last_message",
+            field=models.ForeignKey(
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="chat.message",
+            ),
+        ),
+        migrations.AddField(
+            model_name="chatpage",
+            name="last_message_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name="chatpage",
+            name="unread_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(set_last_messages, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="chatpage",
+            index=models.Index(
+                fields=["user", "-last_message_at", "-id"],
+                name="chat_chatpa_user_id_a6b2a2_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                condition=models.Q(("seen", False)),
+                fields=["conversation"],
+                name="chat_message_unseen_idx",
+            ),
+        ),
+    ]
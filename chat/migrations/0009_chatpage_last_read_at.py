@@ -0,0 +1,53 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:33
+
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+
+
+def set_last_read(apps, schema_editor):
+    ChatPage = apps.get_model("chat", "ChatPage")
+    Message = apps.get_model("chat", "Message")
+    last_seen = (
+        Message.objects.filter(
+            sender=OuterRef("contact"), recipient=OuterRef("user"), seen=True
+        )
+        .order_by()
+        .values("recipient")
+        .annotate(last_read_at=models.Max("created_at"))
+        .values("last_read_at")
+    )
+    ChatPage.objects.update(last_read_at=Subquery(last_seen))
+
+
+def set_seen(apps, schema_editor):
+    ChatPage = apps.get_model("chat", "ChatPage")
+    Message = apps.get_model("chat", "Message")
+    read = ChatPage.objects.filter(
+        user=OuterRef("recipient"),
+        contact=OuterRef("sender"),
+        last_read_at__gte=OuterRef("created_at"),
+    )
+    Message.objects.update(seen=Exists(read))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0008_chatpage_last_message_chatpage_last_message_at_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="chatpage",
+            name="last_read_at",
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(set_last_read, set_seen),
+        migrations.RemoveIndex(
+            model_name="message",
+            name="chat_message_unseen_idx",
+        ),
+        migrations.RemoveField(
+            model_name="message",
+            name="seen",
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0009_chatpage_last_read_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="client_id",
+            field=models.UUIDField(editable=False, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name="message",
+            constraint=models.UniqueConstraint(
+                fields=("sender", "client_id"), name="chat_message_unique_client_id"
+            ),
+        ),
+    ]
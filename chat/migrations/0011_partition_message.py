@@ -0,0 +1,131 @@
+from django.db import migrations, models
+
+# The primary key and unique constraints of a partitioned table must include
+# the partition key. Identity columns aren't supported on partitioned tables
+# before PostgreSQL 17, so ids come from a sequence owned by the column.
+PARTITION = """
+CREATE TABLE chat_message_partitioned (
+    id bigint NOT NULL,
+    content text NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    recipient_id bigint NOT NULL,
+    sender_id bigint NOT NULL,
+    conversation varchar(41) NOT NULL,
+    client_id uuid NULL
+) PARTITION BY RANGE (created_at);
+
+DO $$
+DECLARE
+    month timestamp with time zone;
+    last_month timestamp with time zone;
+BEGIN
+    SELECT date_trunc('month', coalesce(min(created_at), now()), 'UTC')
+    INTO month FROM chat_message;
+    last_month := date_trunc('month', now(), 'UTC') + interval '3 months';
+    WHILE month <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF chat_message_partitioned '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'chat_message_p' || to_char(month AT TIME ZONE 'UTC', 'YYYYMM'),
+            month,
+            month + interval '1 month'
+        );
+        month := month + interval '1 month';
+    END LOOP;
+END
+$$;
+
+INSERT INTO chat_message_partitioned
+SELECT id, content, created_at, recipient_id, sender_id, conversation, client_id
+FROM chat_message;
+DROP TABLE chat_message;
+ALTER TABLE chat_message_partitioned RENAME TO chat_message;
+
+CREATE SEQUENCE chat_message_id_seq OWNED BY chat_message.id;
+SELECT setval('chat_message_id_seq', coalesce(max(id), 0) + 1, false)
+FROM chat_message;
+ALTER TABLE chat_message
+    ALTER COLUMN id SET DEFAULT nextval('chat_message_id_seq');
+
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_pkey PRIMARY KEY (id, created_at);
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_unique_client_id
+    UNIQUE (sender_id, client_id, created_at);
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_recipient_id_519a6b56_fk_users_user_id
+    FOREIGN KEY (recipient_id) REFERENCES users_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_sender_id_991c686c_fk_users_user_id
+    FOREIGN KEY (sender_id) REFERENCES users_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX chat_message_receiver_id_0eceddde ON chat_message (recipient_id);
+CREATE INDEX chat_message_sender_id_991c686c ON chat_message (sender_id);
+CREATE INDEX chat_messag_convers_d99b86_idx
+    ON chat_message (conversation, created_at DESC, id DESC);
+"""
+
+UNPARTITION = """
+CREATE TABLE chat_message_unpartitioned (
+    id bigint NOT NULL,
+    content text NOT NULL,
+    created_at timestamp with time zone NOT NULL,
+    recipient_id bigint NOT NULL,
+    sender_id bigint NOT NULL,
+    conversation varchar(41) NOT NULL,
+    client_id uuid NULL
+);
+INSERT INTO chat_message_unpartitioned
+SELECT id, content, created_at, recipient_id, sender_id, conversation, client_id
+FROM chat_message;
+DROP TABLE chat_message;
+ALTER TABLE chat_message_unpartitioned RENAME TO chat_message;
+
+ALTER TABLE chat_message ALTER COLUMN id ADD GENERATED BY DEFAULT AS IDENTITY;
+SELECT setval(
+    pg_get_serial_sequence('chat_message', 'id'), coalesce(max(id), 0) + 1, false
+)
+FROM chat_message;
+
+ALTER TABLE chat_message ADD CONSTRAINT chat_message_pkey PRIMARY KEY (id);
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_unique_client_id UNIQUE (sender_id, client_id);
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_recipient_id_519a6b56_fk_users_user_id
+    FOREIGN KEY (recipient_id) REFERENCES users_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+ALTER TABLE chat_message
+    ADD CONSTRAINT chat_message_sender_id_991c686c_fk_users_user_id
+    FOREIGN KEY (sender_id) REFERENCES users_user (id)
+    DEFERRABLE INITIALLY DEFERRED;
+CREATE INDEX chat_message_receiver_id_0eceddde ON chat_message (recipient_id);
+CREATE INDEX chat_message_sender_id_991c686c ON chat_message (sender_id);
+CREATE INDEX chat_messag_convers_d99b86_idx
+    ON chat_message (conversation, created_at DESC, id DESC);
+"""
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0010_message_client_id"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunSQL(PARTITION, UNPARTITION)],
+            state_operations=[
+                migrations.RemoveConstraint(
+                    model_name="message",
+                    name="chat_message_unique_client_id",
+                ),
+                migrations.AddConstraint(
+                    model_name="message",
+                    constraint=models.UniqueConstraint(
+                        fields=("sender", "client_id", "created_at"),
+                        name="chat_message_unique_client_id",
+                    ),
+                ),
+            ],
+        ),
+    ]
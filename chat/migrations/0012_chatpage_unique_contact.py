@@ -0,0 +1,42 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:59
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    Keeps the most recent of the chat pages opened twice for the same contact,
+    with the furthest read watermark of the duplicates.
+    """
+
+    ChatPage = apps.get_model("chat", "ChatPage")
+    duplicates = (
+        ChatPage.objects.values("user", "contact")
+        .annotate(count=Count("*"), last_read_at=Max("last_read_at"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        pages = ChatPage.objects.filter(
+            user=duplicate["user"], contact=duplicate["contact"]
+        ).order_by("-last_message_at", "-id")
+        kept = pages[0]
+        pages.exclude(pk=kept.pk).delete()
+        kept.last_read_at = duplicate["last_read_at"]
+        kept.save(update_fields=["last_read_at"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("chat", "0011_partition_message"),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="chatpage",
+            constraint=models.UniqueConstraint(
+                fields=("user", "contact"), name="chat_chatpage_unique_contact"
+            ),
+        ),
+    ]
@@ -1,19 +1,98 @@
-from django.db import models
+from django.db import connection, models
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+def get_conversation(user_id, contact_id):
+    """
+    Returns the key shared by the messages between two users in either
+    direction.
+    """
+
+    low, high = sorted([user_id, contact_id])
+    return f"{low}:{high}"
+
+
 class ChatPage(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="chat_pages")
     contact = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Kept up to date in the transactions that save or read messages.
+    last_message = models.ForeignKey(
+        "Message",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        null=True,
+        related_name="+",
+    )
+    last_message_at = models.DateTimeField(default=timezone.now)
+    # Messages of the contact created up to this time have been read.
+    last_read_at = models.DateTimeField(null=True)
+    unread_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "-last_message_at", "-id"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "contact"], name="chat_chatpage_unique_contact"
+            )
+        ]
+
     def __str__(self):
         return self.contact.email
 
 
+# Stored in a table partitioned by month on created_at, see chat.partitions.
+# Unique constraints have to include created_at.
+class MessageManager(models.Manager):
+    def insert(self, messages):
+        """
+        Inserts the messages with a single query, skipping the ones already
+        saved with the same client id, and returns the ones this call
+        inserted, with their ids set.
+        """
+
+        if not messages:
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {self.model._meta.db_table}
+                    (sender_id, recipient_id, content, conversation, client_id,
+                     created_at)
+                SELECT * FROM unnest(
+                    %s::bigint[], %s::bigint[], %s::text[], %s::varchar[],
+                    %s::uuid[], %s::timestamptz[]
+                )
+                ON CONFLICT (sender_id, client_id, created_at) DO NOTHING
+                RETURNING id, sender_id, client_id
+                """,
+                [
+                    [message.sender_id for message in messages],
+                    [message.recipient_id for message in messages],
+                    [message.content for message in messages],
+                    [message.conversation for message in messages],
+                    [str(message.client_id) for message in messages],
+                    [message.created_at for message in messages],
+                ],
+            )
+            inserted = {
+                (sender_id, client_id): pk
+                for pk, sender_id, client_id in cursor.fetchall()
+            }
+        created = []
+        for message in messages:
+            pk = inserted.get((message.sender_id, message.client_id))
+            if pk is not None:
+                message.id = pk
+                created.append(message)
+        return created
+
+
 class Message(models.Model):
+    objects = MessageManager()
     content = models.TextField()
     sender = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="sent_messages"
@@ -21,8 +100,25 @@ class Message(models.Model):
     recipient = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="received_messages"
     )
-    seen = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    conversation = models.CharField(max_length=41, editable=False)
+    # Generated by the sending client, so that a message saved twice is
+    # recognized.
+    client_id = models.UUIDField(null=True, editable=False)
+    # Set when the message is received, as it is saved later.
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=["conversation", "-created_at", "-id"])]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["sender", "client_id", "created_at"],
+                name="chat_message_unique_client_id",
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        self.conversation = get_conversation(self.sender_id, self.recipient_id)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"From {self.sender.email} to {self.recipient.email}: {self.content}"
@@ -0,0 +1,41 @@
+from utils.pagination import KeysetPagination
+from .partitions import add_months, get_month, get_partitions
+
+
+class MessageKeysetPagination(KeysetPagination):
+    page_size = 50
+    max_page_size = 100
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.last_message_at = view.get_chat_page().last_message_at
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page(self, queryset, position, reverse, limit):
+        """
+        Loads the first page a month at a time, from the month of the last
+        message of the chat page back to the oldest partition, until it is
+        full, so that each query reads a single partition instead of
+        merging the latest messages of all of them.
+        """
+
+        if position is not None or reverse:
+            return super().get_page(queryset, position, reverse, limit)
+
+        partitions = get_partitions()
+        month = get_month(self.last_message_at)
+        # Messages saved since the chat page was read belong to the first month.
+        months = queryset.filter(created_at__gte=month)
+        rows = []
+        while True:
+            rows += super().get_page(months, None, False, limit - len(rows))
+            if len(rows) == limit or not partitions or month <= partitions[0]:
+                return rows
+            end, month = month, add_months(month, -1)
+            months = queryset.filter(created_at__gte=month, created_at__lt=end)
+
+
+class InboxKeysetPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 50
+    ordering = ("-last_message_at", "-id")
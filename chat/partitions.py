@@ -0,0 +1,112 @@
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .models import Message
+
+
+def get_month(moment):
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def get_partition_name(month):
+    return f"{Message._meta.db_table}_p{month:%Y%m}"
+
+
+def get_partitions():
+    """
+    Returns the months of the partitions attached to the messages table.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = %s::regclass
+            """,
+            [Message._meta.db_table],
+        )
+        names = [name for name, in cursor.fetchall()]
+    return sorted(
+        datetime.strptime(name.rsplit("_p", 1)[1], "%Y%m").replace(
+            tzinfo=dt_timezone.utc
+        )
+        for name in names
+    )
+
+
+def create_partitions(months_ahead):
+    """
+    Creates the missing partitions from the current month to `months_ahead`
+    months later, so that messages never arrive before their partition.
+    """
+
+    existing = set(get_partitions())
+    current = get_month(timezone.now())
+    months = [add_months(current, count) for count in range(months_ahead + 1)]
+    created = []
+    with connection.cursor() as cursor:
+        for month in months:
+            if month in existing:
+                continue
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(get_partition_name(month))} "
+                f"PARTITION OF {connection.ops.quote_name(Message._meta.db_table)} "
+                "FOR VALUES FROM (%s) TO (%s)",
+                [month, add_months(month, 1)],
+            )
+            created.append(get_partition_name(month))
+    return created
+
+
+def expire_partitions(retention_months, drop):
+    """
+    Detaches the partitions whose messages are all older than the retention
+    period, which keeps them as standalone tables to be archived, or drops
+    them.
+    """
+
+    current = get_month(timezone.now())
+    cutoff = add_months(current, -retention_months)
+    expired = []
+    with connection.cursor() as cursor:
+        for month in get_partitions():
+            if add_months(month, 1) > cutoff:
+                break
+            name = connection.ops.quote_name(get_partition_name(month))
+            with transaction.atomic():
+                cursor.execute(
+                    f"ALTER TABLE {connection.ops.quote_name(Message._meta.db_table)} "
+                    f"DETACH PARTITION {name}"
+                )
+                if drop:
+                    cursor.execute(f"DROP TABLE {name}")
+                else:
+                    # Archived tables don't depend on the sequence of the ids.
+                    cursor.execute(f"ALTER TABLE {name} ALTER COLUMN id DROP DEFAULT")
+            expired.append(get_partition_name(month))
+    return expired
+
+
+def maintain():
+    """
+    Creates the partitions ahead and expires the ones past the retention
+    period, if any.
+    """
+
+    created = create_partitions(settings.CHAT_MESSAGE_PARTITIONS_AHEAD)
+    expired = []
+    if settings.CHAT_MESSAGE_RETENTION_MONTHS is not None:
+        expired = expire_partitions(
+            settings.CHAT_MESSAGE_RETENTION_MONTHS,
+            settings.CHAT_MESSAGE_DROP_EXPIRED,
+        )
+    return created, expired
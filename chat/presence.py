@@ -0,0 +1,131 @@
+import time
+from django.conf import settings
+from django_redis import get_redis_connection
+
+CHANGES_KEY = "presence:changes"
+FANOUT_KEY = "presence:fanout"
+# Users scored by the time their last heartbeat expires, from which the users
+# whose connections died without disconnecting are found.
+EXPIRY_KEY = "presence:expiry"
+
+# Each connection of a user is a member of the user's set, scored by the time
+# its heartbeat expires. Returns 1 if the user had no live connection before.
+CONNECT = """
+local now = tonumber(ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", now)
+local was_online = redis.call("ZCARD", KEYS[1]) > 0
+redis.call("ZADD", KEYS[1], now + tonumber(ARGV[2]), ARGV[3])
+redis.call("EXPIRE", KEYS[1], ARGV[2])
+redis.call("ZADD", KEYS[2], now + tonumber(ARGV[2]), ARGV[4])
+if was_online then
+    return 0
+end
+return 1
+"""
+
+# Returns 1 if the user has no live connection left.
+DISCONNECT = """
+redis.call("ZREM", KEYS[1], ARGV[2])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", ARGV[1])
+if redis.call("ZCARD", KEYS[1]) > 0 then
+    return 0
+end
+redis.call("ZREM", KEYS[2], ARGV[3])
+return 1
+"""
+
+
+def get_presence_key(user_id):
+    return f"user:{user_id}:presence"
+
+
+def connect(user_id, channel_name):
+    """
+    Records a connection of the user, or the heartbeat of one, which keeps
+    it alive for PRESENCE_TTL. Returns whether the user came online.
+    """
+
+    redis = get_redis_connection("default")
+    script = redis.register_script(CONNECT)
+    ttl = int(settings.PRESENCE_TTL.total_seconds())
+    return bool(
+        script(
+            keys=[get_presence_key(user_id), EXPIRY_KEY],
+            args=[time.time(), ttl, channel_name, user_id],
+        )
+    )
+
+
+def disconnect(user_id, channel_name):
+    """
+    Removes a connection of the user. Returns whether the user went offline.
+    """
+
+    redis = get_redis_connection("default")
+    script = redis.register_script(DISCONNECT)
+    return bool(
+        script(
+            keys=[get_presence_key(user_id), EXPIRY_KEY],
+            args=[time.time(), channel_name, user_id],
+        )
+    )
+
+
+def get_online(user_ids):
+    """
+    Returns the set of the given users with a live connection, looked up in
+    a single round trip.
+    """
+
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    now = time.time()
+    for user_id in user_ids:
+        pipeline.zcount(get_presence_key(user_id), f"({now}", "+inf")
+    return {user_id for user_id, count in zip(user_ids, pipeline.execute()) if count}
+
+
+def sweep():
+    """
+    Removes the users whose heartbeats all expired, e.g. because their
+    connections died without disconnecting, and returns their ids.
+    """
+
+    redis = get_redis_connection("default")
+    script = redis.register_script(DISCONNECT)
+    now = time.time()
+    expired = [int(user_id) for user_id in redis.zrangebyscore(EXPIRY_KEY, "-inf", now)]
+    # Disconnects no connection, but drops the expired ones. Users whose
+    # heartbeat came in meanwhile have a live connection again.
+    return [
+        user_id
+        for user_id in expired
+        if script(keys=[get_presence_key(user_id), EXPIRY_KEY], args=[now, "", user_id])
+    ]
+
+
+def record_change(user_id, online):
+    """
+    Buffers a change of presence of the user. Returns whether a fan-out has
+    to be scheduled, which is the case for the first change buffered since
+    the previous fan-out.
+    """
+
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline(transaction=False)
+    pipeline.hset(CHANGES_KEY, user_id, int(online))
+    # Expires on its own if the scheduled fan-out never runs.
+    delay = settings.PRESENCE_FANOUT_DELAY.total_seconds()
+    pipeline.set(FANOUT_KEY, 1, nx=True, ex=int(delay) + 60)
+    return bool(pipeline.execute()[1])
+
+
+def pop_changes():
+    redis = get_redis_connection("default")
+    pipeline = redis.pipeline()
+    # Cleared first, so that changes buffered from now on schedule a new fan-out.
+    pipeline.delete(FANOUT_KEY)
+    pipeline.hgetall(CHANGES_KEY)
+    pipeline.delete(CHANGES_KEY)
+    changes = pipeline.execute()[1]
+    return {int(user_id): online == b"1" for user_id, online in changes.items()}
@@ -1,13 +1,109 @@
+import uuid
+from django.utils import timezone
 from rest_framework import serializers
-from .models import ChatPage
+from utils.serializers import PrefetchListSerializer, FastRepresentationMixin
+from .models import ChatPage, Message
 
 
-class ChatPageSerializer(serializers.ModelSerializer):
+class ChatPageSerializer(FastRepresentationMixin, serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
+    last_message_sender = serializers.IntegerField(
+        source="last_message.sender_id", read_only=True, allow_null=True
+    )
+    last_message_content = serializers.CharField(
+        source="last_message.content", read_only=True, allow_null=True
+    )
 
     class Meta:
         model = ChatPage
-        fields = ["id", "name"]
+        list_serializer_class = PrefetchListSerializer
+        fields = [
+            "id",
+            "name",
+            "last_message",
+            "last_message_sender",
+            "last_message_content",
+            "last_message_at",
+            "last_read_at",
+            "unread_count",
+        ]
+        fast_sources = {
+            "name": "contact__email",
+            "last_message_sender": "last_message__sender",
+            "last_message_content": "last_message__content",
+        }
 
     def get_name(self, chat_page):
         return chat_page.contact.email
+
+
+class MessageSerializer(FastRepresentationMixin, serializers.ModelSerializer):
+    # Read from the column, as the method field below reads rows as well.
+    recipient = serializers.IntegerField(source="recipient_id", read_only=True)
+    seen = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Message
+        list_serializer_class = PrefetchListSerializer
+        fields = [
+            "id",
+            "client_id",
+            "sender",
+            "recipient",
+            "content",
+            "seen",
+            "created_at",
+        ]
+
+    def get_seen(self, message):
+        """
+        Whether the recipient read up to the message, from the read
+        watermarks of both users given in the context by user id.
+        """
+
+        last_read_at = self.context["last_read"].get(message.recipient_id)
+        return last_read_at is not None and message.created_at <= last_read_at
+
+
+class MessageCreateSerializer(serializers.Serializer):
+    recipient = serializers.IntegerField()
+    content = serializers.CharField(max_length=2000)
+    # Clients resending a message send the same id, so it is saved once.
+    client_id = serializers.UUIDField(default=uuid.uuid4)
+
+    def validate_recipient(self, value):
+        if value == self.context["sender"].id:
+            raise serializers.ValidationError("You cannot message yourself.")
+        return value
+
+
+class ReadSerializer(serializers.Serializer):
+    until = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        now = timezone.now()
+        attrs["until"] = min(attrs.get("until", now), now)
+        return attrs
+
+
+class ReadEventSerializer(ReadSerializer):
+    contact = serializers.IntegerField()
+
+
+class TypingEventSerializer(serializers.Serializer):
+    contact = serializers.IntegerField()
+
+
+class PresenceSerializer(serializers.Serializer):
+    ids = serializers.CharField()
+
+    def validate_ids(self, value):
+        try:
+            ids = list(dict.fromkeys(int(pk) for pk in value.split(",")))
+        except ValueError:
+            raise serializers.ValidationError(
+                "Enter a comma separated list of user ids."
+            )
+        if len(ids) > 500:
+            raise serializers.ValidationError("Ensure there are no more than 500 ids.")
+        return ids
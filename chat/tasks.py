@@ -0,0 +1,105 @@
+from collections import defaultdict
+from itertools import islice
+from celery import shared_task
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from django_redis import get_redis_connection
+from rest_framework import serializers
+from . import ingestion, partitions, presence
+from .groups import send_to_user
+from .inbox import mark_read
+from .models import ChatPage
+
+
+def get_receipt_key(chat_page_id):
+    return f"chat_page:{chat_page_id}:receipt"
+
+
+@shared_task
+def ingest_messages():
+    ingestion.ingest()
+
+
+@shared_task
+def partition_messages():
+    partitions.maintain()
+
+
+@shared_task
+def read_messages(user_id, contact_id, until):
+    chat_page = ChatPage.objects.filter(user_id=user_id, contact_id=contact_id).first()
+    if chat_page is not None and mark_read(chat_page, parse_datetime(until)):
+        schedule_read_receipt(chat_page.id)
+
+
+def schedule_read_receipt(chat_page_id):
+    """
+    Sends the contact a read receipt after a short delay, unless one is
+    already pending, so that a burst of reads produces a single receipt
+    carrying the latest watermark.
+    """
+
+    delay = settings.CHAT_RECEIPT_DELAY.total_seconds()
+    redis = get_redis_connection("default")
+    # Expires on its own if the pending receipt is never sent.
+    if redis.set(get_receipt_key(chat_page_id), 1, nx=True, ex=int(delay) + 60):
+        send_read_receipt.apply_async((chat_page_id,), countdown=delay)
+
+
+@shared_task
+def send_read_receipt(chat_page_id):
+    # Cleared before the watermark is read, so later reads schedule a new receipt.
+    get_redis_connection("default").delete(get_receipt_key(chat_page_id))
+    chat_page = ChatPage.objects.filter(pk=chat_page_id).first()
+    if chat_page is None or chat_page.last_read_at is None:
+        return
+    receipt = {
+        "reader": chat_page.user_id,
+        "until": serializers.DateTimeField().to_representation(chat_page.last_read_at),
+    }
+    send_to_user(chat_page.contact_id, {"type": "chat.read", "receipt": receipt})
+
+
+def schedule_presence(user_id, online):
+    """
+    Buffers a change of presence and sends the buffered changes after a
+    short delay, so that users coming and going at the same time reach each
+    contact in a single event.
+    """
+
+    if presence.record_change(user_id, online):
+        delay = settings.PRESENCE_FANOUT_DELAY.total_seconds()
+        send_presence.apply_async(countdown=delay)
+
+
+@shared_task
+def sweep_presence():
+    for user_id in presence.sweep():
+        schedule_presence(user_id, False)
+
+
+@shared_task
+def send_presence():
+    """
+    Sends the buffered presence changes to the online users who have the
+    changed users in their inbox, one batch of chat pages at a time.
+    """
+
+    changes = presence.pop_changes()
+    if not changes:
+        return
+    batch_size = settings.PRESENCE_FANOUT_BATCH_SIZE
+    rows = (
+        ChatPage.objects.filter(contact_id__in=changes)
+        .order_by("user_id")
+        .values_list("user_id", "contact_id")
+        .iterator(chunk_size=batch_size)
+    )
+    while batch := list(islice(rows, batch_size)):
+        updates = defaultdict(dict)
+        for user_id, contact_id in batch:
+            updates[user_id][contact_id] = changes[contact_id]
+        for user_id in presence.get_online(list(updates)):
+            send_to_user(
+                user_id, {"type": "chat.presence", "presence": updates[user_id]}
+            )
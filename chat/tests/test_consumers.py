@@ -0,0 +1,123 @@
+from datetime import timedelta
+import pytest
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from rest_framework_simplejwt.tokens import AccessToken
+from chat import ingestion
+from chat.middleware import JWTAuthMiddleware
+from chat.models import ChatPage, Message
+from chat.routing import websocket_urlpatterns
+
+User = get_user_model()
+
+application = JWTAuthMiddleware(URLRouter(websocket_urlpatterns))
+
+
+def get_communicator(user=None, lifetime=None):
+    path = "/ws/chat/"
+    if user is not None:
+        token = AccessToken.for_user(user)
+        if lifetime is not None:
+            token.set_exp(lifetime=lifetime)
+        path += f"?token={token}"
+    return WebsocketCommunicator(application, path)
+
+
+def deactivate(user):
+    user.is_active = False
+    user.save()
+
+
+@pytest.fixture
+def users(db):
+    return baker.make(User, _quantity=2)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestChatConsumer:
+    def test_if_token_missing_closes_connection(self):
+        async def chat():
+            communicator = get_communicator()
+            connected, code = await communicator.connect()
+            await communicator.disconnect()
+            return connected, code
+
+        assert async_to_sync(chat)() == (False, 4001)
+
+    def test_if_message_sent_is_delivered_acked_and_saved(self, users):
+        sender, recipient = users
+        content = {"type": "message", "recipient": recipient.id, "content": "hi"}
+
+        async def chat():
+            sending, receiving = get_communicator(sender), get_communicator(recipient)
+            assert (await sending.connect())[0]
+            assert (await receiving.connect())[0]
+            await sending.send_json_to(content)
+            ack = await sending.receive_json_from()
+            echo = await sending.receive_json_from()
+            delivered = await receiving.receive_json_from()
+            await sending.disconnect()
+            await receiving.disconnect()
+            return ack, echo, delivered
+
+        ack, echo, delivered = async_to_sync(chat)()
+        ingestion.ingest()
+
+        assert ack["type"] == "ack"
+        assert echo == delivered
+        assert delivered["message"]["client_id"] == ack["client_id"]
+        message = Message.objects.get(sender=sender)
+        assert str(message.client_id) == ack["client_id"]
+        assert message.content == "hi"
+        page = ChatPage.objects.get(user=recipient, contact=sender)
+        assert page.unread_count == 1
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            {"type": "unknown"},
+            {"type": "message", "recipient": "a", "content": "hi"},
+        ],
+    )
+    def test_if_event_invalid_returns_error(self, users, content):
+        sender, _ = users
+
+        async def chat():
+            communicator = get_communicator(sender)
+            await communicator.connect()
+            await communicator.send_json_to(content)
+            response = await communicator.receive_json_from()
+            await communicator.disconnect()
+            return response
+
+        assert async_to_sync(chat)()["type"] == "error"
+
+    def test_if_token_expires_closes_connection(self, users):
+        user, _ = users
+
+        async def chat():
+            communicator = get_communicator(user, lifetime=timedelta(seconds=1))
+            assert (await communicator.connect())[0]
+            closed = await communicator.receive_output(timeout=3)
+            await communicator.disconnect()
+            return closed
+
+        assert async_to_sync(chat)() == {"type": "websocket.close", "code": 4001}
+
+    def test_if_user_deactivated_closes_connection_on_heartbeat(self, users):
+        user, _ = users
+
+        async def chat():
+            communicator = get_communicator(user)
+            assert (await communicator.connect())[0]
+            await database_sync_to_async(deactivate)(user)
+            await communicator.send_json_to({"type": "heartbeat"})
+            closed = await communicator.receive_output()
+            await communicator.disconnect()
+            return closed
+
+        assert async_to_sync(chat)() == {"type": "websocket.close", "code": 4001}
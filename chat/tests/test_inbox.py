@@ -0,0 +1,98 @@
+import uuid
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError
+from django.utils import timezone
+from model_bakery import baker
+from chat import inbox
+from chat.ingestion import save_messages
+from chat.models import ChatPage, Message
+
+User = get_user_model()
+
+
+def send(sender, recipient, created_at=None):
+    created_at = created_at or timezone.now()
+    save_messages(
+        [
+            {
+                "sender": sender.id,
+                "recipient": recipient.id,
+                "content": "a",
+                "client_id": str(uuid.uuid4()),
+                "created_at": created_at.isoformat(),
+            }
+        ]
+    )
+    return Message.objects.get(sender=sender, created_at=created_at)
+
+
+@pytest.fixture
+def users(db):
+    return baker.make(User), baker.make(User)
+
+
+@pytest.mark.django_db
+class TestRecordMessages:
+    def test_if_first_message_opens_pages_of_both_users(self, users):
+        sender, recipient = users
+
+        message = send(sender, recipient)
+
+        sent = ChatPage.objects.get(user=sender, contact=recipient)
+        received = ChatPage.objects.get(user=recipient, contact=sender)
+        assert sent.last_message_id == received.last_message_id == message.id
+        assert (sent.unread_count, received.unread_count) == (0, 1)
+
+    def test_if_page_opened_meanwhile_updates_it(self, users):
+        sender, recipient = users
+        opened = baker.make(ChatPage, user=recipient, contact=sender)
+
+        message = send(sender, recipient)
+
+        page = ChatPage.objects.get(user=recipient, contact=sender)
+        assert page.pk == opened.pk
+        assert page.last_message_id == message.id
+        assert page.unread_count == 1
+
+    def test_if_page_opened_twice_raises_error(self, users):
+        user, contact = users
+        baker.make(ChatPage, user=user, contact=contact)
+
+        with pytest.raises(IntegrityError):
+            baker.make(ChatPage, user=user, contact=contact)
+
+    def test_if_older_message_saved_late_keeps_latest(self, users):
+        sender, recipient = users
+        latest = send(sender, recipient)
+
+        send(sender, recipient, latest.created_at - timedelta(minutes=1))
+
+        page = ChatPage.objects.get(user=recipient, contact=sender)
+        assert page.last_message_id == latest.id
+        assert page.unread_count == 2
+
+    def test_if_message_created_before_watermark_isnt_unread(self, users):
+        sender, recipient = users
+        now = timezone.now()
+        baker.make(ChatPage, user=recipient, contact=sender, last_read_at=now)
+
+        send(sender, recipient, now - timedelta(seconds=1))
+
+        assert ChatPage.objects.get(user=recipient, contact=sender).unread_count == 0
+
+
+@pytest.mark.django_db
+class TestMarkRead:
+    def test_if_read_counts_messages_after_watermark(self, users):
+        sender, recipient = users
+        first = send(sender, recipient)
+        send(sender, recipient, first.created_at + timedelta(seconds=1))
+        page = ChatPage.objects.get(user=recipient, contact=sender)
+
+        assert inbox.mark_read(page, first.created_at)
+
+        page.refresh_from_db()
+        assert page.unread_count == 1
+        assert not inbox.mark_read(page, first.created_at)
@@ -0,0 +1,144 @@
+import uuid
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from model_bakery import baker
+from chat import ingestion
+from chat.ingestion import GROUP_NAME, STREAM_KEY
+from chat.models import ChatPage, Message, get_conversation
+
+User = get_user_model()
+
+
+def make_message(sender, recipient, **kwargs):
+    return {
+        "sender": sender.id,
+        "recipient": recipient.id,
+        "content": "a",
+        "client_id": str(uuid.uuid4()),
+        "created_at": timezone.now().isoformat(),
+        **kwargs,
+    }
+
+
+def get_unread_count(sender, recipient):
+    return ChatPage.objects.get(user=recipient, contact=sender).unread_count
+
+
+@pytest.fixture
+def users(db):
+    return baker.make(User), baker.make(User)
+
+
+@pytest.fixture
+def claim_now(settings):
+    settings.CHAT_INGEST_CLAIM_IDLE = timedelta(0)
+
+
+@pytest.mark.django_db
+class TestSaveMessages:
+    def test_if_message_resent_in_same_batch_is_saved_once(self, users):
+        sender, recipient = users
+        message = make_message(sender, recipient)
+
+        ingestion.save_messages([message, message])
+
+        assert Message.objects.filter(sender=sender).count() == 1
+        assert get_unread_count(sender, recipient) == 1
+
+    def test_if_message_resent_after_save_is_skipped(self, users):
+        sender, recipient = users
+        message = make_message(sender, recipient)
+        ingestion.save_messages([message])
+
+        ingestion.save_messages([message, make_message(sender, recipient)])
+
+        assert Message.objects.filter(sender=sender).count() == 2
+        assert get_unread_count(sender, recipient) == 2
+
+    def test_if_message_of_deleted_user_is_skipped(self, users):
+        sender, recipient = users
+        message = make_message(sender, recipient)
+        recipient.delete()
+
+        ingestion.save_messages([message])
+
+        assert not Message.objects.exists()
+
+
+@pytest.mark.django_db
+class TestInsert:
+    def make(self, sender, recipient, client_id, created_at):
+        return Message(
+            sender_id=sender.id,
+            recipient_id=recipient.id,
+            content="a",
+            conversation=get_conversation(sender.id, recipient.id),
+            client_id=client_id,
+            created_at=created_at,
+        )
+
+    def test_if_returns_only_messages_inserted_by_call(self, users):
+        sender, recipient = users
+        client_id, now = uuid.uuid4(), timezone.now()
+        # Saved meanwhile by a worker that claimed the same entries.
+        saved = Message.objects.insert([self.make(sender, recipient, client_id, now)])
+        messages = [
+            self.make(sender, recipient, client_id, now),
+            self.make(sender, recipient, uuid.uuid4(), now),
+        ]
+
+        created = Message.objects.insert(messages)
+
+        assert created == [messages[1]]
+        assert created[0].id not in {message.id for message in saved}
+        assert Message.objects.filter(sender=sender).count() == 2
+
+
+@pytest.mark.django_db
+class TestIngest:
+    def test_if_saves_appended_messages_and_deletes_entries(self, users, redis):
+        sender, recipient = users
+        for _ in range(3):
+            ingestion.append(make_message(sender, recipient))
+
+        ingestion.ingest()
+
+        assert Message.objects.filter(sender=sender).count() == 3
+        assert redis.xlen(STREAM_KEY) == 0
+
+    def test_if_ingest_in_progress_skips(self, users, redis):
+        sender, recipient = users
+        ingestion.append(make_message(sender, recipient))
+        lock = redis.lock("chat:ingest", timeout=1)
+        lock.acquire()
+
+        ingestion.ingest()
+
+        assert not Message.objects.exists()
+        lock.release()
+
+    def test_if_entries_of_dead_worker_are_claimed(self, users, redis, claim_now):
+        sender, recipient = users
+        ingestion.append(make_message(sender, recipient))
+        ingestion.create_group(redis)
+        redis.xreadgroup(GROUP_NAME, "dead:1", {STREAM_KEY: ">"})
+
+        ingestion.ingest()
+
+        assert Message.objects.filter(sender=sender).count() == 1
+        assert redis.xpending(STREAM_KEY, GROUP_NAME)["pending"] == 0
+
+    def test_if_idle_consumers_are_removed(self, users, redis, claim_now):
+        sender, recipient = users
+        ingestion.append(make_message(sender, recipient))
+        ingestion.create_group(redis)
+        redis.xreadgroup(GROUP_NAME, "dead:1", {STREAM_KEY: ">"})
+        redis.xreadgroup(GROUP_NAME, "dead:2", {STREAM_KEY: ">"})
+
+        ingestion.ingest()
+
+        consumers = redis.xinfo_consumers(STREAM_KEY, GROUP_NAME)
+        names = {consumer["name"] for consumer in consumers}
+        assert not names & {b"dead:1", b"dead:2"}
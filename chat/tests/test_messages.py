@@ -0,0 +1,104 @@
+import uuid
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from chat import partitions
+from chat.ingestion import save_messages
+from chat.models import ChatPage, get_conversation
+
+User = get_user_model()
+
+
+def send(sender, recipient, created_at):
+    save_messages(
+        [
+            {
+                "sender": sender.id,
+                "recipient": recipient.id,
+                "content": "a",
+                "client_id": str(uuid.uuid4()),
+                "created_at": created_at.isoformat(),
+            }
+        ]
+    )
+
+
+def get_ids(response):
+    return [message["id"] for message in response.data["results"]]
+
+
+@pytest.fixture
+def conversation(db, api_client):
+    user, contact, stranger = baker.make(User, _quantity=3)
+    start = timezone.now()
+    for minutes in range(4):
+        sender, recipient = (user, contact) if minutes % 2 else (contact, user)
+        send(sender, recipient, start + timedelta(minutes=minutes))
+    send(stranger, user, start)
+    page = ChatPage.objects.get(user=user, contact=contact)
+    api_client.force_authenticate(user=user)
+    return user, contact, page
+
+
+@pytest.mark.django_db
+class TestMessageHistory:
+    def test_if_conversation_key_is_symmetric(self):
+        assert get_conversation(1, 2) == get_conversation(2, 1)
+        assert get_conversation(1, 2) != get_conversation(1, 3)
+
+    def test_if_lists_both_directions_newest_first(self, api_client, conversation):
+        user, contact, page = conversation
+
+        response = api_client.get(f"/chat/chat_pages/{page.id}/messages/")
+
+        assert response.status_code == status.HTTP_200_OK
+        messages = response.data["results"]
+        assert [message["sender"] for message in messages] == [
+            user.id,
+            contact.id,
+            user.id,
+            contact.id,
+        ]
+        created_at = [message["created_at"] for message in messages]
+        assert created_at == sorted(created_at, reverse=True)
+
+    def test_if_pages_through_history(self, api_client, conversation):
+        *_, page = conversation
+        url = f"/chat/chat_pages/{page.id}/messages/"
+        all_ids = get_ids(api_client.get(url))
+
+        first = api_client.get(url, {"limit": 3})
+        second = api_client.get(first.data["next"])
+
+        assert get_ids(first) + get_ids(second) == all_ids
+        assert second.data["next"] is None
+
+    def test_if_page_of_other_user_returns_404(self, api_client, conversation):
+        _, contact, _ = conversation
+        other_page = baker.make(ChatPage, user=contact, contact=baker.make(User))
+
+        response = api_client.get(f"/chat/chat_pages/{other_page.id}/messages/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_if_first_page_reaches_back_to_older_months(self, api_client, monkeypatch):
+        user, contact = baker.make(User, _quantity=2)
+        now = timezone.now()
+        month = partitions.add_months(partitions.get_month(now), -2)
+        with monkeypatch.context() as patch:
+            patch.setattr(partitions.timezone, "now", lambda: month)
+            partitions.create_partitions(0)
+        send(contact, user, month)
+        send(contact, user, now)
+        page = ChatPage.objects.get(user=user, contact=contact)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(f"/chat/chat_pages/{page.id}/messages/")
+
+        created_at = [message["created_at"] for message in response.data["results"]]
+        assert len(created_at) == 2
+        assert created_at == sorted(created_at, reverse=True)
+        assert response.data["next"] is None
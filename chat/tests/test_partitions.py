@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from model_bakery import baker
+from chat import partitions
+from chat.models import Message
+
+User = get_user_model()
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+def table_exists(name):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        return cursor.fetchone()[0] is not None
+
+
+@pytest.fixture
+def old_message(db, monkeypatch):
+    """
+    A message saved in a partition created 30 months ago.
+    """
+
+    created_at = partitions.add_months(partitions.get_month(timezone.now()), -30)
+    with monkeypatch.context() as patch:
+        patch.setattr(partitions.timezone, "now", lambda: created_at)
+        partitions.create_partitions(0)
+    sender, recipient = baker.make(User, _quantity=2)
+    message = Message.objects.create(
+        sender=sender, recipient=recipient, content="a", created_at=created_at
+    )
+    # Partitions can't be detached with foreign keys left to check, which the
+    # test transaction would otherwise defer.
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    return message, partitions.get_partition_name(created_at)
+
+
+class TestMonths:
+    @pytest.mark.parametrize(
+        "month, count, expected",
+        [
+            (utc(2026, 11, 1), 1, utc(2026, 12, 1)),
+            (utc(2026, 12, 1), 1, utc(2027, 1, 1)),
+            (utc(2026, 1, 1), -1, utc(2025, 12, 1)),
+            (utc(2026, 3, 1), -26, utc(2024, 1, 1)),
+        ],
+    )
+    def test_if_adds_months_across_years(self, month, count, expected):
+        assert partitions.add_months(month, count) == expected
+
+    def test_if_month_is_taken_in_utc(self):
+        moment = datetime(2026, 11, 1, 0, 30, tzinfo=dt_timezone(timedelta(hours=1)))
+
+        assert partitions.get_month(moment) == utc(2026, 10, 1)
+
+
+@pytest.mark.django_db
+class TestPartitions:
+    def test_if_creates_missing_partitions_ahead(self):
+        current = partitions.get_month(timezone.now())
+        ahead = partitions.add_months(current, 5)
+
+        created = partitions.create_partitions(5)
+
+        assert partitions.get_partition_name(ahead) in created
+        assert ahead in partitions.get_partitions()
+        assert partitions.create_partitions(5) == []
+
+    def test_if_expired_partition_is_detached(self, old_message):
+        message, name = old_message
+
+        expired = partitions.expire_partitions(24, drop=False)
+
+        assert expired == [name]
+        assert not Message.objects.filter(pk=message.pk).exists()
+        assert table_exists(name)
+
+    def test_if_expired_partition_is_dropped(self, old_message):
+        _, name = old_message
+
+        partitions.expire_partitions(24, drop=True)
+
+        assert not table_exists(name)
+
+    def test_if_recent_partitions_are_kept(self, old_message):
+        message, _ = old_message
+
+        assert partitions.expire_partitions(36, drop=False) == []
+        assert Message.objects.filter(pk=message.pk).exists()
@@ -0,0 +1,94 @@
+import time
+from datetime import timedelta
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from model_bakery import baker
+from rest_framework import status
+from chat import presence
+from chat.consumers import ChatConsumer
+from chat.models import ChatPage
+
+User = get_user_model()
+
+
+@pytest.fixture
+def users(db):
+    return baker.make(User, _quantity=3)
+
+
+@pytest.mark.django_db
+class TestPresence:
+    def test_if_not_contact_omits_user(self, api_client, users):
+        user, contact, stranger = users
+        baker.make(ChatPage, user=user, contact=contact)
+        presence.connect(contact.id, "contact")
+        presence.connect(stranger.id, "stranger")
+        api_client.force_authenticate(user=user)
+
+        response = api_client.get(
+            "/chat/chat_pages/presence/", {"ids": f"{contact.id},{stranger.id}"}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {contact.id: True}
+
+    def test_if_heartbeats_expired_sweeps_user_offline(
+        self, monkeypatch, settings, users
+    ):
+        user, *_ = users
+        settings.PRESENCE_TTL = timedelta(seconds=60)
+        now = presence.time.time()
+        presence.connect(user.id, "first")
+        assert presence.sweep() == []
+
+        monkeypatch.setattr(presence.time, "time", lambda: now + 61)
+
+        assert presence.sweep() == [user.id]
+        assert presence.get_online([user.id]) == set()
+        assert presence.sweep() == []
+
+    def test_if_user_disconnects_isnt_swept(self, monkeypatch, users):
+        user, *_ = users
+        now = presence.time.time()
+        presence.connect(user.id, "first")
+        presence.disconnect(user.id, "first")
+
+        monkeypatch.setattr(presence.time, "time", lambda: now + 3600)
+
+        assert presence.sweep() == []
+
+
+async def connect(user):
+    communicator = WebsocketCommunicator(ChatConsumer.as_asgi(), "/ws/chat/")
+    communicator.scope["user"] = user
+    communicator.scope["token_exp"] = time.time() + 3600
+    connected, _ = await communicator.connect()
+    assert connected
+    return communicator
+
+
+@pytest.mark.django_db(transaction=True)
+class TestTyping:
+    def test_if_not_contact_doesnt_relay_typing(self, settings, users):
+        settings.PRESENCE_TYPING_INTERVAL = timedelta(0)
+        user, contact, _ = users
+        typing = {"type": "typing", "contact": contact.id}
+
+        async def chat():
+            sender, recipient = await connect(user), await connect(contact)
+            await sender.send_json_to(typing)
+            assert await recipient.receive_nothing(timeout=0.2)
+
+            await sync_to_async(ChatPage.objects.create)(user=user, contact=contact)
+            await sender.send_json_to(typing)
+            event = await recipient.receive_json_from()
+            await sender.disconnect()
+            await recipient.disconnect()
+            return event
+
+        event = async_to_sync(chat)()
+
+        assert event["type"] == "typing"
+        assert event["typing"]["user"] == user.id
@@ -0,0 +1,111 @@
+import uuid
+from datetime import timedelta
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from model_bakery import baker
+from rest_framework import status
+from chat import tasks
+from chat.ingestion import save_messages
+from chat.models import ChatPage
+
+User = get_user_model()
+
+
+@pytest.fixture
+def chat(db):
+    """
+    A user who received three messages, a minute apart, from a contact.
+    """
+
+    user, contact = baker.make(User, _quantity=2)
+    start = timezone.now() - timedelta(minutes=10)
+    save_messages(
+        [
+            {
+                "sender": contact.id,
+                "recipient": user.id,
+                "content": "a",
+                "client_id": str(uuid.uuid4()),
+                "created_at": (start + timedelta(minutes=minutes)).isoformat(),
+            }
+            for minutes in range(3)
+        ]
+    )
+    return user, contact, start
+
+
+@pytest.fixture
+def sent_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(
+        tasks, "send_to_user", lambda user_id, event: events.append((user_id, event))
+    )
+    return events
+
+
+@pytest.mark.django_db
+class TestRead:
+    def test_if_read_counts_messages_after_watermark(
+        self, api_client, chat, sent_events
+    ):
+        user, contact, start = chat
+        page = ChatPage.objects.get(user=user, contact=contact)
+        api_client.force_authenticate(user=user)
+
+        response = api_client.post(
+            f"/chat/chat_pages/{page.id}/read/",
+            {"until": (start + timedelta(minutes=1)).isoformat()},
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        page.refresh_from_db()
+        assert page.unread_count == 1
+        [(user_id, event)] = sent_events
+        assert user_id == contact.id
+        assert event["receipt"]["reader"] == user.id
+
+    def test_if_contact_sees_messages_read(self, api_client, chat, sent_events):
+        user, contact, start = chat
+        page = ChatPage.objects.get(user=user, contact=contact)
+        api_client.force_authenticate(user=user)
+        api_client.post(
+            f"/chat/chat_pages/{page.id}/read/",
+            {"until": (start + timedelta(minutes=1)).isoformat()},
+        )
+        contact_page = ChatPage.objects.get(user=contact, contact=user)
+        api_client.force_authenticate(user=contact)
+
+        response = api_client.get(f"/chat/chat_pages/{contact_page.id}/messages/")
+
+        seen = [message["seen"] for message in response.data["results"]]
+        assert seen == [False, True, True]
+
+    def test_if_burst_of_reads_sends_one_receipt(self, monkeypatch, chat):
+        user, contact, start = chat
+        page = ChatPage.objects.get(user=user, contact=contact)
+        scheduled = []
+        monkeypatch.setattr(
+            tasks.send_read_receipt,
+            "apply_async",
+            lambda *args, **kwargs: scheduled.append(args),
+        )
+
+        for minutes in range(3):
+            tasks.read_messages(
+                user.id, contact.id, (start + timedelta(minutes=minutes)).isoformat()
+            )
+
+        assert scheduled == [((page.id,),)]
+        page.refresh_from_db()
+        assert page.unread_count == 0
+
+    def test_if_watermark_doesnt_move_back(self, chat, sent_events):
+        user, contact, start = chat
+        tasks.read_messages(user.id, contact.id, timezone.now().isoformat())
+
+        tasks.read_messages(user.id, contact.id, start.isoformat())
+
+        page = ChatPage.objects.get(user=user, contact=contact)
+        assert page.unread_count == 0
+        assert len(sent_events) == 1
@@ -1,8 +1,21 @@
 from django.urls import path
+from rest_framework_nested import routers
 from . import views
 
+router = routers.DefaultRouter()
+router.register("chat_pages", views.ChatPageViewSet)
+
+chat_pages_router = routers.NestedDefaultRouter(
+    router, "chat_pages", lookup="chat_page"
+)
+chat_pages_router.register(
+    "messages", views.MessageViewSet, basename="chat-page-messages"
+)
+
 # URLConf
 urlpatterns = [
     path("index/", views.index, name="index"),
     path("chat_page/", views.chat_page, name="chat_page"),
+    *router.urls,
+    *chat_pages_router.urls,
 ]
@@ -1,22 +1,92 @@
-from django.shortcuts import render
+from django.shortcuts import render, get_object_or_404
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from rest_framework.mixins import ListModelMixin, RetrieveModelMixin, DestroyModelMixin
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.permissions import IsAuthenticated
-from .models import ChatPage
-from .serializers import ChatPageSerializer
+from utils.views import FastListMixin
+from .models import ChatPage, Message, get_conversation
+from .inbox import mark_read
+from .pagination import InboxKeysetPagination, MessageKeysetPagination
+from .presence import get_online
+from .serializers import (
+    ChatPageSerializer,
+    MessageSerializer,
+    PresenceSerializer,
+    ReadSerializer,
+)
+from .tasks import schedule_read_receipt
 
 
 class ChatPageViewSet(
-    ListModelMixin, RetrieveModelMixin, DestroyModelMixin, GenericViewSet
+    FastListMixin, ListModelMixin, RetrieveModelMixin, DestroyModelMixin, GenericViewSet
 ):
-    queryset = ChatPage.objects.select_related("contact").all()
+    queryset = ChatPage.objects.select_related("contact", "last_message").all()
     serializer_class = ChatPageSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = InboxKeysetPagination
+
+    @action(methods=["POST"], detail=True, serializer_class=ReadSerializer)
+    def read(self, request, *args, **kwargs):
+        chat_page = self.get_object()
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if mark_read(chat_page, serializer.validated_data["until"]):
+            schedule_read_receipt(chat_page.id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(methods=["GET"], detail=False, serializer_class=PresenceSerializer)
+    def presence(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        # Only the presence of the contacts in the inbox is shared.
+        user_ids = list(
+            self.get_queryset()
+            .filter(contact__in=serializer.validated_data["ids"])
+            .values_list("contact_id", flat=True)
+        )
+        online = get_online(user_ids)
+        return Response({user_id: user_id in online for user_id in user_ids})
 
     def get_queryset(self):
         return super().get_queryset().filter(user=self.request.user)
 
 
+class MessageViewSet(FastListMixin, ListModelMixin, GenericViewSet):
+    serializer_class = MessageSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = MessageKeysetPagination
+
+    def get_chat_page(self):
+        if not hasattr(self, "chat_page"):
+            self.chat_page = get_object_or_404(
+                ChatPage, pk=self.kwargs["chat_page_pk"], user=self.request.user
+            )
+        return self.chat_page
+
+    def get_queryset(self):
+        chat_page = self.get_chat_page()
+        conversation = get_conversation(chat_page.user_id, chat_page.contact_id)
+        return Message.objects.filter(conversation=conversation)
+
+    def get_serializer_context(self):
+        """
+        Adds the read watermarks of both users, from which the messages are
+        marked as seen.
+        """
+
+        context = super().get_serializer_context()
+        chat_page = self.get_chat_page()
+        context["last_read"] = dict(
+            ChatPage.objects.filter(
+                user_id=chat_page.contact_id, contact_id=chat_page.user_id
+            ).values_list("user_id", "last_read_at")
+        )
+        context["last_read"][chat_page.user_id] = chat_page.last_read_at
+        return context
+
+
 def index(request):
     return render(request, "chat/index.html")
 
@@ -15,6 +15,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "django_filters",
@@ -31,6 +32,7 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "utils.middleware.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -63,6 +65,20 @@ DATABASES = {
     )
 }
 
+# Read replicas, as comma separated database URLs. Safe requests to the views
+# of the replica apps read from one of them, unless the client wrote within
+# the pin duration.
+DATABASE_REPLICAS = []
+for index, url in enumerate(os.getenv("DATABASE_REPLICA_URLS", "").split(",")):
+    if url:
+        alias = f"replica{index + 1}"
+        DATABASES[alias] = {**dj_database_url.parse(url), "TEST": {"MIRROR": "default"}}
+        DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["utils.routers.ReplicaRouter"]
+REPLICA_APPS = ["blog", "users", "chat"]
+REPLICA_PIN_DURATION = timedelta(seconds=5)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -104,9 +120,13 @@ AUTH_USER_MODEL = "users.User"
 
 REST_FRAMEWORK = {
     "COERCE_DECIMAL_TO_STRING": False,
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
+    "DEFAULT_THROTTLE_RATES": {
+        "subscriptions": "100/hour",
+        "likes": "300/hour",
+        "articles": "30/hour",
+        "signup": "10/hour",
+    },
 }
 
 REDIS_URL = os.getenv("REDIS_URL", default="redis://localhost:6379/1")
@@ -129,6 +149,12 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
 }
 
+# Authenticated users and their authors are cached in Redis, and for a shorter
+# time in each process, so that authenticating requests takes no query.
+AUTH_PRINCIPAL_TTL = timedelta(minutes=5)
+AUTH_PRINCIPAL_LOCAL_TTL = timedelta(seconds=5)
+AUTH_PRINCIPAL_LOCAL_SIZE = 10_000
+
 CHANNEL_LAYERS = {
     "default": {
         "BACKEND": "channels_redis.core.RedisChannelLayer",
@@ -139,3 +165,119 @@ CHANNEL_LAYERS = {
         },
     },
 }
+
+# Home timelines are materialized in Redis by fanning out new articles to the
+# subscribers of their author, unless the author has too many subscribers, in
+# which case the articles are merged into the feed on read.
+TIMELINE_MAX_LENGTH = 800
+TIMELINE_FANOUT_THRESHOLD = 10_000
+# Authors who stopped fanning out resume below this many subscribers.
+TIMELINE_FANOUT_RESUME_THRESHOLD = 9_000
+TIMELINE_FANOUT_BATCH_SIZE = 1_000
+TIMELINE_TTL = timedelta(days=7)
+
+# Counter changes are buffered in Redis and flushed to the database in batches.
+COUNTERS_FLUSH_INTERVAL = timedelta(seconds=10)
+COUNTERS_FLUSH_BATCH_SIZE = 500
+COUNTERS_FLUSH_LOCK_TIMEOUT = 300
+
+# Counters are recounted from the rows changed since the previous run.
+COUNTERS_RECONCILE_INTERVAL = timedelta(hours=1)
+COUNTERS_RECONCILE_CHUNK_SIZE = 1_000
+COUNTERS_RECONCILE_OVERLAP = timedelta(minutes=5)
+
+# Trending scores halve every half-life; the ranking is rescaled periodically
+# and drops articles that decayed below the minimum score.
+TRENDING_HALF_LIFE = timedelta(hours=6)
+TRENDING_RESCALE_INTERVAL = timedelta(hours=1)
+TRENDING_MIN_SCORE = 0.01
+TRENDING_MAX_LENGTH = 10_000
+
+# Who to follow suggestions are computed in batches from the subscription
+# graph and kept as capped lists per author.
+SUGGESTIONS_INTERVAL = timedelta(hours=12)
+SUGGESTIONS_TTL = timedelta(days=2)
+SUGGESTIONS_LIMIT = 50
+SUGGESTIONS_CHUNK_SIZE = 100_000
+SUGGESTIONS_BATCH_PATHS = 5_000_000
+SUGGESTIONS_LOCK_TIMEOUT = 3_600
+
+# Received chat messages are appended to a Redis stream and saved in batches.
+# Entries pending for longer than the claim idle time are saved again. A
+# single worker ingests at a time, holding a lock renewed after each batch.
+CHAT_INGEST_INTERVAL = timedelta(seconds=1)
+CHAT_INGEST_BATCH_SIZE = 500
+CHAT_INGEST_CLAIM_IDLE = timedelta(seconds=30)
+CHAT_INGEST_LOCK_TIMEOUT = 60
+
+# Messages are stored in monthly partitions, created ahead of time. Partitions
+# past the retention period are detached to be archived, or dropped.
+CHAT_MESSAGE_PARTITIONS_AHEAD = 3
+CHAT_MESSAGE_PARTITION_INTERVAL = timedelta(days=1)
+CHAT_MESSAGE_RETENTION_MONTHS = 24
+CHAT_MESSAGE_DROP_EXPIRED = False
+
+# Users whose connections died without disconnecting are announced offline
+# once their heartbeats expired, by a sweep run once per interval.
+PRESENCE_SWEEP_INTERVAL = timedelta(seconds=15)
+
+CELERY_BEAT_SCHEDULE = {
+    "flush-counters": {
+        "task": "blog.tasks.flush_counters",
+        "schedule": COUNTERS_FLUSH_INTERVAL,
+    },
+    "reconcile-counters": {
+        "task": "blog.tasks.reconcile_counters",
+        "schedule": COUNTERS_RECONCILE_INTERVAL,
+    },
+    "rescale-trending": {
+        "task": "blog.tasks.rescale_trending",
+        "schedule": TRENDING_RESCALE_INTERVAL,
+    },
+    "compute-suggestions": {
+        "task": "blog.tasks.compute_suggestions",
+        "schedule": SUGGESTIONS_INTERVAL,
+    },
+    "ingest-messages": {
+        "task": "chat.tasks.ingest_messages",
+        "schedule": CHAT_INGEST_INTERVAL,
+    },
+    "partition-messages": {
+        "task": "chat.tasks.partition_messages",
+        "schedule": CHAT_MESSAGE_PARTITION_INTERVAL,
+    },
+    "sweep-presence": {
+        "task": "chat.tasks.sweep_presence",
+        "schedule": PRESENCE_SWEEP_INTERVAL,
+    },
+}
+
+# Longest a cache fill may take between loading a value from the database and
+# caching it. Invalidations are remembered as long, to drop the fills they
+# overtook.
+CACHE_FILL_TIMEOUT = timedelta(minutes=5)
+
+# Compact author data shown in lists is cached in Redis hashes.
+AUTHOR_CARD_TTL = timedelta(days=1)
+
+# Subscriber sets of private authors cached for access checks.
+ACCESS_CACHE_TTL = timedelta(hours=1)
+
+# Times of the last change of authors, articles and viewer state, from which
+# conditional GET validators are derived.
+VERSION_TTL = timedelta(days=7)
+
+# Number of authors suggested while typing a search.
+SEARCH_AUTOCOMPLETE_LIMIT = 10
+
+# Read receipts are sent once per delay, with the latest read watermark.
+CHAT_RECEIPT_DELAY = timedelta(seconds=1)
+
+# Presence is kept in Redis by heartbeats, which clients send more often than
+# the TTL. Changes are sent to contacts in batches once per delay, and typing
+# events are relayed at most once per interval.
+PRESENCE_TTL = timedelta(seconds=60)
+PRESENCE_FANOUT_DELAY = timedelta(seconds=2)
+PRESENCE_FANOUT_BATCH_SIZE = 1_000
+PRESENCE_TYPING_INTERVAL = timedelta(seconds=3)
+PRESENCE_TYPING_TTL = timedelta(seconds=5)
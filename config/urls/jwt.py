@@ -1,7 +1,8 @@
 from django.urls import path
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
+from users.views import TokenCreateView
 
 urlpatterns = [
-    path("jwt/create/", TokenObtainPairView.as_view()),
+    path("jwt/create/", TokenCreateView.as_view()),
     path("jwt/refresh/", TokenRefreshView.as_view()),
 ]
@@ -0,0 +1,49 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django_redis import get_redis_connection
+from model_bakery import baker
+from rest_framework.test import APIClient
+from config.celery import celery
+from users.authentication import local_principals
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    redis = get_redis_connection("default")
+    redis.flushdb()
+    local_principals.entries.clear()
+    return redis
+
+
+@pytest.fixture(autouse=True)
+def eager_tasks(monkeypatch):
+    monkeypatch.setattr(celery.conf, "task_always_eager", True)
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def create_author(db):
+    def do_create_author(**kwargs):
+        user = baker.make(User)
+        author = user.author
+        for field, value in kwargs.items():
+            setattr(author, field, value)
+        if kwargs:
+            author.save()
+        return author
+
+    return do_create_author
+
+
+@pytest.fixture
+def authenticate(api_client):
+    def do_authenticate(author):
+        api_client.force_authenticate(user=author.user)
+
+    return do_authenticate
@@ -0,0 +1,123 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from utils import caching
+
+User = get_user_model()
+
+
+class LocalCache:
+    """
+    Least recently used entries of a process, each expiring after its TTL.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, max_size):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+local_principals = LocalCache()
+
+
+def get_principal_key(user_id):
+    return f"user:{user_id}:principal"
+
+
+def get_principal(user_id):
+    """
+    Returns the user with the given id, with its author loaded, from the
+    cache of the process, then from Redis, then from a single query. Entries
+    are kept pickled, so every request works on its own copies. A user
+    loaded while it was invalidated isn't cached.
+    """
+
+    key = get_principal_key(user_id)
+    data = local_principals.get(key)
+    if data is None:
+        redis = get_redis_connection("default")
+        data, generation = redis.mget([key, caching.get_generation_key(key)])
+        if data is None:
+            # Password hashes aren't needed to authenticate tokens, and stay
+            # out of the cache. Read from the primary, as a lagging replica
+            # would keep a stale user cached for AUTH_PRINCIPAL_TTL.
+            user = (
+                User.objects.using("default")
+                .select_related("author")
+                .defer("password")
+                .filter(pk=user_id)
+                .first()
+            )
+            if user is None:
+                return None
+            data = pickle.dumps(user)
+            ttl = int(settings.AUTH_PRINCIPAL_TTL.total_seconds())
+
+            def write(pipeline, keys):
+                pipeline.set(key, data, ex=ttl)
+
+            if not caching.fill(redis, {key: generation}, write):
+                return pickle.loads(data)
+        local_principals.set(
+            key,
+            data,
+            settings.AUTH_PRINCIPAL_LOCAL_TTL.total_seconds(),
+            settings.AUTH_PRINCIPAL_LOCAL_SIZE,
+        )
+    return pickle.loads(data)
+
+
+def invalidate(user_id):
+    key = get_principal_key(user_id)
+    local_principals.delete(key)
+    caching.invalidate(get_redis_connection("default"), [key])
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    Resolves the user of the token, with its author, from the principal
+    cache, so that authenticated requests make no query to authenticate.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        user = get_principal(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,23 @@
+# Generated by Django 4.1.2 on 2026-10-18 08:20
+
+from django.db import migrations, models
+import django.db.models.functions.comparison
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                django.db.models.functions.comparison.Collate(
+                    django.db.models.functions.text.Lower("email"), "C"
+                ),
+                name="users_user_email_prefix_idx",
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Collate, Lower
 from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.base_user import AbstractBaseUser, BaseUserManager
@@ -36,3 +37,11 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
 
     USERNAME_FIELD = "email"
+
+    class Meta:
+        indexes = [
+            # Byte ordered, so that email prefixes are index range scans.
+            models.Index(
+                Collate(Lower("email"), "C"), name="users_user_email_prefix_idx"
+            )
+        ]
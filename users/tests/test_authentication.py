@@ -0,0 +1,71 @@
+import pickle
+import pytest
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from users import authentication
+from users.authentication import get_principal, get_principal_key
+
+
+@pytest.mark.django_db
+class TestGetPrincipal:
+    def test_if_cached_makes_no_query(self, create_author, django_assert_num_queries):
+        author = create_author()
+        get_principal(author.user_id)
+
+        with django_assert_num_queries(0):
+            user = get_principal(author.user_id)
+
+        assert user.pk == author.user_id
+        assert user.author.pk == author.pk
+
+    def test_if_user_doesnt_exist_returns_none(self, db):
+        assert get_principal(0) is None
+
+    def test_if_invalidated_loads_again(self, create_author, redis):
+        author = create_author()
+        get_principal(author.user_id)
+        author.user.is_active = False
+        author.user.save()
+
+        authentication.invalidate(author.user_id)
+
+        assert not get_principal(author.user_id).is_active
+
+    def test_if_invalidated_while_loading_doesnt_cache_stale_user(
+        self, monkeypatch, create_author, redis
+    ):
+        author = create_author()
+        dumps = pickle.dumps
+
+        def dumps_then_update(user):
+            data = dumps(user)
+            # A concurrent update commits before the load is cached.
+            author.user.is_active = False
+            author.user.save()
+            authentication.invalidate(author.user_id)
+            return data
+
+        monkeypatch.setattr(authentication.pickle, "dumps", dumps_then_update)
+        assert get_principal(author.user_id).is_active
+        monkeypatch.setattr(authentication.pickle, "dumps", dumps)
+
+        assert redis.get(get_principal_key(author.user_id)) is None
+        assert not get_principal(author.user_id).is_active
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    def test_if_user_deactivated_rejects_token(
+        self, api_client, create_author, django_capture_on_commit_callbacks
+    ):
+        author = create_author()
+        token = AccessToken.for_user(author.user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        assert api_client.get("/blog/authors/me/").status_code == status.HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            author.user.is_active = False
+            author.user.save()
+        response = api_client.get("/blog/authors/me/")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,5 @@
+from utils.throttling import GCRAThrottle
+
+
+class SignupThrottle(GCRAThrottle):
+    scope = "signup"
@@ -2,8 +2,13 @@ from django.contrib.auth import get_user_model
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.decorators import action
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt.views import TokenObtainPairView
+from utils.middleware import pin
 from .serializers import UserSerializer, UserCreateSerializer
 from .pagination import DefaultLimitOffsetPagination
+from .throttling import SignupThrottle
 
 User = get_user_model()
 
@@ -24,6 +29,10 @@ class UserViewSet(ModelViewSet):
         if request.method == "PATCH":
             return self.partial_update(request, *args, **kwargs)
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        pin(serializer.instance.pk)
+
     def get_current_user(self):
         return self.request.user
 
@@ -42,3 +51,19 @@ class UserViewSet(ModelViewSet):
         if self.action == "create":
             self.serializer_class = UserCreateSerializer
         return super().get_serializer_class()
+
+    def get_throttles(self):
+        if self.action == "create":
+            self.throttle_classes = [SignupThrottle]
+        return super().get_throttles()
+
+
+class TokenCreateView(TokenObtainPairView):
+    """
+    Pins the user signing in to the primary, like the users who just wrote.
+    """
+
+    def post(self, request, *args, **kwargs):
+        response = super().post(request, *args, **kwargs)
+        pin(AccessToken(response.data["access"])[api_settings.USER_ID_CLAIM])
+        return response
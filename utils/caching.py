@@ -0,0 +1,75 @@
+from django.conf import settings
+from redis.exceptions import WatchError
+
+# Each invalidation of a cached value bumps its generation. A value loaded
+# from the database is only cached if the generation read before loading it
+# is unchanged, so that a load overtaken by a write and its invalidation
+# can't cache the state from before the write.
+
+
+def get_generation_key(key):
+    return f"{key}:generation"
+
+
+def get_generations(redis, keys):
+    """
+    Returns {key: generation} for the given cache keys, to be read before
+    loading their values from the database.
+    """
+
+    keys = list(keys)
+    if not keys:
+        return {}
+    return dict(zip(keys, redis.mget([get_generation_key(key) for key in keys])))
+
+
+def fill(redis, generations, write):
+    """
+    Calls write(pipeline, keys) with the keys whose generation is unchanged,
+    in a transaction that is dropped if any of them is invalidated before it
+    runs. Returns the keys written.
+    """
+
+    if not generations:
+        return []
+    generation_keys = [get_generation_key(key) for key in generations]
+    with redis.pipeline() as pipeline:
+        try:
+            pipeline.watch(*generation_keys)
+            current = pipeline.mget(generation_keys)
+            keys = [
+                key
+                for (key, generation), now in zip(generations.items(), current)
+                if generation == now
+            ]
+            if not keys:
+                return []
+            pipeline.multi()
+            write(pipeline, keys)
+            pipeline.execute()
+        except WatchError:
+            return []
+    return keys
+
+
+def bump(pipeline, keys):
+    """
+    Queues the generation bump of the given cache keys, which drops the
+    fills of those keys in progress.
+    """
+
+    ttl = int(settings.CACHE_FILL_TIMEOUT.total_seconds())
+    for key in keys:
+        generation_key = get_generation_key(key)
+        pipeline.incr(generation_key)
+        pipeline.expire(generation_key, ttl)
+
+
+def invalidate(redis, keys):
+    keys = list(keys)
+    if not keys:
+        return
+    pipeline = redis.pipeline()
+    pipeline.delete(*keys)
+    bump(pipeline, keys)
+    pipeline.execute()
@@ -0,0 +1,85 @@
+import random
+from django.conf import settings
+from django_redis import get_redis_connection
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .routers import ReadRouting, current_routing
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def get_pin_key(user_id):
+    return f"user:{user_id}:primary"
+
+
+def pin(user_id):
+    """
+    Sends the reads of the user to the primary for REPLICA_PIN_DURATION, so
+    that the user reads their own writes despite the replication lag.
+    """
+
+    if settings.DATABASE_REPLICAS:
+        duration = int(settings.REPLICA_PIN_DURATION.total_seconds())
+        get_redis_connection("default").set(get_pin_key(user_id), 1, ex=duration)
+
+
+def get_token_user_id(request):
+    """
+    Returns the id of the user of the access token of the request, which is
+    only authenticated once the view runs. Pins follow the user, so they
+    survive refreshed tokens.
+    """
+
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    raw_token = None if header is None else authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    try:
+        token = authentication.get_validated_token(raw_token)
+    except InvalidToken:
+        return None
+    return token.get(api_settings.USER_ID_CLAIM)
+
+
+class ReplicaMiddleware:
+    """
+    Routes the reads of safe requests to the views of REPLICA_APPS to a
+    replica, unless the user is pinned to the primary. Users are pinned by
+    their unsafe requests, and by signing up or in.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        request.read_routing = ReadRouting()
+        token = current_routing.set(request.read_routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_routing.reset(token)
+
+        user = getattr(request, "user", None)
+        if request.method not in SAFE_METHODS and user and user.is_authenticated:
+            pin(user.pk)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not hasattr(request, "read_routing") or request.method not in SAFE_METHODS:
+            return None
+        # Viewsets are dispatched by a function of DRF holding their class.
+        view = getattr(view_func, "cls", view_func)
+        app_label = view.__module__.split(".")[0]
+        if app_label not in settings.REPLICA_APPS:
+            return None
+        user_id = get_token_user_id(request)
+        key = None if user_id is None else get_pin_key(user_id)
+        if key is not None and get_redis_connection("default").exists(key):
+            return None
+        request.read_routing.database = random.choice(settings.DATABASE_REPLICAS)
+        return None
@@ -0,0 +1,36 @@
+from contextvars import ContextVar
+
+current_routing = ContextVar("current_routing", default=None)
+
+
+class ReadRouting:
+    """
+    The database the reads of the current request go to, None for the
+    primary. Set by the replica middleware.
+    """
+
+    def __init__(self):
+        self.database = None
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of the requests routed to a replica there, and every
+    other query to the primary. Replicas mirror the primary, so relations
+    are allowed across them and only the primary is migrated.
+    """
+
+    def db_for_read(self, model, **hints):
+        routing = current_routing.get()
+        if routing is None or routing.database is None:
+            return "default"
+        return routing.database
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,72 @@
+import pytest
+from django.test import RequestFactory
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from blog.views import ArticleViewSet
+from utils.middleware import ReplicaMiddleware, get_pin_key, pin
+from utils.routers import ReadRouting
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica"]
+
+
+def get_read_database(user):
+    """
+    Returns the database a request listing the articles would read from,
+    with a fresh access token of the user.
+    """
+
+    token = AccessToken.for_user(user)
+    request = RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+    request.read_routing = ReadRouting()
+    view = ArticleViewSet.as_view({"get": "list"})
+    ReplicaMiddleware(lambda request: None).process_view(request, view, (), {})
+    return request.read_routing.database
+
+
+@pytest.mark.django_db
+class TestReplicaMiddleware:
+    def test_if_user_not_pinned_reads_replica(self, create_author):
+        author = create_author()
+
+        assert get_read_database(author.user) == "replica"
+
+    def test_if_user_pinned_reads_primary(self, create_author):
+        author = create_author()
+
+        pin(author.user_id)
+
+        assert get_read_database(author.user) is None
+
+    def test_if_write_pins_user_across_tokens(self, api_client, create_author):
+        author = create_author()
+        token = AccessToken.for_user(author.user)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        response = api_client.post("/blog/articles/", {"title": "a"})
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert get_read_database(author.user) is None
+
+    def test_if_signup_pins_user(self, api_client, redis):
+        response = api_client.post(
+            "/auth/users/", {"email": "a@example.com", "password": "8Fj3#kLq9z"}
+        )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert redis.exists(get_pin_key(response.data["id"]))
+
+    def test_if_token_creation_pins_user(self, api_client, create_author, redis):
+        author = create_author()
+        author.user.set_password("8Fj3#kLq9z")
+        author.user.save()
+
+        response = api_client.post(
+            "/auth/jwt/create/",
+            {"email": author.user.email, "password": "8Fj3#kLq9z"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert redis.exists(get_pin_key(author.user_id))
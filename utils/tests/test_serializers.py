@@ -0,0 +1,61 @@
+from types import SimpleNamespace
+import pytest
+from model_bakery import baker
+from blog import counters
+from blog.models import Article, Author, LikedItem, Subscription
+from blog.serializers import ArticleSerializer, SimpleAuthorSerializer
+
+
+def serialize(serializer_class, queryset, viewer):
+    context = {"request": SimpleNamespace(user=viewer.user)}
+    return serializer_class(queryset, many=True, context=context).data
+
+
+@pytest.mark.django_db
+class TestFastRepresentation:
+    def test_if_article_rows_render_like_models(
+        self, create_author, django_capture_on_commit_callbacks
+    ):
+        viewer, writer = create_author(), create_author()
+        articles = baker.make(Article, author=writer, content=None, _quantity=3)
+        LikedItem.objects.create(author=viewer, article=articles[0])
+        with django_capture_on_commit_callbacks(execute=True):
+            counters.increment(Article, "likes_count", [articles[1].id])
+        queryset = Article.objects.order_by("id")
+
+        fast = serialize(
+            ArticleSerializer, ArticleSerializer.get_fast_queryset(queryset), viewer
+        )
+        slow = serialize(ArticleSerializer, queryset, viewer)
+
+        assert fast == slow
+        assert [row["liked_by_me"] for row in fast] == [True, False, False]
+        assert [row["likes_count"] for row in fast] == [0, 1, 0]
+
+    def test_if_author_rows_render_like_models(self, create_author):
+        viewer = create_author()
+        authors = [create_author() for _ in range(3)]
+        Subscription.objects.create(subscriber=viewer, target=authors[1])
+        queryset = Author.objects.filter(pk__in=[a.id for a in authors]).order_by("id")
+
+        fast = serialize(
+            SimpleAuthorSerializer,
+            SimpleAuthorSerializer.get_fast_queryset(queryset),
+            viewer,
+        )
+        slow = serialize(SimpleAuthorSerializer, queryset, viewer)
+
+        assert fast == slow
+        assert fast[0]["email"] == authors[0].user.email
+
+    def test_if_fast_queryset_loads_only_rendered_columns(self):
+        queryset = ArticleSerializer.get_fast_queryset(Article.objects.all(), "id")
+
+        assert list(queryset.query.values_select) == [
+            "id",
+            "title",
+            "content",
+            "created_at",
+            "author",
+            "likes_count",
+        ]
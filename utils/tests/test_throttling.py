@@ -0,0 +1,108 @@
+import pytest
+from model_bakery import baker
+from rest_framework import status
+from blog.models import Article
+from utils.throttling import GCRAThrottle
+
+
+@pytest.fixture(autouse=True)
+def rates(monkeypatch):
+    monkeypatch.setattr(
+        GCRAThrottle,
+        "THROTTLE_RATES",
+        {"articles": "3/min", "likes": "3/min", "signup": "1/min"},
+    )
+
+
+def create_article(api_client):
+    return api_client.post("/blog/articles/", {"title": "a"})
+
+
+def batch_like(api_client, article_ids):
+    return api_client.post(
+        "/blog/articles/batch_like/", {"articles": article_ids}, format="json"
+    )
+
+
+@pytest.mark.django_db
+class TestGCRAThrottle:
+    def test_if_quota_spent_in_burst_returns_429(
+        self, api_client, create_author, authenticate
+    ):
+        authenticate(create_author())
+
+        responses = [create_article(api_client) for _ in range(4)]
+
+        statuses = [response.status_code for response in responses]
+        assert statuses == [status.HTTP_201_CREATED] * 3 + [
+            status.HTTP_429_TOO_MANY_REQUESTS
+        ]
+        assert 0 < int(responses[-1]["Retry-After"]) <= 20
+
+    def test_if_users_have_separate_quotas(
+        self, api_client, create_author, authenticate
+    ):
+        authenticate(create_author())
+        for _ in range(3):
+            create_article(api_client)
+
+        authenticate(create_author())
+
+        assert create_article(api_client).status_code == status.HTTP_201_CREATED
+
+    def test_if_interval_passed_allows_one_more(
+        self, api_client, create_author, authenticate, redis
+    ):
+        author = create_author()
+        authenticate(author)
+        for _ in range(3):
+            create_article(api_client)
+        key = f"throttle_articles_{author.user_id}"
+
+        # Moves the theoretical arrival time back by one emission interval.
+        redis.set(key, int(redis.get(key)) - 20_000_000)
+
+        assert create_article(api_client).status_code == status.HTTP_201_CREATED
+        assert create_article(api_client).status_code == (
+            status.HTTP_429_TOO_MANY_REQUESTS
+        )
+
+    def test_if_batch_is_charged_per_item(
+        self, api_client, create_author, authenticate
+    ):
+        author = create_author()
+        authenticate(author)
+        ids = [
+            article.id for article in baker.make(Article, author=author, _quantity=3)
+        ]
+
+        first = batch_like(api_client, ids)
+        second = batch_like(api_client, ids[:1])
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_if_batch_over_quota_is_rejected_without_charge(
+        self, api_client, create_author, authenticate
+    ):
+        author = create_author()
+        authenticate(author)
+        ids = [
+            article.id for article in baker.make(Article, author=author, _quantity=4)
+        ]
+
+        rejected = batch_like(api_client, ids)
+        allowed = batch_like(api_client, ids[:3])
+
+        assert rejected.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert allowed.status_code == status.HTTP_200_OK
+
+    def test_if_anonymous_clients_are_limited_by_address(self, api_client):
+        data = {"email": "a@example.com", "password": "8Fj3#kLq9z"}
+        response = api_client.post("/auth/users/", data)
+        assert response.status_code == status.HTTP_201_CREATED
+
+        data["email"] = "b@example.com"
+        response = api_client.post("/auth/users/", data)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
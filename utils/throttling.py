@@ -0,0 +1,73 @@
+from django_redis import get_redis_connection
+from rest_framework.throttling import UserRateThrottle
+
+# Generic cell rate algorithm: the key holds the theoretical arrival time of
+# the next request in microseconds, which each allowed request pushes back by
+# the emission interval times its cost. Requests are allowed while it is at
+# most one period ahead of now, so the whole quota can be spent in a burst.
+# Returns 0 if the request is allowed, or the microseconds to wait otherwise.
+GCRA = """
+local time = redis.call("TIME")
+local now = tonumber(time[1]) * 1000000 + tonumber(time[2])
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local arrival = tonumber(redis.call("GET", KEYS[1])) or now
+if arrival < now then
+    arrival = now
+end
+arrival = arrival + interval * cost
+if arrival - period > now then
+    return arrival - period - now
+end
+redis.call("SET", KEYS[1], string.format("%d", arrival), "PX", math.ceil((arrival - now) / 1000))
+return 0
+"""
+
+
+class GCRAThrottle(UserRateThrottle):
+    """
+    Limits users, or clients by address when anonymous, to the rate of the
+    scope set in DEFAULT_THROTTLE_RATES. Each request is checked with a
+    single atomic call storing one number per client, instead of the list
+    of request times kept by the throttles of DRF.
+
+    Views serving batches charge a request for each of its items through
+    `get_throttle_cost(request)`, so a batch larger than the quota is never
+    allowed.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        interval = self.duration * 1_000_000 // self.num_requests
+        redis = get_redis_connection("default")
+        script = redis.register_script(GCRA)
+        self.wait_time = script(
+            keys=[self.key],
+            args=[interval, self.duration * 1_000_000, self.get_cost(request, view)],
+        )
+        return self.wait_time == 0
+
+    def get_cost(self, request, view):
+        get_throttle_cost = getattr(view, "get_throttle_cost", None)
+        if get_throttle_cost is None:
+            return 1
+        return max(get_throttle_cost(request), 1)
+
+    def wait(self):
+        return self.wait_time / 1_000_000
+
+
+def get_batch_size(request, field):
+    """
+    Returns the number of items of a batch in the request data, before it
+    is validated, or 1 if there is no list of items.
+    """
+
+    items = request.data.get(field) if hasattr(request.data, "get") else None
+    return len(items) if isinstance(items, list) else 1
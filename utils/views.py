@@ -0,0 +1,27 @@
+from rest_framework.response import Response
+from .serializers import FastRepresentationMixin
+
+
+class FastListMixin:
+    """
+    Lists through the fast path of the serializer when it has one, loading
+    only the columns it renders plus the ones the paginator orders by.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, FastRepresentationMixin):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        ordering = getattr(self.paginator, "ordering", None) or []
+        queryset = serializer_class.get_fast_queryset(
+            queryset, *[field.lstrip("-") for field in ordering]
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(queryset, many=True)
+        return Response(serializer.data)